@@ -0,0 +1,93 @@
+"""
+Corpus
+
+Benchmark inputs: the examples from the test suite, and a synthetic generator for large corpora that look like
+scraped property data.
+
+"""
+from typing import Any, Callable
+import random
+
+from tests import test_core, test_main, test_pre_processing_substitution, test_reduce_quantity
+
+
+def _examples(test_func: Callable) -> list[Any]:
+    """ Inputs of a test parametrized with [input, output] pairs. """
+    return [example[0] for example in test_func.pytestmark[0].args[1]]
+
+
+def parser_corpus() -> list[str]:
+    return _examples(test_main.test_result_multi)
+
+
+def substitution_corpus() -> list[str]:
+    corpus = parser_corpus()
+    corpus += _examples(test_pre_processing_substitution.test_sub_sci_notation)
+    corpus += _examples(test_pre_processing_substitution.test_reduce_ranges)
+    return corpus
+
+
+def frame_shift_corpus() -> list[str]:
+    corpus = [text for text in _examples(test_core.test_frame_shift) if text]
+    corpus += ["gmol", "mlgcm", "kJmol", "mmHgmin", "gcm**-3", "kgm**-3", "atmm**3", "mgkgday"]
+    return corpus
+
+
+def get_unit_corpus() -> list[str]:
+    return [text for text in _examples(test_core.test_get_unit) if isinstance(text, str)]
+
+
+def reduce_quantities_corpus() -> list[Any]:
+    return _examples(test_reduce_quantity.test_reduce_quantities)
+
+
+_units = ["g", "kg", "mg/L", "g/mol", "kJ/mol", "g/cm3", "g/ml", "mm Hg", "mmHg", "kPa", "atm", "ppm", "%",
+          "°C", "°F", "K", "cm-3", "cm**3/mol", "gcm-3", "mlgcm", "J/KG", "cu m", "lb / gal"]
+_conditions = ["°C", "°F", "K", "mm Hg"]
+_noise = ["", "", "", "approx. ", "Density: ", "Vapor pressure = ", "Melting point: ", "Odor Threshold Range: "]
+_trailing = ["", "", "", " (NTP, 1992)", " (EPA, 1998)", " - closed cup", " purity not specified"]
+
+
+def _value(rng: random.Random) -> str:
+    kind = rng.random()
+    if kind < 0.6:
+        return str(round(rng.uniform(-50, 1000), rng.randint(0, 4)))
+    if kind < 0.75:
+        return f"{round(rng.uniform(1, 10), 2)}e{rng.randint(-9, 9)}"
+    if kind < 0.85:
+        return f"{round(rng.uniform(1, 10), 2)}x10-{rng.randint(1, 9)}"
+    low = round(rng.uniform(0, 500), 1)
+    return f"{low}-{round(low + rng.uniform(0.1, 10), 1)}"
+
+
+def _quantity(rng: random.Random) -> str:
+    text = f"{_value(rng)} {rng.choice(_units)}"
+    if rng.random() < 0.4:
+        text += f" {rng.choice(['at', '@'])} {rng.randint(-20, 200)} {rng.choice(_conditions)}"
+    return text
+
+
+def synthetic_corpus(size: int = 10_000, seed: int = 0, unique: float = 0.3) -> list[str]:
+    """ synthetic corpus
+
+    Parameters
+    ----------
+    size: int
+        number of strings
+    seed: int
+        random seed (same seed, same corpus)
+    unique: float
+        fraction of distinct strings (real feeds repeat the same strings a lot)
+
+    Returns
+    -------
+    corpus: list[str]
+
+    """
+    rng = random.Random(seed)
+    distinct = []
+    for _ in range(max(1, int(size * unique))):
+        text = "; ".join(_quantity(rng) for _ in range(rng.choice([1, 1, 1, 2, 3])))
+        distinct.append(rng.choice(_noise) + text + rng.choice(_trailing))
+
+    return [rng.choice(distinct) for _ in range(size)]
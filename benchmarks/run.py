@@ -0,0 +1,126 @@
+"""
+Benchmarks
+
+Times `parser` end to end and each pipeline stage on its own, plus import time and peak memory.
+
+Run from the repository root (with unit_parse installed, e.g. `pip install -e .`):
+
+    python -m benchmarks.run
+    python -m benchmarks.run --size 20000 --save results.json
+    python -m benchmarks.run --compare results.json  # exits with 1 if anything got slower than --tolerance
+
+"""
+from typing import Any, Callable, Iterable, Optional
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from unit_parse import config, logger, parser, parser_batch, reduce_quantities
+from unit_parse.core import frame_shift, get_unit
+from unit_parse.pre_processing_substitution import substitution
+from unit_parse.main import warmup
+
+from benchmarks import corpus
+
+
+def time_per_item(func: Callable, inputs: list[Any], repeat: int = 5, clear_cache: bool = False) -> float:
+    """ Best (of repeat) average time per input in microseconds. """
+    times = []
+    for _ in range(repeat):
+        if clear_cache:
+            config.unit_cache.clear()
+        start = time.perf_counter_ns()
+        for input_ in inputs:
+            func(input_)
+        times.append((time.perf_counter_ns() - start) / len(inputs) / 1000)
+    return min(times)
+
+
+def time_import(repeat: int = 5) -> float:
+    """ Median time of `import unit_parse` in a fresh interpreter, in milliseconds. """
+    code = "import time; start = time.perf_counter(); import unit_parse; print(time.perf_counter() - start)"
+    times = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        times.append(float(result.stdout.strip()) * 1000)
+    return statistics.median(times)
+
+
+def peak_memory(func: Callable, inputs: Iterable[Any]) -> float:
+    """ Peak memory allocated while running func over inputs, in MB. """
+    tracemalloc.start()
+    try:
+        func(inputs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1e6
+
+
+def run(size: int = 10_000, repeat: int = 5) -> dict[str, float]:
+    warmup()
+    synthetic = corpus.synthetic_corpus(size)
+
+    results = {
+        "import [ms]": time_import(),
+        "parser [us/text]": time_per_item(parser, corpus.parser_corpus(), repeat),
+        "parser, cold unit cache [us/text]": time_per_item(parser, corpus.parser_corpus(), repeat, clear_cache=True),
+        "parser_batch, synthetic [us/text]": time_per_item(parser_batch, [synthetic], 1) / len(synthetic),
+        "substitution [us/text]": time_per_item(substitution, corpus.substitution_corpus(), repeat),
+        "frame_shift [us/text]": time_per_item(frame_shift, corpus.frame_shift_corpus(), repeat),
+        "frame_shift, cold unit cache [us/text]":
+            time_per_item(frame_shift, corpus.frame_shift_corpus(), repeat, clear_cache=True),
+        "get_unit [us/text]": time_per_item(get_unit, corpus.get_unit_corpus(), repeat),
+        "reduce_quantities [us/list]": time_per_item(reduce_quantities, corpus.reduce_quantities_corpus(), repeat),
+        "peak memory, synthetic [MB]": peak_memory(parser_batch, synthetic[:min(size, 2000)]),
+    }
+    return results
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[str]:
+    """ Returns the benchmarks that are more than 'tolerance' (fraction) worse than the baseline. """
+    regressions = []
+    for name, value in results.items():
+        old = baseline.get(name)
+        if old and value > old * (1 + tolerance):
+            regressions.append(f"{name}: {old:.2f} --> {value:.2f} (+{(value / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    arg_parser = argparse.ArgumentParser(description="unit_parse benchmarks")
+    arg_parser.add_argument("--size", type=int, default=10_000, help="size of the synthetic corpus")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="repeats per benchmark (best is kept)")
+    arg_parser.add_argument("--save", help="save results to this json file")
+    arg_parser.add_argument("--compare", help="json file of earlier results to compare against")
+    arg_parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slow down when comparing")
+    arg_parser.add_argument("--log-level", default="ERROR", help="unit_parse log level while timing")
+    args = arg_parser.parse_args(argv)
+
+    logger.setLevel(args.log_level.upper())
+
+    results = run(args.size, args.repeat)
+    width = max(len(name) for name in results)
+    for name, value in results.items():
+        print(f"{name:<{width}}  {value:10.2f}")
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,9 @@
 from unit_parse.logger import logger
-from unit_parse.config import config, Unit, Quantity, Q, U
-from unit_parse.main import parser
+from unit_parse.config import config, Unit, Quantity, Q, U, set_registry, use_registry
+from unit_parse.main import parser, parser_batch, warmup
 from unit_parse.reduce_quantities import reduce_quantities
 
 __all__ = [
-     "Unit", "U", "Q", "Quantity", "parser", "logger", "reduce_quantities", "config"
+     "Unit", "U", "Q", "Quantity", "parser", "parser_batch", "warmup", "set_registry", "use_registry", "logger",
+     "reduce_quantities", "config"
 ]
@@ -0,0 +1,58 @@
+"""
+Command line
+
+```
+python -m unit_parse data.csv --column density -o data_parsed.csv --workers 4
+cat data.jsonl | python -m unit_parse - --format jsonl --column density > data_parsed.jsonl
+```
+
+See `unit_parse.stream`.
+
+"""
+from typing import Optional
+import argparse
+import sys
+
+from unit_parse.stream import FORMATS, ColumnError, _get_format, parse_file
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m unit_parse",
+        description="Parse a column of a CSV/TSV/JSONL file, adding magnitude, unit and quantity columns."
+    )
+    parser.add_argument("input", help="input file ('-' for stdin)")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("-c", "--column", help="column name or index (default: first column); JSONL: field name (needed)")
+    parser.add_argument("-f", "--format", choices=FORMATS, help="default: from the input file extension")
+    parser.add_argument("--no-header", action="store_true", help="CSV/TSV file has no header row")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="worker processes (default: 1)")
+    parser.add_argument("--chunksize", type=int, default=1000, help="rows parsed at a time (default: 1000)")
+    parser.add_argument("--resume", action="store_true", help="carry on from the last checkpoint")
+    parser.add_argument("--errors", choices=("warn", "raise"), default="warn")
+    parser.add_argument("--encoding", default="utf-8")
+    args = parser.parse_args(argv)
+
+    try:
+        format_ = _get_format(args.input, args.format)
+    except ValueError as e:
+        parser.error(str(e))
+    if format_ == "jsonl" and args.column is None:
+        parser.error("--column is needed for JSONL (the field to parse)")
+
+    column = "0" if args.column is None else args.column
+    if args.no_header and column.isdigit():
+        column = int(column)
+
+    try:
+        result = parse_file(args.input, args.output, column=column, format_=format_, header=not args.no_header,
+                            workers=args.workers, chunksize=args.chunksize, resume=args.resume, errors=args.errors,
+                            encoding=args.encoding)
+    except ColumnError as e:
+        parser.error(str(e))
+    print(f"{result.rows} rows ({result.failed} without a quantity)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""
+Asyncio
+
+Parse from asyncio code without blocking the event loop.
+
+```python
+from unit_parse.aio import async_parser, async_parser_batch
+
+result = await async_parser("37.34 kJ/mole (at 25 °C)")
+
+async for result in async_parser_batch(texts):  # texts: iterable or async iterable
+    ...
+```
+
+Parsing is done in an executor (the event loop's default thread pool, unless told otherwise). Use `AsyncParser` to
+pick the executor (threads or processes) and how many parses can run at once:
+
+```python
+from unit_parse.aio import AsyncParser
+
+async with AsyncParser(executor="process", workers=4) as async_parser:
+    async for result in async_parser.parse_stream(texts):
+        ...
+```
+
+"""
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Optional, Union
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import asyncio
+import contextvars
+import functools
+import os
+
+from unit_parse.config import get_registry
+from unit_parse.logger import logger
+from unit_parse.main import parser
+from unit_parse.parallel import _parse_chunk, _process_executor
+from unit_parse.serialize import load
+from unit_parse.trace import get_trace
+
+
+class AsyncParser:
+    """ Async Parser
+
+    * Parsing runs in an executor, so the event loop is never blocked.
+    * At most 'max_concurrency' parses run at once; `parse_stream` stops reading its input while that many are
+      waiting (back-pressure).
+    * Duplicate text that is already being parsed (with the same registry and trace) is not parsed again; every
+      caller awaits the one parse (and gets the same result object).
+    * The caller's context variables (`use_registry`, `parse_trace`) are passed on to the executor thread. Process
+      workers use their own registry (results are rebuilt in the caller's) and don't record traces.
+
+    Parameters
+    ----------
+    executor: str, Executor, None
+        Where parsing runs:
+        * None: the event loop's default executor (default)
+        * "thread": a thread pool owned by this object
+        * "process": a process pool owned by this object (workers use the current `config` parsing settings)
+        * any `concurrent.futures.Executor` (not shut down by this object). Results from a `ProcessPoolExecutor` are
+          sent back in serialized form (see `serialize`), so its workers must be able to import unit_parse.
+    max_concurrency: int
+        Maximum number of parses running at once. Default is the number of workers (or CPUs).
+    workers: int
+        Number of threads/processes for executor="thread" or "process". Default is the number of CPUs.
+
+    """
+
+    def __init__(self, executor: Union[str, Executor, None] = None, max_concurrency: Optional[int] = None,
+                 workers: Optional[int] = None):
+        self._owns_executor = isinstance(executor, str)
+        if executor == "thread":
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="unit_parse")
+        elif executor == "process":
+            executor = _process_executor(workers)
+        elif isinstance(executor, str):
+            raise ValueError(f"'executor' must be 'thread', 'process', an Executor or None. Given: {executor}")
+
+        if max_concurrency is None:
+            max_concurrency = workers or os.cpu_count() or 1
+        if max_concurrency < 1:
+            raise ValueError(f"'max_concurrency' must be 1 or more. Given: {max_concurrency}")
+
+        self.executor = executor
+        self.max_concurrency = max_concurrency
+        self._serialized = isinstance(executor, ProcessPoolExecutor)
+        self._loop = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight: dict[tuple[str, Any, Any], asyncio.Task] = {}  # (text, registry, trace) -> task
+
+    def __repr__(self):
+        return f"AsyncParser(executor={self.executor}, max_concurrency={self.max_concurrency})"
+
+    async def __aenter__(self) -> "AsyncParser":
+        return self
+
+    async def __aexit__(self, *args):
+        self.close()
+
+    def close(self):
+        """ Shut down the executor (if this object made it). """
+        if self._owns_executor and self.executor is not None:
+            self.executor.shutdown(wait=True)
+
+    async def parse(self, text_in: str) -> Any:
+        """ parse
+
+        Same as `parser`, but awaitable.
+
+        Parameters
+        ----------
+        text_in: str
+            text you want to be parsed
+
+        Returns
+        -------
+        output: Quantity, list[Quantity], list[list[Quantity]]
+
+        """
+        loop = self._get_loop()
+        if not isinstance(text_in, str):  # can't be coalesced; let the parser raise its error
+            return await self._run(loop, text_in)
+
+        key = (text_in, get_registry(), get_trace())
+        task = self._in_flight.get(key)
+        if task is None:
+            task = loop.create_task(self._run(loop, text_in))  # (runs in a copy of this task's context)
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._done(key, done))
+
+        return await asyncio.shield(task)
+
+    async def parse_stream(self, texts: Union[Iterable[str], AsyncIterable[str]], errors: str = "warn") \
+            -> AsyncIterator[Any]:
+        """ parse stream
+
+        Parse texts as they arrive, yielding results in input order.
+
+        Parameters
+        ----------
+        texts: Iterable[str], AsyncIterable[str]
+            texts you want to be parsed
+        errors: str
+            What to do when a text fails to parse (same as `parser_batch`):
+            * "warn": log a warning and yield None for that text (default)
+            * "raise": raise the error and stop
+            * "return": yield the exception in place of the result
+
+        Yields
+        -------
+        output: Any
+            One result per text, in the same order as the input.
+
+        """
+        if errors not in ("warn", "raise", "return"):
+            raise ValueError(f"'errors' must be 'warn', 'raise' or 'return'. Given: {errors}")
+
+        pending: deque[tuple[int, Any, asyncio.Task]] = deque()
+        try:
+            i = 0
+            async for text_in in _aiter(texts):
+                pending.append((i, text_in, asyncio.ensure_future(self.parse(text_in))))
+                i += 1
+                if len(pending) >= self.max_concurrency:
+                    yield await _result(*pending.popleft(), errors)
+
+            while pending:
+                yield await _result(*pending.popleft(), errors)
+        finally:
+            for *_, task in pending:
+                task.cancel()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """ Running event loop; the semaphore and in-flight tasks belong to one loop, so start fresh on a new one. """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._in_flight = {}
+        return loop
+
+    async def _run(self, loop: asyncio.AbstractEventLoop, text_in: str) -> Any:
+        async with self._semaphore:
+            if not self._serialized:
+                run = functools.partial(contextvars.copy_context().run, parser, text_in)
+                return await loop.run_in_executor(self.executor, run)
+
+            result = (await loop.run_in_executor(self.executor, _parse_chunk, [text_in]))[0]
+            if isinstance(result, Exception):
+                raise result
+            return load(result)
+
+    def _done(self, key: tuple[str, Any, Any], task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # mark as retrieved; the callers that are still waiting get it from the task
+
+
+async def _aiter(texts: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+    if hasattr(texts, "__aiter__"):
+        async for text_in in texts:
+            yield text_in
+    else:
+        for text_in in texts:
+            yield text_in
+
+
+async def _result(i: int, text_in: Any, task: asyncio.Task, errors: str) -> Any:
+    try:
+        return await task
+    except Exception as e:
+        if errors == "raise":
+            raise
+        if errors == "return":
+            return e
+        logger.warning(f"Parsing failed for item {i}: '{text_in}' ({type(e).__name__}: {e})")
+        return None
+
+
+_default_parser: Optional[AsyncParser] = None
+
+
+def _get_default_parser() -> AsyncParser:
+    global _default_parser
+    if _default_parser is None:
+        _default_parser = AsyncParser()
+    return _default_parser
+
+
+async def async_parser(text_in: str) -> Any:
+    """ async parser
+
+    Same as `parser`, but runs in the event loop's default executor so the loop is not blocked.
+
+    Parameters
+    ----------
+    text_in: str
+        text you want to be parsed
+
+    Returns
+    -------
+    output: Quantity, list[Quantity], list[list[Quantity]]
+
+    """
+    return await _get_default_parser().parse(text_in)
+
+
+def async_parser_batch(texts: Union[Iterable[str], AsyncIterable[str]], errors: str = "warn") -> AsyncIterator[Any]:
+    """ async parser batch
+
+    Same as `parser_batch`, but an async iterator over the results (in input order), and texts can be an async
+    iterable. Parsing runs in the event loop's default executor.
+
+    Parameters
+    ----------
+    texts: Iterable[str], AsyncIterable[str]
+        texts you want to be parsed
+    errors: str
+        "warn", "raise" or "return" (see `parser_batch`)
+
+    Returns
+    -------
+    output: AsyncIterator[Any]
+
+    """
+    return _get_default_parser().parse_stream(texts, errors=errors)
@@ -0,0 +1,192 @@
+"""
+Arrow
+
+Converts parser (or `reduce_quantities`) results into Arrow record batches, one row per result, for writing to
+Parquet (or anything else that reads Arrow).
+
+```python
+from unit_parse import parser_batch
+from unit_parse.arrow import to_record_batch, write_parquet
+
+batch = to_record_batch(parser_batch(["5 g", "20.8 mm Hg @ 25 °C", "fish"]))
+write_parquet(parser_batch(texts), "results.parquet")  # any iterable of results, written a batch at a time
+```
+
+Columns:
+
+* magnitude (float64), unit (dictionary): the first quantity of the result
+* series_magnitude (list of float64), series_unit (list of dictionary): every quantity of the result
+  ('[[quantity, condition], ...]' or '[quantity, ...]'); one item for a single quantity
+* condition_magnitude, condition_unit: the condition of each item in the series (null where there is none)
+
+Failed results (None) are null in every column. Units are strings like "g/cm**3"; each distinct unit is formatted once
+per batch, and the columns are built from flat lists in one pass over the results.
+
+Needs pyarrow (`pip install pyarrow`).
+
+"""
+from typing import Any, Iterable, Optional
+
+try:
+    import pyarrow as pa
+except ImportError as e:  # pragma: no cover
+    raise ImportError("'unit_parse.arrow' needs pyarrow (pip install pyarrow).") from e
+
+from unit_parse.config import Quantity
+from unit_parse.utils import get_list_depth
+
+_unit_type = pa.dictionary(pa.int32(), pa.string())
+
+SCHEMA = pa.schema([
+    ("magnitude", pa.float64()),
+    ("unit", _unit_type),
+    ("series_magnitude", pa.list_(pa.float64())),
+    ("series_unit", pa.list_(_unit_type)),
+    ("condition_magnitude", pa.list_(pa.float64())),
+    ("condition_unit", pa.list_(_unit_type)),
+])
+
+
+def to_record_batch(results: Iterable[Any]) -> pa.RecordBatch:
+    """ to record batch
+
+    Parameters
+    ----------
+    results: Iterable[Any]
+        parser or reduce_quantities results (Quantity, number, '[[quantity, condition], ...]', None, ...)
+
+    Returns
+    -------
+    batch: pa.RecordBatch
+        One row per result (see `SCHEMA`).
+
+    """
+    builder = _BatchBuilder()
+    for result in results:
+        builder.append(result)
+    return builder.finish()
+
+
+def write_parquet(results: Iterable[Any], where: Any, batch_size: int = 65_536, **kwargs):
+    """ write parquet
+
+    Parameters
+    ----------
+    results: Iterable[Any]
+        parser or reduce_quantities results; read (and written) batch_size at a time.
+    where: str, file
+        Path or file to write to.
+    batch_size: int
+        Number of results per record batch.
+    kwargs:
+        Passed to `pyarrow.parquet.ParquetWriter` (compression, ...).
+
+    """
+    import pyarrow.parquet as pq
+
+    if batch_size < 1:
+        raise ValueError(f"'batch_size' must be 1 or more. Given: {batch_size}")
+
+    with pq.ParquetWriter(where, SCHEMA, **kwargs) as writer:
+        builder = _BatchBuilder()
+        for result in results:
+            builder.append(result)
+            if builder.rows == batch_size:
+                writer.write_batch(builder.finish())
+                builder = _BatchBuilder()
+
+        if builder.rows:
+            writer.write_batch(builder.finish())
+
+
+class _BatchBuilder:
+    """ Collects the columns as flat python lists; arrays are made once in `finish`. """
+
+    def __init__(self):
+        self.rows = 0
+        self.magnitude: list[Optional[float]] = []
+        self.unit: list[Optional[int]] = []
+        self.null: list[bool] = []
+        self.offsets: list[int] = [0]
+        self.series_magnitude: list[Optional[float]] = []
+        self.series_unit: list[Optional[int]] = []
+        self.condition_magnitude: list[Optional[float]] = []
+        self.condition_unit: list[Optional[int]] = []
+        self.unit_codes: dict[Any, int] = {}  # pint UnitsContainer -> index in unit_strings
+        self.unit_strings: list[str] = []
+
+    def append(self, result: Any):
+        self.rows += 1
+        series = _series(result)
+        if not series:
+            self.magnitude.append(None)
+            self.unit.append(None)
+            self.null.append(True)
+            self.offsets.append(self.offsets[-1])
+            return
+
+        magnitude, unit = self.value(series[0][0])
+        self.magnitude.append(magnitude)
+        self.unit.append(unit)
+        self.null.append(False)
+        for value, condition in series:
+            magnitude, unit = self.value(value)
+            self.series_magnitude.append(magnitude)
+            self.series_unit.append(unit)
+            magnitude, unit = self.value(condition)
+            self.condition_magnitude.append(magnitude)
+            self.condition_unit.append(unit)
+        self.offsets.append(len(self.series_magnitude))
+
+    def value(self, value: Any) -> tuple[Optional[float], Optional[int]]:
+        """ (magnitude, unit code) of a quantity or number. """
+        if isinstance(value, (int, float)):
+            value = Quantity(value)  # (dimensionless)
+        if isinstance(value, Quantity):
+            code = self.unit_codes.get(value._units)
+            if code is None:
+                code = self.unit_codes[value._units] = len(self.unit_strings)
+                self.unit_strings.append(f"{value.units:~C}")
+            return float(value.magnitude), code
+        return None, None
+
+    def finish(self) -> pa.RecordBatch:
+        units = pa.array(self.unit_strings, pa.string())
+        offsets = pa.array(self.offsets, pa.int32())
+        mask = pa.array(self.null, pa.bool_())
+
+        def dictionary(codes: list[Optional[int]]) -> pa.DictionaryArray:
+            return pa.DictionaryArray.from_arrays(pa.array(codes, pa.int32()), units)
+
+        def list_(values: pa.Array) -> pa.ListArray:
+            return pa.ListArray.from_arrays(offsets, values, mask=mask)
+
+        return pa.RecordBatch.from_arrays([
+            pa.array(self.magnitude, pa.float64()),
+            dictionary(self.unit),
+            list_(pa.array(self.series_magnitude, pa.float64())),
+            list_(dictionary(self.series_unit)),
+            list_(pa.array(self.condition_magnitude, pa.float64())),
+            list_(dictionary(self.condition_unit)),
+        ], schema=SCHEMA)
+
+
+def _series(result: Any) -> list[tuple[Any, Any]]:
+    """ (value, condition) pairs of a result; empty if it has no quantity. """
+    if isinstance(result, (Quantity, int, float)):
+        return [(result, None)]
+    if not isinstance(result, list) or not result:
+        return []
+
+    depth = get_list_depth(result)
+    if depth == 1:  # [quantity, ...]
+        return [(value, None) for value in result]
+    if depth == 2:  # [[quantity, condition], ...]
+        return [_pair(item) for item in result]
+    raise ValueError(f"Can't convert result with list nesting of 3 or greater: {result}")
+
+
+def _pair(item: Any) -> tuple[Any, Any]:
+    if not isinstance(item, list):
+        return item, None
+    return (item[0] if item else None), (item[1] if len(item) > 1 else None)
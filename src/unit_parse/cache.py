@@ -0,0 +1,369 @@
+"""
+Cache
+
+Small, thread-safe caches used to avoid repeating expensive work (like asking Pint to parse the same unit text
+over and over), and a persistent cache of parse results kept on disk between runs.
+
+"""
+from typing import Any, Callable, Hashable, NamedTuple, Optional
+from collections import OrderedDict
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+_missing = object()
+_registry_lock = threading.RLock()
+
+
+def per_registry(registry: Any, factory: Callable[[Any], Any]) -> Any:
+    """ per registry
+
+    Returns `factory(registry)`, made on first use and then reused (one per factory). It is kept on the registry
+    itself, so it goes when the registry does; a dict of registries would keep every registry alive.
+
+    Parameters
+    ----------
+    registry: UnitRegistry
+    factory: Callable[[UnitRegistry], Any]
+
+    """
+    made = vars(registry).get("_unit_parse")
+    obj = None if made is None else made.get(factory)
+    if obj is None:
+        with _registry_lock:
+            made = vars(registry).setdefault("_unit_parse", {})
+            obj = made.get(factory)
+            if obj is None:
+                obj = made[factory] = factory(registry)
+
+    return obj
+
+
+class LRUCache:
+    """ LRU Cache
+
+    Bounded, thread-safe, least-recently-used cache.
+
+    Parameters
+    ----------
+    maxsize: int
+        Maximum number of entries kept. 0 turns the cache off.
+    ttl: float
+        Seconds an entry is kept for. None (default) keeps entries until they are pushed out.
+
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self._data: OrderedDict = OrderedDict()  # key: (value, expiry time or None)
+        self._lock = threading.RLock()
+        self._maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.info()})"
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key: Hashable):
+        return key in self._data
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize: int):
+        if maxsize < 0:
+            raise ValueError(f"'maxsize' must be 0 or larger. Given: {maxsize}")
+        with self._lock:
+            self._maxsize = maxsize
+            self._trim()
+
+    @property
+    def hit_rate(self) -> float:
+        return self.info().hit_rate
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _missing)
+            if entry is _missing:
+                self.misses += 1
+                return default
+
+            value, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                self.evictions += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = (value, None if self.ttl is None else time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            self._trim()
+
+    def clear(self):
+        """ Remove all entries and reset the statistics. """
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self._maxsize, len(self._data), self.evictions)
+
+    def _trim(self):
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+
+class UnitCache(LRUCache):
+    """ Unit Cache
+
+    Remembers the result of turning text into a Unit; both successes and failures are kept, so pint only has to
+    parse (and raise on) a piece of text once.
+
+    Parameters
+    ----------
+    factory: Callable[[str], Unit]
+        Makes a Unit from text; raises an Exception if it can't. (normally `Unit`)
+    maxsize: int
+        Maximum number of entries kept. 0 turns the cache off.
+
+    """
+
+    def __init__(self, factory: Callable[[str], Any], maxsize: int = 1024):
+        super().__init__(maxsize)
+        self.factory = factory
+
+    def lookup(self, text: str) -> Optional[Any]:
+        """ Returns Unit for text, or None if the text is not a unit. """
+        unit = self.get(text, _missing)
+        if unit is not _missing:
+            return unit
+
+        try:
+            unit = self.factory(text)
+        except Exception:
+            unit = None
+
+        if self._maxsize:
+            self.put(text, unit)
+        return unit
+
+
+class ResultCache(LRUCache):
+    """ Result Cache
+
+    Remembers `parser` results by input text.
+
+    * Results are kept in serialized form (see `serialize`) and rebuilt on every hit, so callers get their own
+      Quantity objects and can't change what is cached.
+    * The cache belongs to one set of parsing settings (a `ConfigSnapshot`). It empties itself when parsing is done
+      with different settings (e.g. after `config.pre_proc_sub` or `config.remove_text` are changed).
+
+    Parameters
+    ----------
+    maxsize: int
+        Maximum number of entries kept. 0 (default) turns the cache off.
+    ttl: float
+        Seconds an entry is kept for. None (default) keeps entries until they are pushed out.
+
+    """
+
+    def __init__(self, maxsize: int = 0, ttl: Optional[float] = None):
+        super().__init__(maxsize, ttl)
+        self._settings = None
+
+    def lookup(self, text: str, settings: Any, parse: Callable[[str], Any]) -> Any:
+        """ Returns the cached result for text, or parse(text) (and caches it). """
+        from unit_parse.serialize import dump, load  # serialize needs the registry, which is set up after this module
+
+        with self._lock:
+            if settings is not self._settings:
+                self._data.clear()
+                self._settings = settings
+            data = self.get(text, _missing)
+
+        if data is not _missing:
+            return load(data)
+
+        result = parse(text)
+        if self._maxsize:
+            data = dump(result)
+            with self._lock:
+                if settings is self._settings:  # (not if another thread changed the settings during the parse)
+                    self.put(text, data)
+        return result
+
+
+class PersistentCache:
+    """ Persistent Cache
+
+    `parser` results stored in a SQLite file, so later runs (and other processes) don't parse the same text again.
+
+    * Entries are keyed on the sha256 of the text and the settings fingerprint (`ConfigSnapshot.fingerprint`, which
+      includes the unit_parse and pint versions); results from other settings or versions are never returned.
+    * Results are stored as JSON (see `serialize.dumps`) and rebuilt in the current unit registry on every hit.
+    * Writes are committed every 'commit_every' new results, and by `flush()`/`close()`. Results not committed when
+      the program stops are lost (they are parsed again next run).
+    * A process forked from the one that opened the file (e.g. `parse_many` workers) opens it again on first use, as
+      an SQLite connection must not be used in two processes.
+
+    Parameters
+    ----------
+    path: str
+        SQLite file (made if it doesn't exist). ":memory:" for a cache that is not kept.
+    commit_every: int
+        Number of new results written before they are committed.
+
+    """
+
+    def __init__(self, path: str, commit_every: int = 1000):
+        self.path = path
+        self.commit_every = commit_every
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._uncommitted = 0
+        self._settings = None
+        self._fingerprint = ""
+
+        self._connection = self._connect()
+
+    def __repr__(self):
+        return f"PersistentCache({self.path!r}, {self.info()})"
+
+    def __enter__(self) -> "PersistentCache":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        with self._process_lock():
+            return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    @property
+    def hit_rate(self) -> float:
+        return self.info().hit_rate
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, 0, len(self))
+
+    def lookup(self, text: str, settings: Any, parse: Callable[[str], Any]) -> Any:
+        """ Returns the stored result for text, or parse(text) (and stores it). """
+        from unit_parse.serialize import dumps, loads  # serialize needs the registry, which is set up after this module
+
+        fingerprint = self._get_fingerprint(settings)
+        text_hash = hashlib.sha256(text.encode("utf-8")).digest()
+        with self._process_lock():
+            row = self._connection.execute(
+                "SELECT result FROM results WHERE fingerprint = ? AND text_hash = ?", (fingerprint, text_hash)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if row is not None:
+            return loads(row[0])
+
+        result = parse(text)
+        with self._process_lock():
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results (fingerprint, text_hash, result) VALUES (?, ?, ?)",
+                (fingerprint, text_hash, dumps(result))
+            )
+            self._uncommitted += 1
+            if self._uncommitted >= self.commit_every:
+                self.flush()
+
+        return result
+
+    def flush(self):
+        """ Commit results written so far. """
+        with self._process_lock():
+            self._connection.commit()
+            self._uncommitted = 0
+
+    def clear(self, stale_only: bool = False):
+        """ Delete all stored results, or only those from other settings/versions (stale_only=True). """
+        from unit_parse.config import config
+
+        with self._process_lock():
+            if stale_only:
+                fingerprint = self._get_fingerprint(config.snapshot())
+                self._connection.execute("DELETE FROM results WHERE fingerprint != ?", (fingerprint,))
+            else:
+                self._connection.execute("DELETE FROM results")
+            self._connection.commit()
+            self._uncommitted = 0
+            self.hits = 0
+            self.misses = 0
+
+    def close(self):
+        """ Commit and close the file. """
+        with self._process_lock():
+            self._connection.commit()
+            self._connection.close()
+
+    def _get_fingerprint(self, settings: Any) -> str:
+        if settings is not self._settings:
+            with self._process_lock():
+                if settings is not self._settings:
+                    self._fingerprint = settings.fingerprint()
+                    self._settings = settings
+        return self._fingerprint
+
+    def _connect(self) -> sqlite3.Connection:
+        self._pid = os.getpid()
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS results "
+            "(fingerprint TEXT NOT NULL, text_hash BLOB NOT NULL, result TEXT NOT NULL, "
+            "PRIMARY KEY (fingerprint, text_hash)) WITHOUT ROWID"
+        )
+        connection.commit()
+        return connection
+
+    def _process_lock(self) -> threading.RLock:
+        """ Lock to hold while using the connection; in a forked process, the file is opened again first (the
+        parent's connection and its uncommitted writes are left alone, and its lock may have been held). """
+        if self._pid != os.getpid():
+            self._lock = threading.RLock()
+            self._uncommitted = 0
+            self.hits = 0
+            self.misses = 0
+            self._connection = self._connect()
+        return self._lock
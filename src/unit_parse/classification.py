@@ -1,9 +1,10 @@
-from typing import Union, Any
+from typing import Union, Any, Hashable
 from enum import Enum
 import math
 import dataclasses
 
 from unit_parse.config import Quantity, Unit
+from unit_parse.unit_table import DIMENSIONLESS, UnitTable, get_unit_table
 from unit_parse.utils import quantity_approx_equal, get_list_depth
 from unit_parse.logger import log_debug
 
@@ -55,10 +56,12 @@ def quantity_classifier(data_in: list[Any]) -> list[ClassificationObj]:
 
 def dim_0_classifier(data_in: Union[Quantity, float, int]) -> ClassificationObj:
     if isinstance(data_in, (int, float)):
-        return ClassificationObj(quantity=data_in, unit=Unit(""), count=1, type_=QuantClass.NUMBER)
+        return ClassificationObj(quantity=data_in, unit=get_unit_table().unit(DIMENSIONLESS), count=1,
+                                 type_=QuantClass.NUMBER)
 
     elif isinstance(data_in, Quantity):
-        return ClassificationObj(quantity=data_in, unit=data_in.units, count=1, type_=QuantClass.SINGLE)
+        return ClassificationObj(quantity=data_in, unit=get_unit_table().shared(data_in._units), count=1,
+                                 type_=QuantClass.SINGLE)
 
     else:
         raise TypeError(f"Invalid type (only, int, float, or Quantity): {data_in} ({type(data_in)})")
@@ -133,19 +136,17 @@ def dim_2_classifier(data_in: list[list[Any]]) -> list[ClassificationObj]:
 
 
 def same_dimensionality(quantity1: Union[int, float, Quantity], quantity2: Union[int, float, Quantity]) -> bool:
-    if isinstance(quantity1, (int, float)):
-        quantity1 = Quantity(quantity1)
-    if isinstance(quantity2, (int, float)):
-        quantity2 = Quantity(quantity2)
+    table = get_unit_table()
+    return _dimension_id(quantity1, table) == _dimension_id(quantity2, table)
 
-    if not isinstance(quantity1, Quantity):
-        raise TypeError(f"Invalid type (only, int, float, or Quantity): {quantity1} ({type(quantity1)})")
-    if not isinstance(quantity2, Quantity):
-        raise TypeError(f"Invalid type (only, int, float, or Quantity): {quantity2} ({type(quantity2)})")
 
-    if quantity1.dimensionality == quantity2.dimensionality:
-        return True
-    return False
+def _dimension_id(quantity: Union[int, float, Quantity], table: UnitTable) -> Hashable:
+    if isinstance(quantity, (int, float)):
+        return DIMENSIONLESS
+    if not isinstance(quantity, Quantity):
+        raise TypeError(f"Invalid type (only, int, float, or Quantity): {quantity} ({type(quantity)})")
+
+    return table.dimension_id(quantity._units)
 
 
 def dim_3_classifier(data_in: list[list[Any]]) -> list[ClassificationObj]:
@@ -168,16 +169,17 @@ def dim_3_classifier(data_in: list[list[Any]]) -> list[ClassificationObj]:
     return out
 
 
-def _get_dim(obj: Union[int, float, Quantity]):
+def _get_dim(obj: Union[int, float, Quantity, list]) -> Union[Unit, None]:
+    return _get_unit(obj, get_unit_table())
+
+
+def _get_unit(obj: Union[int, float, Quantity, list], table: UnitTable) -> Union[Unit, None]:
     if isinstance(obj, Quantity):
-        return obj.units
+        return table.shared(obj._units)
     if isinstance(obj, list):
-        unit_ = _get_dim(obj[0])
-        for v in obj:
-            unit__ = _get_dim(v)
-            if unit_ != unit__:
-                return None  # removes series later that don't have homogenous units
-        else:
-            return unit_
+        units = {_get_unit(v, table) for v in obj}
+        if len(units) != 1:
+            return None  # removes series later that don't have homogenous units
+        return units.pop()
 
-    return Unit("")
+    return table.unit(DIMENSIONLESS)
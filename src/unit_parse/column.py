@@ -0,0 +1,119 @@
+"""
+Column
+
+Parse a column of text (a list, a pandas Series, ...) into a single Quantity holding a numpy array, with every value
+converted to the same unit.
+
+```python
+from unit_parse.column import parse_column
+
+result = parse_column(["1.2 g/mL", "1100 kg/m**3", "fish"])
+result.quantity  # <Quantity([1.2 1.1 nan], 'gram / milliliter')>
+result.mask  # [False False  True]
+```
+
+Each distinct text is parsed once. Values are converted to the target unit one unit at a time (one vectorized
+conversion per distinct unit), so the column stays a numpy array end to end.
+
+Needs numpy (`pip install numpy`).
+
+"""
+from typing import Any, Iterable, NamedTuple, Union
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover
+    raise ImportError("'unit_parse.column' needs numpy (pip install numpy).") from e
+
+from unit_parse.classification import ClassificationObj, QuantClass
+from unit_parse.config import Quantity, Unit
+from unit_parse.logger import logger
+from unit_parse.main import parser_batch
+from unit_parse.reduce_quantities import remove_bad_dim
+from unit_parse.utils import first_quantity
+
+
+class ColumnResult(NamedTuple):
+    quantity: Quantity  # magnitude: float64 numpy array (nan where mask is True)
+    mask: Any  # numpy bool array; True where the text could not be parsed or converted to the unit
+
+
+def parse_column(texts: Iterable[Any], target_unit: Union[str, Unit, None] = None, errors: str = "warn") \
+        -> ColumnResult:
+    """ parse column
+
+    Parameters
+    ----------
+    texts: Iterable[Any]
+        texts you want to be parsed. Anything that isn't a string (None, nan, ...) is masked.
+    target_unit: str, Unit, None
+        Unit all values are converted to. Default is picked like `reduce_quantities` picks units: the most common
+        dimensionality (not dimensionless, if there is a choice), then its most common unit.
+    errors: str
+        What to do when a text fails to parse:
+        * "warn": log a warning and mask that value (default)
+        * "raise": raise the error
+
+    Returns
+    -------
+    result: ColumnResult
+        * quantity: Quantity holding a float64 numpy array, in the target unit
+        * mask: numpy bool array, True for values that failed (to parse or to convert)
+
+    Notes
+    -----
+    Results with conditions or several values ('[[quantity, condition], ...]') give their first quantity.
+
+    """
+    if errors not in ("warn", "raise"):
+        raise ValueError(f"'errors' must be 'warn' or 'raise'. Given: {errors}")
+
+    # parse each distinct text once
+    codes = []
+    unique: dict[str, int] = {}
+    for text in texts:
+        if not isinstance(text, str):
+            codes.append(-1)
+            continue
+        code = unique.get(text)
+        if code is None:
+            code = unique[text] = len(unique)
+        codes.append(code)
+
+    results = parser_batch(unique, errors=errors)
+    values = [first_quantity(result) for result in results]
+
+    # group values by unit
+    groups: dict[Unit, list[int]] = {}
+    for i, value in enumerate(values):
+        if value is not None:
+            groups.setdefault(value.units, []).append(i)
+
+    if target_unit is None:
+        target_unit = _pick_unit(groups, codes)
+    elif isinstance(target_unit, str):
+        target_unit = Unit(target_unit)
+
+    # convert one unit at a time
+    magnitudes = np.full(len(values) + 1, np.nan)  # last element is for texts that aren't strings (code -1)
+    for unit, indexes in groups.items():
+        group = Quantity(np.array([values[i].magnitude for i in indexes], dtype=float), unit)
+        try:
+            magnitudes[indexes] = group.m_as(target_unit)
+        except Exception as e:
+            logger.warning(f"Column values in '{unit}' can't be converted to '{target_unit}' ({type(e).__name__}).")
+
+    magnitudes = magnitudes[np.array(codes, dtype=np.intp)]
+    return ColumnResult(Quantity(magnitudes, target_unit), np.isnan(magnitudes))
+
+
+def _pick_unit(groups: dict[Unit, list[int]], codes: list[int]) -> Unit:
+    """ Unit like `reduce_quantities`: most common dimensionality, then most common unit. """
+    if not groups:
+        return Unit("")
+
+    counts = np.bincount(np.array([code for code in codes if code >= 0], dtype=np.intp))
+    class_data = [ClassificationObj(quantity=None, unit=unit, count=int(counts[indexes].sum()), type_=QuantClass.SINGLE)
+                  for unit, indexes in groups.items()]
+    class_data = remove_bad_dim(class_data)
+    return max(class_data, key=lambda data: data.count).unit
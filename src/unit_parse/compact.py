@@ -0,0 +1,125 @@
+"""
+Compact
+
+A small, immutable form of parser results for holding very many of them in memory. A quantity becomes a
+`CompactQuantity` (a named tuple of its value, the id of its unit in the `unit_table`, and its conditions) instead of a
+pint `Quantity` with its own dict and units container.
+
+```python
+from unit_parse import parser
+from unit_parse.compact import compact, expand
+
+result = compact(parser("20.8 mm Hg @ 25 °C"))
+print(result)  # (CompactQuantity(value=20.8, unit_id=0, conditions=(CompactQuantity(value=25.0, unit_id=1, ...),)),)
+result[0].to_pint()  # <Quantity(20.8, 'millimeter_Hg')>
+expand(result)  # [[<Quantity(20.8, 'millimeter_Hg')>, <Quantity(25.0, 'degree_Celsius')>]]
+```
+
+| parser result | compact |
+|---|---|
+| None | None |
+| quantity (or number) | CompactQuantity |
+| [quantity, ...] | (CompactQuantity, ...) |
+| [[quantity, condition], ...] | (CompactQuantity(conditions=(condition,)), ...) |
+
+Values are stored as floats, and numbers become dimensionless quantities.
+
+"""
+from typing import Any, NamedTuple, Optional, Sequence, Union
+
+from unit_parse.config import Quantity, Unit
+from unit_parse.unit_table import UnitTable, get_unit_table
+from unit_parse.utils import get_list_depth
+
+
+class CompactQuantity(NamedTuple):
+    value: float
+    unit_id: int  # id in the unit table
+    conditions: tuple["CompactQuantity", ...] = ()
+
+    def unit(self, table: Optional[UnitTable] = None) -> Unit:
+        """ Unit (from the unit table of the registry in use, or the table given). """
+        return (table or get_unit_table()).unit(self.unit_id)
+
+    def to_pint(self, table: Optional[UnitTable] = None) -> Quantity:
+        """ Quantity of the value (without the conditions). """
+        return Quantity(self.value, self.unit(table))
+
+
+CompactResult = Union[CompactQuantity, tuple[CompactQuantity, ...], None]
+
+
+def compact(result: Any, table: Optional[UnitTable] = None) -> CompactResult:
+    """ compact
+
+    Parameters
+    ----------
+    result: Any
+        parser or reduce_quantities result
+    table: UnitTable
+        Unit table the units are interned in. Default is the table of the registry in use.
+
+    Returns
+    -------
+    result: CompactResult
+        See the table in the module docstring.
+
+    """
+    if result is None:
+        return None
+    if table is None:
+        table = get_unit_table()
+
+    if not isinstance(result, list):
+        return _compact_quantity(result, table)
+
+    depth = get_list_depth(result)
+    if depth == 1:
+        return tuple(_compact_quantity(value, table) for value in result)
+    if depth == 2:
+        return tuple(_compact_quantity(item[0], table, item[1:]) if isinstance(item, list) else
+                     _compact_quantity(item, table) for item in result)
+    raise ValueError(f"Can't compact result with list nesting of 3 or greater: {result}")
+
+
+def expand(result: CompactResult, table: Optional[UnitTable] = None) -> Any:
+    """ expand
+
+    Parameters
+    ----------
+    result: CompactResult
+        from `compact`
+    table: UnitTable
+        Unit table the unit ids are from. Default is the table of the registry in use.
+
+    Returns
+    -------
+    result: Any
+        parser result structure, with pint quantities
+
+    """
+    if result is None:
+        return None
+    if table is None:
+        table = get_unit_table()
+
+    if isinstance(result, CompactQuantity):
+        return result.to_pint(table)
+
+    if any(value.conditions for value in result):
+        return [[value.to_pint(table)] + [condition.to_pint(table) for condition in value.conditions]
+                for value in result]
+    return [value.to_pint(table) for value in result]
+
+
+def _compact_quantity(value: Any, table: UnitTable, conditions: Sequence[Any] = ()) -> CompactQuantity:
+    if isinstance(value, (int, float)):
+        value = Quantity(value)
+    if not isinstance(value, Quantity):
+        raise TypeError(f"Invalid type (only, int, float, or Quantity): {value} ({type(value)})")
+
+    return CompactQuantity(
+        float(value.magnitude),
+        table.intern(value._units),
+        tuple(_compact_quantity(condition, table) for condition in conditions)
+    )
@@ -1,8 +1,14 @@
-import inspect
+from typing import Container, Iterator, NamedTuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+import hashlib
 import os
 import sys
+import threading
 
 from unit_parse.logger import logger
+from unit_parse.cache import ResultCache, UnitCache, per_registry
+from unit_parse.dictionary import CompactDictionary
 
 
 def get_unit_registry():
@@ -10,16 +16,30 @@ def get_unit_registry():
     Gets object from Python stack/globals
     Stops at first object it finds
 
+    Walks the frames directly (`inspect.stack()` would also read the source lines of every frame).
+
     """
-    stack = inspect.stack()
-    for frame in stack:
-        attrs: dict = frame.frame.f_locals
-        for attr in attrs.values():
+    frame = sys._getframe(1)
+    while frame is not None:
+        for attr in frame.f_locals.values():
             if hasattr(attr, "_REGISTRY"):
                 return attr._REGISTRY
-    else:
-        mes = "Pint UnitRegistry not found."
-        raise Exception(mes)
+        frame = frame.f_back
+
+    mes = "Pint UnitRegistry not found."
+    raise Exception(mes)
+
+
+def get_application_registry():
+    """ Returns pint's application registry if the application has set one (pint.set_application_registry), else
+    None. """
+    import pint
+    registry = pint.get_application_registry().get()
+    # pint's default, not set by the application (compared by identity: once used, pint's LazyRegistry changes its
+    # class to UnitRegistry)
+    if registry is pint._DEFAULT_REGISTRY:
+        return None
+    return registry
 
 
 def check_for_pint():
@@ -34,8 +54,22 @@ def check_for_pint():
     UnitRegistry
 
     """
+    u_ = find_unit_registry()
+    if u_ is not None:
+        return u_
+
+    return new_unit_registry()
+
+
+def find_unit_registry():
+    """ Returns the unit registry found in the stack, or None if pint isn't imported or no registry is found. """
     modules = sys.modules
     if "pint" in modules:
+        # fast path: registry given to pint by the application
+        u_ = get_application_registry()
+        if u_ is not None:
+            return u_
+
         logger.warning("'Pint' module found in stack. (you have 'import pint' somewhere in your code).")
         # get unit registry
         try:
@@ -46,23 +80,205 @@ def check_for_pint():
             logger.warning("Pint unit registry not found in stack. Loading 'unit_parser' registry. (Note: "
                            "Pint unit registries are not interoperable. ")
 
-    # if no pint found, load local
+    return None
+
+
+def new_unit_registry():
+    """ Create unit_parse's own unit registry. """
     import pint
     u_ = pint.UnitRegistry(autoconvert_offset_to_baseunit=True)
     u_.default_format = "~"
     return u_
 
 
+_registry = None
+_registry_lock = threading.RLock()
+_registry_override: ContextVar = ContextVar("unit_parse_registry", default=None)  # see `use_registry`
+
+
+def get_registry():
+    """ get registry
+
+    Returns the unit registry in use: the one given to `use_registry` (in this thread or task), else the one
+    unit_parse is bound to. Building a registry is slow, so it is only done on first use (parsing, or calling
+    `Unit`/`Quantity`), or by `unit_parse.warmup()`.
+
+    Returns
+    -------
+    UnitRegistry
+
+    """
+    registry = _registry_override.get()
+    if registry is not None:
+        return registry
+
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = new_unit_registry()
+    return _registry
+
+
+def set_registry(registry=None):
+    """ set registry
+
+    Binds unit_parse to a Pint unit registry, instead of looking for one in the stack. `Unit`, `Quantity`, `U`, `Q`
+    and all caches will use this registry from now on.
+
+    Parameters
+    ----------
+    registry: UnitRegistry, None
+        Registry to use. If None, pint's application registry (`pint.get_application_registry()`) is used.
+
+    """
+    global _registry
+    import pint
+    if registry is None:
+        registry = pint.get_application_registry()
+    registry = _check_registry(registry)
+
+    with _registry_lock:
+        if registry is not _registry:
+            _registry = registry
+            config.unit_cache.clear()
+            config.result_cache.clear()
+
+
+@contextmanager
+def use_registry(registry=None) -> Iterator:
+    """ use registry
+
+    Use a Pint unit registry inside a `with` block, in the current thread (or asyncio task) only. The registry
+    unit_parse is bound to (`set_registry`) and its caches are left as they are, so other threads are not affected.
+
+    ```python
+    with use_registry(ureg):
+        result = parser("5 cm")  # ureg.Quantity
+    ```
+
+    Parameters
+    ----------
+    registry: UnitRegistry, None
+        Registry to use. If None, nothing changes.
+
+    """
+    if registry is None:
+        yield get_registry()
+        return
+
+    token = _registry_override.set(_check_registry(registry))
+    try:
+        yield registry
+    finally:
+        _registry_override.reset(token)
+
+
+def get_unit_cache() -> UnitCache:
+    """ Unit cache of the registry in use (`config.unit_cache` for the registry unit_parse is bound to). """
+    registry = _registry_override.get()
+    if registry is None or registry is _registry:
+        return config.unit_cache
+
+    return per_registry(registry, _new_unit_cache)
+
+
+def _new_unit_cache(registry) -> UnitCache:
+    return UnitCache(_shared_unit, maxsize=config.unit_cache.maxsize)
+
+
+def _check_registry(registry):
+    import pint
+    if isinstance(registry, pint.registry.ApplicationRegistry):
+        registry = registry.get()
+    if not (hasattr(registry, "Unit") and hasattr(registry, "Quantity")):  # (also finishes loading a LazyRegistry)
+        raise TypeError(f"'registry' must be a pint UnitRegistry. Given: {registry} (type: {type(registry)})")
+    return registry
+
+
+class RegistryClass:
+    """ Registry Class
+
+    Stands in for the registry's `Unit` or `Quantity` class, so they can be imported before the registry is loaded.
+    Calls, isinstance checks and attribute access are passed on to the class of the registry in use.
+
+    """
+    __slots__ = ("_name",)
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __repr__(self):
+        return f"<unit_parse {self._name}>"
+
+    def __call__(self, *args, **kwargs):
+        return getattr(get_registry(), self._name)(*args, **kwargs)
+
+    def __instancecheck__(self, obj) -> bool:
+        return isinstance(obj, getattr(get_registry(), self._name))
+
+    def __getattr__(self, name: str):
+        if name.startswith("__") and name.endswith("__"):  # don't load the registry for introspection
+            raise AttributeError(name)
+        return getattr(getattr(get_registry(), self._name), name)
+
+
 # set pint units
-u = check_for_pint()
-U = Unit = u.Unit
-Q = Quantity = u.Quantity
+# A registry can only be found while the code that made it is on the stack, so look now (only if pint is imported)
+_registry = find_unit_registry()
+U = Unit = RegistryClass("Unit")
+Q = Quantity = RegistryClass("Quantity")
 
-# load english dictionary
+# english dictionary (loaded on first use)
 file_path = os.path.dirname(os.path.realpath(__file__))
 path_to_dict = os.path.join(file_path, "support_files", "dictionary.txt")
-with open(path_to_dict, 'r') as file:
-    english_dict = set(file.read().split("\n"))
+
+
+def _shared_unit(text: str) -> Unit:
+    """ Unit of text; equal units are the same object (see `unit_table`). """
+    from unit_parse.grammar import power_too_large
+    from unit_parse.unit_table import get_unit_table  # (unit_table imports this module)
+    if power_too_large(text):
+        raise OverflowError(f"Power too large: {text}")
+    return get_unit_table().shared(Unit(text))
+
+
+def __getattr__(name: str):
+    if name == "u":
+        return get_registry()
+    if name == "english_dict":
+        return config.english_dict
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class ConfigSnapshot(NamedTuple):
+    """ Immutable copy of the parsing settings of `Config`, taken at the start of each parse (see `Config.snapshot`). """
+    remove_text: tuple[str, ...]
+    pre_proc_sub: tuple[tuple[str, str], ...]
+    pre_proc_split: tuple[str, ...]
+    last_minute_sub: tuple[tuple[str, str], ...]
+    english_dict: Container[str]
+
+    def fingerprint(self) -> str:
+        """ Hash of the settings, the unit_parse version and the pint version. The same between runs. """
+        from importlib import metadata
+        versions = []
+        for package in ("unit_parse", "pint"):
+            try:
+                versions.append(metadata.version(package))
+            except metadata.PackageNotFoundError:
+                versions.append(None)
+
+        hash_ = hashlib.sha256(repr((versions, self[:-1])).encode("utf-8"))
+        if isinstance(self.english_dict, CompactDictionary):
+            hash_.update(self.english_dict.digest().encode("utf-8"))
+        else:
+            try:
+                hash_.update("\n".join(sorted(self.english_dict)).encode("utf-8"))
+            except TypeError:  # not iterable
+                hash_.update(type(self.english_dict).__qualname__.encode("utf-8"))
+
+        return hash_.hexdigest()
 
 
 class Config:
@@ -77,8 +293,22 @@ class Config:
 
     last_minute_sub
 
-    english_dict: set
-        A reduced set of english words that are removed from the parsing text.
+    english_dict: CompactDictionary
+        A reduced set of english words that are removed from the parsing text. Any container of lower case words
+        (e.g. a set) can be used instead.
+    unit_cache: UnitCache
+        Cache of text -> Unit look-ups (including failed ones).
+        Change size with `config.unit_cache.maxsize`, see statistics with `config.unit_cache.info()` and empty it
+        with `config.unit_cache.clear()`.
+    result_cache: ResultCache
+        Cache of text -> `parser` result. Off by default; turn on with `config.result_cache.maxsize = 10_000`
+        (optionally with `config.result_cache.ttl` in seconds). Emptied automatically when the settings change.
+    persistent_cache: PersistentCache, None
+        On-disk cache of text -> `parser` result, kept between runs. None (default) is off; turn on with
+        `config.persistent_cache = PersistentCache("parse_cache.sqlite")`.
+
+    Parsing reads the settings through `snapshot()`, so they can be changed at any time (even while other threads
+    are parsing).
 
     """
 
@@ -124,7 +354,58 @@ class Config:
             ["(?<=[a-zA-Z0-9]) {1,2}[0-9()]{2,5}", ""]  # remove trailing number  ex. 90 g/mol 1999 ->  90 g/mol
         ]
 
-        self.english_dict = english_dict
+        self._english_dict = None
+
+        self.unit_cache = UnitCache(_shared_unit, maxsize=1024)
+        self.result_cache = ResultCache(maxsize=0)
+        self.persistent_cache = None
+
+        self._snapshot = None  # (ConfigSnapshot, copy of the lists it was made from)
+
+    def snapshot(self) -> ConfigSnapshot:
+        """ snapshot
+
+        Immutable copy of the current parsing settings. Each parse works from one snapshot, so changing the settings
+        (from any thread) never affects a parse that has already started.
+        The same snapshot object is returned until a setting is changed.
+
+        Returns
+        -------
+        snapshot: ConfigSnapshot
+
+        """
+        english_dict = self.english_dict
+        settings = [self.remove_text or [], self.pre_proc_sub or [], self.pre_proc_split or [],
+                    self.last_minute_sub or []]
+        cached = self._snapshot
+        if cached is not None:
+            snapshot, source = cached
+            if snapshot.english_dict is english_dict and source == settings:
+                return snapshot
+
+        source = [list(settings[0]), [list(rule) for rule in settings[1]], list(settings[2]),
+                  [list(rule) for rule in settings[3]]]
+        snapshot = ConfigSnapshot(
+            remove_text=tuple(source[0]),
+            pre_proc_sub=tuple(tuple(rule) for rule in source[1]),
+            pre_proc_split=tuple(source[2]),
+            last_minute_sub=tuple(tuple(rule) for rule in source[3]),
+            english_dict=english_dict,
+        )
+        self._snapshot = (snapshot, source)
+        return snapshot
+
+    @property
+    def english_dict(self):
+        if self._english_dict is None:
+            with _registry_lock:
+                if self._english_dict is None:
+                    self._english_dict = CompactDictionary.from_file(path_to_dict)
+        return self._english_dict
+
+    @english_dict.setter
+    def english_dict(self, english_dict):
+        self._english_dict = english_dict
 
 
 config = Config()
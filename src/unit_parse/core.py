@@ -5,17 +5,22 @@ This code does the heavy lifting of turning strings into Quantities. Its the fun
 most mess.
 
 """
-from typing import List, Union
+from typing import List, Optional, Sequence, Union
+from decimal import Decimal
 import re
 
-from unit_parse.config import Unit, Quantity, config
+from unit_parse.config import ConfigSnapshot, Unit, Quantity, config, get_registry, get_unit_cache
+from unit_parse.grammar import TOO_LARGE, UNDEFINED, get_grammar
 from unit_parse.pre_processing_substitution import sub_general
-from unit_parse.utils import flatten_list, contains_number, sig_figs, remove_empty_str, split_list
+from unit_parse.segmentation import get_segmenter
+from unit_parse.unit_table import get_unit_table
+from unit_parse.utils import flatten_list, contains_number, evaluate_number, remove_empty_str, split_list
 from unit_parse.logger import log_debug, log_info, logger
 
 
 @log_info
-def text_list_to_quantity(text_list: Union[list[list[str]], list[str]]) -> list[Quantity]:
+def text_list_to_quantity(text_list: Union[list[list[str]], list[str]], settings: Optional[ConfigSnapshot] = None) \
+        -> list[Quantity]:
     """ text list to quantity
 
     Entry point for quantity parsing.
@@ -25,13 +30,17 @@ def text_list_to_quantity(text_list: Union[list[list[str]], list[str]]) -> list[
     ----------
     text_list: list[list[str]], list[str]
         pre-parsed text list
+    settings: ConfigSnapshot
+        Settings to use. Default is `config.snapshot()`.
 
     Returns
     -------
     Quantity: list[list[Quantity]], list[Quantity]
 
     """
-    text_list = last_minute_sub(text_list)
+    if settings is None:
+        settings = config.snapshot()
+    text_list = last_minute_sub(text_list, patterns=settings.last_minute_sub)
 
     out = []
     for text in text_list:
@@ -46,15 +55,20 @@ def text_list_to_quantity(text_list: Union[list[list[str]], list[str]]) -> list[
 
 
 @log_debug
-def last_minute_sub(text_list: Union[list[list[str]], list[str]]) -> Union[list[list[str]], list[str]]:
-    for i, obj in enumerate(text_list):
+def last_minute_sub(text_list: Union[list[list[str]], list[str]], patterns: Optional[Sequence[Sequence[str]]] = None) \
+        -> Union[list[list[str]], list[str]]:
+    """ Apply the last minute substitutions (default: `config.last_minute_sub`). Returns a new list. """
+    if patterns is None:
+        patterns = config.last_minute_sub
+
+    out = []
+    for obj in text_list:
         if isinstance(obj, list):
-            for ii, text in enumerate(obj):
-                text_list[i][ii] = sub_general(text, config.last_minute_sub)
+            out.append([sub_general(text, patterns) for text in obj])
         else:
-            text_list[i] = sub_general(obj, config.last_minute_sub)
+            out.append(sub_general(obj, patterns))
 
-    return text_list
+    return out
 
 
 @log_debug
@@ -89,6 +103,9 @@ def try_to_convert(text: str) -> Union[float, Unit, Quantity, None]:
 
     Try to turn string into a number, unit, quantity in that order. If all fails try complex parsing.
 
+    The text is read once (see `grammar`) to pick which of these it is; only text the grammar can't read is tried
+    with each in turn.
+
     Parameters
     ----------
     text: str
@@ -98,21 +115,58 @@ def try_to_convert(text: str) -> Union[float, Unit, Quantity, None]:
     out: float, Unit, Quantity, None
 
     """
+    expression = get_grammar(get_registry()).read(text)
+    if expression is None:
+        return _try_each(text)
+    if expression is TOO_LARGE:
+        return None
+
+    if expression is not UNDEFINED and expression.number_only:
+        return float(text)
+    if not contains_number(text):
+        unit = to_unit(text)
+        if unit is not None:
+            return unit
+    if expression is UNDEFINED:
+        return to_quantity_expanded(text) if contains_number(text) else None
+
+    return Quantity(expression.magnitude, expression.units)
+
+
+def _try_each(text: str) -> Union[float, Unit, Quantity, None]:
     try:
         return float(text)
     except Exception:
         pass
     if not contains_number(text):
-        try:
-            return Unit(text)
-        except Exception:
-            pass
+        unit = to_unit(text)
+        if unit is not None:
+            return unit
     try:
         return Quantity(text)
     except Exception:
         pass
 
-    return get_quantity(text)
+    # (what get_quantity would do next, without reading the text or trying Pint again)
+    return to_quantity_expanded(text) if contains_number(text) else None
+
+
+def to_unit(text: str) -> Union[Unit, None]:
+    """ to unit
+
+    Turn text into a Unit. Look-ups are cached (see `config.unit_cache`), so repeated text is only parsed once.
+
+    Parameters
+    ----------
+    text: str
+
+    Returns
+    -------
+    unit: Unit, None
+        If unsuccessful return None
+
+    """
+    return get_unit_cache().lookup(text)
 
 
 def reduce_list(obj_list: list[Union[str, int, float, Unit, Quantity]]) -> list[Union[str, Unit, Quantity]]:
@@ -133,10 +187,9 @@ def reduce_list(obj_list: list[Union[str, int, float, Unit, Quantity]]) -> list[
     if len(obj_list) <= 1:
         return obj_list
 
-    types_ = [type(obj) for obj in obj_list]
     out = [obj_list[0]]
-    for t, obj in zip(types_[1:], obj_list[1:]):
-        if type(out[-1]) in (int, float, Quantity) and t is Unit:
+    for obj in obj_list[1:]:
+        if (type(out[-1]) in (int, float) or isinstance(out[-1], Quantity)) and isinstance(obj, Unit):
             out[-1] = out[-1] * obj
         else:
             out.append(obj)
@@ -163,6 +216,14 @@ def get_quantity(text_in: str) -> Union[Quantity, None]:
     if not contains_number(text_in):
         return None
 
+    expression = get_grammar(get_registry()).read(text_in)
+    if expression is TOO_LARGE:
+        return None
+    if expression is UNDEFINED:  # pint can't do it; use our custom method
+        return to_quantity_expanded(text_in)
+    if expression is not None:
+        return Quantity(expression.magnitude, expression.units)
+
     try:  # let pint give it an attempt
         return Quantity(text_in)
     except Exception:  # if Pint can't do it try our custom method
@@ -199,7 +260,8 @@ def to_quantity_expanded(text_in: str) -> Union[Quantity, None]:
 
 
 @log_debug
-def get_value(text_in: str) -> tuple[Union[float, int, None], str]:
+def get_value(text_in: str, as_decimal: bool = False, sig_digit: Optional[int] = 15) \
+        -> tuple[Union[float, Decimal, None], str]:
     """ get value
 
     Extracts value out of string. Value must be at the start of string.
@@ -207,11 +269,15 @@ def get_value(text_in: str) -> tuple[Union[float, int, None], str]:
     Parameters
     ----------
     text_in
+    as_decimal: bool
+        Return the value as a `decimal.Decimal` instead of a float.
+    sig_digit: int, None
+        Significant digits the value is rounded to. None keeps the significant digits written in the text.
 
     Returns
     -------
-    value: float or int
-        The value extracted
+    value: float, Decimal, None
+        The value extracted (see `evaluate_number`)
     value_text: str
         The text corresponding to the value.
 
@@ -220,12 +286,18 @@ def get_value(text_in: str) -> tuple[Union[float, int, None], str]:
     "42.3 gcm-3" --> (42.3, '42.3')
 
     """
-    try:
-        result = re.findall('^[-]?[0-9.]+[*]?[0-9.]*[*]{0,2}[-]?[0-9.]*', text_in.lstrip())[0]
-        return sig_figs(eval(result, {'__builtins__': None}), sig_digit=15), result
-    except IndexError:
+    match = _value_pattern.match(text_in.lstrip())
+    if match is None:
         return None, ""
 
+    value = evaluate_number(match.group(), as_decimal=as_decimal, sig_digit=sig_digit)
+    if value is None:
+        return None, ""
+    return value, match.group()
+
+
+_value_pattern = re.compile('[-]?[0-9.]+[*]?[0-9.]*[*]{0,2}[-]?[0-9.]*')
+
 
 @log_debug
 def get_unit(text_in: str) -> Unit:
@@ -288,16 +360,15 @@ def split_on_powers(text_in: Union[str, list[str]]) -> List[Union[str, Unit]]:
     "g**2cm**-3" --> [Unit("g**2"), Unit("cm**-3")]
 
     """
-    if isinstance(text_in, str):
-        text_in = [text_in]
+    text_in = [text_in] if isinstance(text_in, str) else list(text_in)
 
     for i, text in enumerate(text_in):
         if isinstance(text, str) and "**" in text:
             out = re.split("([a-zA-Z]+[ ]?[*]{2}[ ]?[-+]?[0-9]+)", text, maxsplit=1)
-            try:  # splits into 3 chunks, middle chunk may be a valid unit
-                out[1] = Unit(out[1])
-            except Exception:
-                pass
+            # splits into 3 chunks, middle chunk may be a valid unit
+            unit = to_unit(out[1])
+            if unit is not None:
+                out[1] = unit
 
             if "**" in out[2]:
                 last_term = out.pop(2)
@@ -326,8 +397,7 @@ def split_on_multiplication_symbol(text_in: Union[str, list[str], list[Union[str
     "g*cm" --> [Unit("g"), Unit("cm")]
 
     """
-    if isinstance(text_in, str):
-        text_in = [text_in]
+    text_in = [text_in] if isinstance(text_in, str) else list(text_in)
 
     for i, text in enumerate(text_in):
         if isinstance(text, str) and "*" in text:
@@ -336,11 +406,10 @@ def split_on_multiplication_symbol(text_in: Union[str, list[str], list[Union[str
             if len(new_splits) > 1:
                 new_splits = [chunk for chunk in new_splits if chunk != ""]
                 for ii, split in enumerate(new_splits):
-                    try:
-                        new_splits[ii] = Unit(split)
+                    unit = to_unit(split)
+                    if unit is not None:
+                        new_splits[ii] = unit
                         continue
-                    except Exception:
-                        pass
                     if bool(re.match("([^*]+)[ ]?[*][ ]?([^*-0-9].*)", split)):
                         new_splits[ii] = split_on_multiplication_symbol(split)  # pragma: no cover  recursive
 
@@ -351,11 +420,9 @@ def split_on_multiplication_symbol(text_in: Union[str, list[str], list[Union[str
                     if not bool(re.match(".*[a-zA-Z]+", text)):
                         return []
 
-                    try:
-                        text_in[i] = Unit(text[:-1])
-                        continue
-                    except Exception:
-                        text_in[i] = text[:-1]
+                    unit = to_unit(text[:-1])
+                    text_in[i] = text[:-1] if unit is None else unit
+                    continue
 
     return flatten_list(text_in)
 
@@ -373,8 +440,7 @@ def split_on_division_symbol(text_in: Union[str, list[str]]) -> List[str]:
     -------
 
     """
-    if isinstance(text_in, str):
-        text_in = [text_in]
+    text_in = [text_in] if isinstance(text_in, str) else list(text_in)
 
     for i, text in enumerate(text_in):
         if isinstance(text, str) and "/" in text:
@@ -383,11 +449,9 @@ def split_on_division_symbol(text_in: Union[str, list[str]]) -> List[str]:
             if len(new_splits) > 1:
                 new_splits = [chunk for chunk in new_splits if chunk != ""]
                 for ii, split in enumerate(new_splits):
-                    try:
-                        new_splits[ii] = Unit(split)
-                        continue
-                    except Exception:
-                        pass
+                    unit = to_unit(split)
+                    if unit is not None:
+                        new_splits[ii] = unit
 
                 text_in[i] = new_splits
                 continue
@@ -429,80 +493,46 @@ def merge_split_text(obj_list: List[Union[str, Unit]]) -> Union[Unit, None]:
         else:
             unit = unit / buffer
 
+    if unit is not None:
+        unit = get_unit_table().shared(unit)
     return unit
 
 
 @log_debug
 def frame_shift(text_in: str) -> Unit:
-    """
+    """ frame shift
+
+    Finds units that are written together without separators (see `segmentation.UnitSegmenter`).
+
+    Parameters
+    ----------
+    text_in: str
+
+    Returns
+    -------
+    unit: Unit, None
+        If the text can't be fully covered by units return None
+
+    Examples
+    --------
+    "mlgcm" --> Unit("ml*g*cm")
 
     Warning: "/" should not be in text
     """
-    _frame_dict = {}
-    for set_size in range(1, 9):
-        for i in range(len(text_in)):
-            upper_bound = i + set_size
-            if upper_bound > len(text_in):
-                break
-
-            text = text_in[i: i + set_size]
-            try:
-                unit_ = Unit(text)
-                _frame_dict[text] = {
-                    "set_size": set_size,
-                    "unit": unit_,
-                    "bounds": [i, i + set_size]
-                }
-            except Exception:
-                pass
-
-    if _frame_dict == {}:
+    chunks = get_segmenter(Unit._REGISTRY).segment(text_in, is_unit=lambda text: to_unit(text) is not None)
+    if chunks is None:
         return None
 
-    replace = {}
-    for i in range(10):
-        # get max frame
-        max_value = 0
-        max_key = ""
-        for k, v in _frame_dict.items():
-            if v["set_size"] > max_value:
-                max_value = v["set_size"]
-                max_key = k
-
-        replace[max_key] = _frame_dict.pop(max_key)
-
-        remove_keys = []
-        for k, v in _frame_dict.items():
-            if replace[max_key]["bounds"][0] <= v["bounds"][0] < replace[max_key]["bounds"][1] or \
-                    replace[max_key]["bounds"][0] < v["bounds"][1] <= replace[max_key]["bounds"][1]:
-                remove_keys.append(k)
-
-        for k in remove_keys:
-            _frame_dict.pop(k)
-
-        if not _frame_dict:
-            break  # dictionary is empty
-
-    # Taking "replace" and "text in" and merging
-    count_list = list(range(0, len(text_in), 1))
-    compile_list = []
-    for i in range(0, len(text_in)):
-        int_ = count_list[0]
-        for v in replace.values():
-            if v["bounds"][0] <= int_ < v["bounds"][1]:
-                compile_list.append(v["unit"])
-                remove_num = range(v["bounds"][0], v["bounds"][1])
-                for num in remove_num:
-                    count_list.remove(num)
-
-        if not count_list:
-            break
-
-    else:
-        return None
+    units = [to_unit(chunk) for chunk in chunks]
+    if len(units) > 1 and not all(_is_multiplicative(unit) for unit in units):
+        return None  # offset units (degC, degF) can't be multiplied with other units ("gdegC")
 
-    out = compile_list[0]
-    for i in compile_list[1:]:
-        out = out * i
+    out = units[0]
+    for unit in units[1:]:
+        out = out * unit
 
     return out
+
+
+def _is_multiplicative(unit: Unit) -> bool:
+    return all(unit._REGISTRY._is_multiplicative(name) for name in unit._units)
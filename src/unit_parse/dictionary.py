@@ -0,0 +1,125 @@
+"""
+Dictionary
+
+Compact, read-only word list used by `pre_processing_substitution.remove_words`.
+
+The words are kept sorted and newline separated in a single bytes buffer. Membership is a binary search over the
+buffer, so no per-word Python objects are created. When loaded from a file the buffer is a read-only memory map:
+pages are only read when touched and are shared (through the OS page cache) by every process using the same file.
+
+"""
+from typing import Iterable, Iterator, Union
+import hashlib
+import mmap
+
+
+class CompactDictionary:
+    """ Compact Dictionary
+
+    Set-like (read-only) collection of words with exact membership.
+
+    Parameters
+    ----------
+    buffer: bytes, mmap
+        Words in sorted (byte) order, separated by newlines. Use `from_file` or `from_words` to make one.
+    memo_size: int
+        Number of recent look-up results remembered (scraped text repeats the same few words a lot).
+
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], memo_size: int = 4096):
+        self._buffer = buffer
+        self._len = None
+        self._memo: dict[str, bool] = {}
+        self.memo_size = memo_size
+
+    def __repr__(self):
+        return f"CompactDictionary({len(self)} words)"
+
+    @classmethod
+    def from_file(cls, path: str) -> "CompactDictionary":
+        """ Memory map a file of sorted, newline separated words. """
+        with open(path, "rb") as file:
+            try:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file can't be mapped
+                buffer = b""
+        return cls(buffer)
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> "CompactDictionary":
+        """ Build from any iterable of words (sorted and de-duplicated here). """
+        return cls(b"\n".join(sorted({word.encode("utf-8") for word in words if word})))
+
+    def __contains__(self, word: object) -> bool:
+        if not isinstance(word, str):
+            return False
+
+        result = self._memo.get(word)
+        if result is None:
+            result = self._search(word)
+            if len(self._memo) >= self.memo_size:
+                self._memo.clear()
+            self._memo[word] = result
+
+        return result
+
+    def _search(self, word: str) -> bool:
+        if word == "" or "\n" in word:
+            return False
+
+        key = word.encode("utf-8")
+        buffer = self._buffer
+        lo, hi = 0, len(buffer)  # lo is always the start of a line
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = buffer.rfind(b"\n", lo, mid)
+            start = lo if start == -1 else start + 1
+            end = buffer.find(b"\n", start, hi)
+            if end == -1:
+                end = hi
+
+            line = buffer[start:end]
+            if line == key:
+                return True
+            if line < key:
+                lo = end + 1
+            else:
+                hi = start
+
+        return False
+
+    def __iter__(self) -> Iterator[str]:
+        start = 0
+        buffer = self._buffer
+        while start < len(buffer):
+            end = buffer.find(b"\n", start)
+            if end == -1:
+                end = len(buffer)
+            if end > start:
+                yield buffer[start:end].decode("utf-8")
+            start = end + 1
+
+    def __len__(self) -> int:
+        if self._len is None:
+            self._len = sum(1 for _ in self)
+        return self._len
+
+    @property
+    def nbytes(self) -> int:
+        """ Size of the word buffer. """
+        return len(self._buffer)
+
+    def digest(self) -> str:
+        """ sha256 of the word buffer (identifies the word list). """
+        return hashlib.sha256(self._buffer).hexdigest()
+
+    def is_sorted(self) -> bool:
+        """ Check the buffer is in the order binary search needs. """
+        previous = None
+        for word in self:
+            key = word.encode("utf-8")
+            if previous is not None and key <= previous:
+                return False
+            previous = key
+        return True
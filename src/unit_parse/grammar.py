@@ -0,0 +1,335 @@
+"""
+Grammar
+
+Reads value + unit text ("5.3 g/cm**3", "25 degC", "1.2*10**-3 mol/L") in one pass, the same way Pint's parser
+would, so `core.try_to_convert` can tell from one read if the text is a number, a unit or a quantity (or that Pint
+would fail on it), instead of trying each with Pint and catching the errors.
+
+    expression := ["-"] term {operator term}
+    operator   := "*" | "/" | " "                  (a space multiplies, as in Pint)
+    term       := atom [power]
+    atom       := number | name | "(" expression ")"
+    power      := ("**" | "^") ["-" | "+"] integer
+    name       := word {word | number}            ("g", "cm3", "degC")
+
+Unit names are looked up in a symbol table built from the unit registry. Text outside this grammar, or text Pint's
+parser treats in a special way ("%", "per", "squared", offset units inside compound units, ...) is not read
+(`read` returns None) and is left to Pint.
+
+Text with a power too large to work out ("10**10**10", "9**99999999") is not read either, and must not be given to
+Pint, which would hang working it out (`read` returns TOO_LARGE).
+
+"""
+from typing import Any, NamedTuple, Optional, Union
+from string import ascii_letters
+
+from unit_parse.cache import UnitCache, per_registry
+from unit_parse.tokenizer import CLOSE, NUMBER, OPEN, OPERATOR, POWER, SPACE, WORD, Token, tokenize
+
+MAX_POWER_BITS = 1 << 20  # largest power of an int worked out (in bits; about 300,000 digits)
+
+
+class Expression(NamedTuple):
+    magnitude: Union[int, float]
+    units: Any  # pint UnitsContainer
+    number_only: bool  # text is just a number (e.g. "-5.3")
+
+
+UNDEFINED = object()  # `read` result for text that fits the grammar, but has a name that is not a unit
+TOO_LARGE = object()  # `read` result for text with a power too large to work out (see `power_too_large`)
+
+# words Pint's parser gives a special meaning (or a value)
+_special_words = {"per", "squared", "cubed", "cubic", "square", "sq", "dimensionless", "inf", "infinity", "nan"}
+
+
+class Grammar:
+    """ Grammar
+
+    Parameters
+    ----------
+    registry: UnitRegistry
+        Pint unit registry the unit names are looked up in.
+
+    """
+
+    def __init__(self, registry: Any):
+        from pint.util import UnitsContainer
+        self.registry = registry
+        # Pint runs the registry's preprocessors on the text first; only its default one (for "%") is known here
+        self.enabled = len(registry.preprocessors) <= 1 and registry.non_int_type is float
+        self.symbols = {name: definition.name for name, definition in registry._units.items()}
+        self.other_symbols = UnitCache(registry.get_name, maxsize=4096)  # prefixed and plural names
+        self.dimensionless = UnitsContainer()
+        self.containers = {name: UnitsContainer({name: 1}) for name in set(self.symbols.values())}
+
+    def read(self, text: str) -> Union[Expression, object, None]:
+        """ read
+
+        Parameters
+        ----------
+        text: str
+
+        Returns
+        -------
+        expression: Expression, UNDEFINED, TOO_LARGE, None
+            * Expression: what Pint would make of the text
+            * UNDEFINED: Pint would raise an error (a name is not a unit)
+            * TOO_LARGE: text has a power too large to work out; don't give it to Pint
+            * None: text is outside the grammar
+
+        """
+        if not text:
+            return None
+        tokens = tokenize(text.replace("°", "degree"))
+        if ("**" in text or "^" in text) and _power_too_large(tokens, len(text)):
+            return TOO_LARGE
+        if not self.enabled or text[0] == " " or text[-1] == " ":
+            return None
+
+        reader = _Reader(self, tokens)
+        try:
+            magnitude, units = reader.expression(top=True)
+        except _PowerTooLarge:
+            return TOO_LARGE
+        except (_NotRead, ArithmeticError):  # (Pint raises the same ZeroDivisionError, OverflowError)
+            return None
+
+        if reader.undefined:
+            return UNDEFINED
+        if reader.offset and not reader.simple:
+            return None  # Pint's handling of offset units (degC, degF) in compound units is not repeated here
+
+        return Expression(magnitude, units, number_only=reader.simple and reader.names == 0)
+
+    def lookup(self, word: str) -> Optional[str]:
+        """ Canonical unit name of word, or None if it isn't a unit. """
+        name = self.symbols.get(word)
+        if name is None:
+            name = self.other_symbols.lookup(word)
+        return name
+
+    def container(self, name: str):
+        """ UnitsContainer of one unit (by canonical name). """
+        container = self.containers.get(name)
+        if container is None:
+            container = self.containers[name] = self.dimensionless.add(name, 1)
+        return container
+
+
+class _NotRead(Exception):
+    """ Text is outside the grammar. """
+
+
+class _PowerTooLarge(OverflowError):
+    """ Power is too large to work out (see `MAX_POWER_BITS`). """
+
+
+class _Reader:
+    """ Recursive descent over the tokens. Values are worked out as they are read, with the same operations (and so
+    the same int/float results) as Pint. """
+
+    def __init__(self, grammar: Grammar, tokens: list[Token]):
+        self.grammar = grammar
+        self.tokens = tokens
+        self.i = 0
+        self.undefined = False
+        self.offset = False
+        self.names = 0
+        self.simple = True  # [-] [number] [name]: no operators, powers or brackets
+
+    def peek(self) -> Optional[Token]:
+        return self.tokens[self.i] if self.i < len(self.tokens) else None
+
+    def skip_space(self) -> bool:
+        token = self.peek()
+        if token is None or token.kind != SPACE:
+            return False
+        if token.text.strip(" "):
+            raise _NotRead  # tabs, new lines
+        self.i += 1
+        return True
+
+    def expression(self, top: bool = False) -> tuple[Union[int, float], Any]:
+        sign = self.peek() == _minus and top
+        if sign:
+            self.i += 1
+
+        magnitude, units = self.term()
+        if sign:
+            magnitude = magnitude * -1
+
+        atoms = 1
+        while True:
+            token = self.peek()
+            if token is None or (token.kind == CLOSE and not top):
+                return magnitude, units
+
+            space = self.skip_space()
+            token = self.peek()
+
+            if token is not None and token.kind == OPERATOR and token.text in "*/":
+                self.simple = False
+                self.i += 1
+                self.skip_space()
+                magnitude_, units_ = self.term()
+                if token.text == "*":
+                    magnitude, units = magnitude * magnitude_, units * units_
+                else:
+                    magnitude, units = magnitude / magnitude_, units / units_
+            elif token is not None and (space or self.tokens[self.i - 1].kind == NUMBER) and token.kind in (
+                    NUMBER, WORD, OPEN):
+                # implicit multiplication: "5 g", "5g", "g cm"
+                if not space and not _number_letter(token.text):
+                    raise _NotRead
+                atoms += 1
+                if atoms > 2 or token.kind != WORD or self.names:
+                    self.simple = False
+                magnitude_, units_ = self.term()
+                magnitude, units = magnitude * magnitude_, units * units_
+            else:
+                raise _NotRead
+
+    def term(self) -> tuple[Union[int, float], Any]:
+        magnitude, units = self.atom()
+        start = self.i
+        self.skip_space()
+        token = self.peek()
+        if token is None or token.kind != POWER:
+            self.i = start
+            return magnitude, units
+
+        self.simple = False
+        self.i += 1
+        self.skip_space()
+        power_sign = self.peek()
+        if power_sign in (_minus, _plus):
+            self.i += 1
+        power = self.number()
+        if not isinstance(power, int):
+            raise _NotRead
+        if power_sign == _minus:
+            power = power * -1
+
+        if isinstance(magnitude, int) and power > 0 and abs(magnitude).bit_length() * power > MAX_POWER_BITS:
+            raise _PowerTooLarge
+
+        if power == 0:
+            return magnitude ** power, self.grammar.dimensionless  # (UnitsContainer keeps units with power 0)
+        return magnitude ** power, units ** power
+
+    def atom(self) -> tuple[Union[int, float], Any]:
+        token = self.peek()
+        if token is None:
+            raise _NotRead
+
+        if token.kind == NUMBER:
+            return self.number(), self.grammar.dimensionless
+
+        if token.kind == WORD:
+            return 1, self.name()
+
+        if token.kind == OPEN and token.text == "(":
+            self.simple = False
+            self.i += 1
+            magnitude, units = self.expression()
+            if self.peek() is None or self.peek().text != ")":
+                raise _NotRead
+            self.i += 1
+            next_ = self.peek()
+            if next_ is not None and next_.kind in (NUMBER, WORD, OPEN):
+                raise _NotRead
+            return magnitude, units
+
+        raise _NotRead
+
+    def number(self) -> Union[int, float]:
+        token = self.peek()
+        if token is None or token.kind != NUMBER:
+            raise _NotRead
+        text = token.text
+        if len(text) > 1 and text[0] == "0" and text[1] != ".":
+            raise _NotRead  # '05' is not a python number
+        self.i += 1
+
+        next_ = self.peek()
+        if next_ is not None and next_.kind == OPEN:
+            raise _NotRead
+        return float(text) if "." in text else int(text)
+
+    def name(self) -> Any:
+        start = self.i
+        while self.i < len(self.tokens) and self.tokens[self.i].kind in (WORD, NUMBER):
+            self.i += 1
+        word = "".join(token.text for token in self.tokens[start:self.i])
+        if not word.isidentifier() or word.lower() in _special_words:
+            raise _NotRead
+
+        next_ = self.peek()
+        if next_ is not None and next_.kind == OPEN:
+            raise _NotRead
+
+        self.names += 1
+        name = self.grammar.lookup(word)
+        if name is None:
+            self.undefined = True
+            return self.grammar.dimensionless
+        if not self.grammar.registry._units[name].is_multiplicative:
+            self.offset = True
+        return self.grammar.container(name)
+
+
+def _number_letter(text: str) -> bool:
+    """ Pint reads a number directly followed by a letter as multiplication ("5g" --> "5*g"), except for 'e'/'E'
+    followed by a number (scientific notation). """
+    if text[0] not in ascii_letters:
+        return False
+    if text[0] in "eE":
+        return len(text) > 1 and text[1] in ascii_letters
+    return True
+
+
+_minus = Token(OPERATOR, "-")
+_plus = Token(OPERATOR, "+")
+
+
+def power_too_large(text: str) -> bool:
+    """ True if text has a power that may be too large to work out (Pint would hang on it). """
+    return ("**" in text or "^" in text) and _power_too_large(tokenize(text), len(text))
+
+
+def _power_too_large(tokens: list[Token], length: int) -> bool:
+    """ Checks what Pint would work out before it does: the exponents multiplied together (for powers of powers,
+    "(10**10)**10") times the digits in the text (the largest int base) must stay within `MAX_POWER_BITS`. Exponents
+    that are themselves powers ("10**10**10") or expressions in brackets are not worked out, and so are too large. """
+    exponents = 1
+    for i, token in enumerate(tokens):
+        if token.kind != POWER:
+            continue
+
+        i = _skip(tokens, i + 1, sign=True)
+        bracket = i < len(tokens) and tokens[i].kind == OPEN
+        if bracket:
+            i = _skip(tokens, i + 1, sign=True)
+        if i == len(tokens) or tokens[i].kind != NUMBER:
+            if bracket:
+                return True
+            continue  # not a number: Pint raises an error
+
+        exponents *= max(float(tokens[i].text), 1)
+        i = _skip(tokens, i + 1)
+        if i < len(tokens) and (tokens[i].kind == POWER or (bracket and tokens[i].kind != CLOSE)):
+            return True
+
+    return exponents > 1 and exponents * length * 4 > MAX_POWER_BITS  # (a digit is less than 4 bits)
+
+
+def _skip(tokens: list[Token], i: int, sign: bool = False) -> int:
+    """ Index of the next token after spaces (and a sign). """
+    while i < len(tokens) and (tokens[i].kind == SPACE or (sign and tokens[i].text in "+-")):
+        i += 1
+    return i
+
+
+def get_grammar(registry: Any) -> Grammar:
+    """ Get the grammar for a registry (built on first use). """
+    return per_registry(registry, Grammar)
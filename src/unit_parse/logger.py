@@ -11,6 +11,7 @@ debug: will show fine grain parsing steps.
 """
 
 import logging
+import sys
 from functools import wraps
 
 
@@ -68,13 +69,21 @@ logger.setLevel(logging.WARNING)
 
 
 # Logger decorators
+# The 'input --> output' messages are only formatted if the level is enabled. For no overhead at all, the decorators
+# can be removed with `set_log_decorators(False)`.
+_wrappers: dict = {}  # wrapper: original function
+
+
 def log_debug(func):
     """ Add 'input --> output' logging to a function. At DEBUG level. """
     @wraps(func)
     def _log_debug(*args, **kwargs):
         result = func(*args, **kwargs)
-        logger.debug(f"{func.__name__}: {args} --> {result}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"{func.__name__}: {args} --> {result}")
         return result
+
+    _wrappers[_log_debug] = func
     return _log_debug
 
 
@@ -83,6 +92,34 @@ def log_info(func):
     @wraps(func)
     def _log_info(*args, **kwargs):
         result = func(*args, **kwargs)
-        logger.info(f"{func.__name__}: {args} --> {result}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(f"{func.__name__}: {args} --> {result}")
         return result
+
+    _wrappers[_log_info] = func
     return _log_info
+
+
+def set_log_decorators(enabled: bool):
+    """ set log decorators
+
+    Swap every function decorated with `log_debug`/`log_info` in the loaded unit_parse modules for the plain
+    function (enabled=False), or back to the logging version (enabled=True).
+    With the decorators removed, parsing pays nothing for the step by step logging (even at DEBUG level).
+
+    Parameters
+    ----------
+    enabled: bool
+
+    """
+    swap = {v: k for k, v in _wrappers.items()} if enabled else _wrappers
+    for name, module in list(sys.modules.items()):
+        if module is None or not (name == "unit_parse" or name.startswith("unit_parse.")):
+            continue
+        for attr, value in list(vars(module).items()):
+            try:
+                new_value = swap.get(value)
+            except TypeError:  # unhashable
+                continue
+            if new_value is not None:
+                setattr(module, attr, new_value)
@@ -1,15 +1,18 @@
-from typing import Union
+from typing import Union, Iterable, Any
+import logging
 
-from unit_parse.config import Quantity, config
-from unit_parse.pre_processing_substitution import remove_strings, substitution
+from unit_parse.config import ConfigSnapshot, Quantity, config, get_registry, use_registry
+from unit_parse.pre_processing_substitution import remove_strings, substitution, get_pipeline
 from unit_parse.pre_processing_multiple import multiple_quantities_main
 from unit_parse.core import text_list_to_quantity
 from unit_parse.reduce_quantities import reduce_quantities
+from unit_parse.segmentation import get_segmenter
 from unit_parse.utils import remove_empty_cells
 from unit_parse.logger import logger
+from unit_parse.trace import ParseTrace, get_trace
 
 
-def parser(text_in: str) -> Union[Quantity, list[Quantity], list[list[Quantity]]]:
+def parser(text_in: str, registry=None) -> Union[Quantity, list[Quantity], list[list[Quantity]]]:
     """ parser
 
     Main function to call to do parsing.
@@ -18,24 +21,134 @@ def parser(text_in: str) -> Union[Quantity, list[Quantity], list[list[Quantity]]
     ----------
     text_in: str
         text you want to be parsed
+    registry: UnitRegistry
+        Pint unit registry to create the quantities with, for this call only (see `use_registry`). Default is the
+        registry unit_parse is bound to (see `set_registry`).
 
     Returns
     -------
     output: Quantity, list[Quantity], list[list[Quantity]]
 
     """
-    logger.info(f"INPUT: {text_in}")
+    log_info = logger.isEnabledFor(logging.INFO)
+    if log_info:
+        logger.info(f"INPUT: {text_in}")
+
+    with use_registry(registry):
+        out = _parse(text_in, config.snapshot())
+
+    if log_info:
+        logger.info(f"OUTPUT: {out}'")
+    return out
+
+
+def parser_batch(texts: Iterable[str], errors: str = "warn", registry=None) -> list[Any]:
+    """ parser batch
+
+    Parse many strings in one call. Setup that `parser` repeats on every call (config snapshot, logging checks) is
+    done once for the whole batch. A failure on one text does not stop the batch.
+
+    Parameters
+    ----------
+    texts: Iterable[str]
+        texts you want to be parsed (any iterable, including generators)
+    errors: str
+        What to do when a text fails to parse:
+        * "warn": log a warning and return None for that text (default)
+        * "raise": re-raise the error and stop the batch
+        * "return": place the exception in the output in place of the result
+    registry: UnitRegistry
+        Pint unit registry to create the quantities with, for this call only (see `use_registry`). Default is the
+        registry unit_parse is bound to (see `set_registry`).
+
+    Returns
+    -------
+    output: list[Any]
+        One result per text, in the same order as the input.
+
+    """
+    if errors not in ("warn", "raise", "return"):
+        raise ValueError(f"'errors' must be 'warn', 'raise' or 'return'. Given: {errors}")
+
+    with use_registry(registry):
+        return _parse_batch(texts, errors)
+
+
+def _parse_batch(texts: Iterable[str], errors: str) -> list[Any]:
+    settings = config.snapshot()
+    log_info = logger.isEnabledFor(logging.INFO)
+
+    out = []
+    for i, text_in in enumerate(texts):
+        if log_info:
+            logger.info(f"INPUT: {text_in}")
+
+        try:
+            result = _parse(text_in, settings)
+        except Exception as e:
+            if errors == "raise":
+                raise
+            if errors == "return":
+                result = e
+            else:
+                logger.warning(f"Parsing failed for item {i}: '{text_in}' ({type(e).__name__}: {e})")
+                result = None
+
+        if log_info:
+            logger.info(f"OUTPUT: {result}'")
+        out.append(result)
+
+    return out
+
+
+def warmup():
+    """ warmup
+
+    Loads everything parsing needs (unit registry, english dictionary, unit segmentation tries and compiled
+    substitutions) now, instead of on the first parse. Useful for services that want to pay the cost at start-up.
+
+    """
+    get_segmenter(get_registry())
+    settings = config.snapshot()  # also loads the english dictionary
+    get_pipeline(settings.pre_proc_sub)
+    get_pipeline(settings.last_minute_sub)
+
+
+def _parse(text_in: str, settings: ConfigSnapshot) -> Union[Quantity, list[Quantity], list[list[Quantity]]]:
+    """ Parsing pipeline shared by `parser` and `parser_batch`. """
     # type check
     if not isinstance(text_in, str):
         raise TypeError(f"'text_in' must be a string. Given {text_in} (type: {type(text_in)}")
 
+    trace = get_trace()
+    if trace is not None:
+        return trace.run("parser", _parse_traced, text_in, settings, trace)
+
+    result_cache = config.result_cache
+    if result_cache.maxsize:
+        return result_cache.lookup(text_in, settings, lambda text: _parse_persistent(text, settings))
+
+    return _parse_persistent(text_in, settings)
+
+
+def _parse_persistent(text_in: str, settings: ConfigSnapshot) -> Union[Quantity, list[Quantity], list[list[Quantity]]]:
+    """ `_parse_text` behind the persistent cache (if there is one). """
+    persistent_cache = config.persistent_cache
+    if persistent_cache is not None:
+        return persistent_cache.lookup(text_in, settings, lambda text: _parse_text(text, settings))
+
+    return _parse_text(text_in, settings)
+
+
+def _parse_text(text_in: str, settings: ConfigSnapshot) -> Union[Quantity, list[Quantity], list[list[Quantity]]]:
+    """ The parsing steps (no tracing or result cache). """
     # pre-processing
-    text_in = remove_strings(text_in, config.remove_text)
-    text_in = substitution(text_in)
-    text_list = multiple_quantities_main(text_in)
+    text_in = remove_strings(text_in, settings.remove_text)
+    text_in = substitution(text_in, settings=settings)
+    text_list = multiple_quantities_main(text_in, settings=settings)
 
     # text to unit
-    out = text_list_to_quantity(text_list)
+    out = text_list_to_quantity(text_list, settings=settings)
 
     # post-processing
     out = remove_empty_cells(out)
@@ -48,5 +161,15 @@ def parser(text_in: str) -> Union[Quantity, list[Quantity], list[list[Quantity]]
     #     elif isinstance(out[0], list) and len(out[0]) == 1:
     #         out = out[0][0]
 
-    logger.info(f"OUTPUT: {out}'")
     return out
+
+
+def _parse_traced(text_in: str, settings: ConfigSnapshot, trace: ParseTrace) \
+        -> Union[Quantity, list[Quantity], list[list[Quantity]]]:
+    """ `_parse` with every stage recorded in trace. """
+    text_in = trace.run("remove_strings", remove_strings, text_in, settings.remove_text)
+    text_in = trace.run("substitution", substitution, text_in, settings=settings)
+    text_list = trace.run("multiple_quantities_main", multiple_quantities_main, text_in, settings=settings)
+    out = trace.run("text_list_to_quantity", text_list_to_quantity, text_list, settings=settings)
+    out = trace.run("remove_empty_cells", remove_empty_cells, out)
+    return trace.run("reduce_quantities", reduce_quantities, out)
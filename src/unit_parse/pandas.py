@@ -0,0 +1,154 @@
+"""
+Pandas
+
+Adds a `unit_parse` accessor to pandas Series (registered when this module is imported).
+
+```python
+import pandas as pd
+import unit_parse.pandas  # registers the accessor
+
+series = pd.Series(["5 g", "40 °F", "5 g", None])
+series.unit_parse.parse()  # parser results
+series.unit_parse.to_frame(prefer_unit="kg")  # magnitude and unit columns
+series.unit_parse.to_pint()  # pint-pandas array in one unit (needs pint-pandas)
+```
+
+Only the distinct values of the Series are parsed; the results are then fanned back out to every row.
+
+Needs pandas (`pip install pandas`).
+
+"""
+from typing import Any, Union
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError as e:  # pragma: no cover
+    raise ImportError("'unit_parse.pandas' needs pandas (pip install pandas).") from e
+
+from unit_parse.column import parse_column
+from unit_parse.config import Unit
+from unit_parse.main import parser_batch
+from unit_parse.utils import first_quantity
+
+
+@pd.api.extensions.register_series_accessor("unit_parse")
+class UnitParseAccessor:
+    """ Series.unit_parse
+
+    Parameters
+    ----------
+    series: pd.Series
+        Series of text (values that aren't strings, like None and nan, give missing results)
+
+    """
+
+    def __init__(self, series: pd.Series):
+        self._series = series
+
+    def parse(self, errors: str = "warn") -> pd.Series:
+        """ parse
+
+        `parser` on every value of the Series.
+
+        Parameters
+        ----------
+        errors: str
+            What to do when a text fails to parse (same as `parser_batch`):
+            * "warn": log a warning and return None for that text (default)
+            * "raise": raise the error
+            * "return": place the exception in the output in place of the result
+
+        Returns
+        -------
+        results: pd.Series
+            Parser results (object dtype), same index as the Series.
+
+        """
+        codes, results = self._parse_unique(errors)
+        return pd.Series(_take(results, codes), index=self._series.index, name=self._series.name, dtype=object)
+
+    def to_frame(self, prefer_unit: Union[str, Unit, None] = None, errors: str = "warn") -> pd.DataFrame:
+        """ to frame
+
+        Parameters
+        ----------
+        prefer_unit: str, Unit, None
+            Values that can be converted to this unit are; others keep their own unit.
+        errors: str
+            "warn", "raise" or "return" (see `parse`). Failed values are missing (nan magnitude and unit).
+
+        Returns
+        -------
+        frame: pd.DataFrame
+            * magnitude: float64
+            * unit: categorical of unit strings
+            Results with conditions give their first quantity.
+
+        """
+        if isinstance(prefer_unit, str):
+            prefer_unit = Unit(prefer_unit)
+
+        codes, results = self._parse_unique(errors)
+        magnitudes = np.full(len(results) + 1, np.nan)  # last element is for missing values (code -1)
+        units = [None] * (len(results) + 1)
+        for i, result in enumerate(results):
+            quantity = first_quantity(result)
+            if quantity is None:
+                continue
+            if prefer_unit is not None and quantity.dimensionality == prefer_unit.dimensionality:
+                quantity = quantity.to(prefer_unit)
+            magnitudes[i] = quantity.magnitude
+            units[i] = str(quantity.units)
+
+        return pd.DataFrame(
+            {
+                "magnitude": magnitudes[codes],
+                "unit": pd.Categorical.from_codes(*_unit_codes(units, codes)),
+            },
+            index=self._series.index
+        )
+
+    def to_pint(self, unit: Union[str, Unit, None] = None, errors: str = "warn") -> pd.Series:
+        """ to pint
+
+        Parameters
+        ----------
+        unit: str, Unit, None
+            Unit of the array. Default is picked like `parse_column` does.
+        errors: str
+            "warn" or "raise". Failed values (and ones that can't be converted to the unit) are nan.
+
+        Returns
+        -------
+        series: pd.Series
+            pint-pandas Series (dtype 'pint[unit]'), same index as the Series. Needs pint-pandas.
+
+        """
+        from pint_pandas import PintArray
+
+        result = parse_column(self._series, target_unit=unit, errors=errors)
+        return pd.Series(PintArray.from_1darray_quantity(result.quantity), index=self._series.index,
+                         name=self._series.name)
+
+    def _parse_unique(self, errors: str) -> tuple[Any, list[Any]]:
+        """ Returns (codes, results): results of the distinct strings, and which one each row has (-1: not a string). """
+        series = self._series.where(self._series.map(lambda value: isinstance(value, str)))
+        codes, uniques = pd.factorize(series)
+        return codes, parser_batch(list(uniques), errors=errors)
+
+
+def _take(results: list[Any], codes: Any) -> Any:
+    """ results[code] for each code; None for -1. """
+    array = np.empty(len(results) + 1, dtype=object)
+    for i, result in enumerate(results):  # (one at a time; numpy would turn nested lists into more dimensions)
+        array[i] = result
+    return array[codes]
+
+
+def _unit_codes(units: list[Union[str, None]], codes: Any) -> tuple[Any, list[str]]:
+    """ Codes and categories of the unit column. """
+    categories = sorted({unit for unit in units if unit is not None})
+    index = {unit: i for i, unit in enumerate(categories)}
+    unit_codes = np.array([-1 if unit is None else index[unit] for unit in units], dtype=np.intp)
+    return unit_codes[codes], categories
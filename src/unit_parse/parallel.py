@@ -0,0 +1,156 @@
+"""
+Parallel
+
+Parse across several processes.
+
+```python
+from unit_parse.parallel import parse_many
+
+result = parse_many(texts, workers=8)
+```
+
+Each worker process loads the unit registry, english dictionary and substitutions once (see `warmup`) and is then
+sent chunks of the input. Results come back from the workers in a picklable form (see `serialize`) and are rebuilt in
+the caller's unit registry, in input order.
+
+Workers use the caller's `config` parsing settings (remove_text, pre_proc_sub, pre_proc_split, last_minute_sub), but
+build their own default unit registry; units only defined in a custom registry won't be found by the workers.
+
+"""
+from typing import Any, Iterable, Iterator, Optional
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+import os
+import pickle
+
+from unit_parse.config import config
+from unit_parse.logger import logger
+from unit_parse.main import parser_batch, warmup
+from unit_parse.serialize import dump, load
+
+
+_settings = ("remove_text", "pre_proc_sub", "pre_proc_split", "last_minute_sub")
+
+
+def parse_many(texts: Iterable[str], workers: Optional[int] = None, chunksize: int = 256, errors: str = "warn",
+               registry=None) -> list[Any]:
+    """ parse many
+
+    Parse many strings with a pool of worker processes.
+
+    Parameters
+    ----------
+    texts: Iterable[str]
+        texts you want to be parsed (any iterable; it is read one chunk at a time)
+    workers: int
+        Number of worker processes. Default is the number of CPUs.
+    chunksize: int
+        Number of texts sent to a worker at a time. Larger chunks cost less to send; smaller ones share the work more
+        evenly.
+    errors: str
+        What to do when a text fails to parse (same as `parser_batch`):
+        * "warn": log a warning and return None for that text (default)
+        * "raise": raise the error (once the chunk it is in comes back)
+        * "return": place the exception in the output in place of the result
+    registry: UnitRegistry
+        Pint unit registry to rebuild the quantities in. Default is the registry unit_parse is bound to.
+
+    Returns
+    -------
+    output: list[Any]
+        One result per text, in the same order as the input.
+
+    """
+    if errors not in ("warn", "raise", "return"):
+        raise ValueError(f"'errors' must be 'warn', 'raise' or 'return'. Given: {errors}")
+    if chunksize < 1:
+        raise ValueError(f"'chunksize' must be 1 or more. Given: {chunksize}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    out = []
+    with _process_executor(workers) as executor:
+        i = 0
+        for chunk, results in _run_chunks(executor, texts, chunksize, 2 * workers):
+            for text_in, result in zip(chunk, results):
+                if isinstance(result, Exception):
+                    if errors == "raise":
+                        raise result
+                    if errors == "warn":
+                        logger.warning(f"Parsing failed for item {i}: '{text_in}' ({type(result).__name__}: "
+                                       f"{result})")
+                        result = None
+                else:
+                    result = load(result, registry)
+
+                out.append(result)
+                i += 1
+
+    return out
+
+
+def _chunks(texts: Iterable[str], chunksize: int) -> Iterator[list[str]]:
+    iterator = iter(texts)
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _run_chunks(executor: ProcessPoolExecutor, texts: Iterable[str], chunksize: int, max_pending: int) \
+        -> Iterator[tuple[list[str], list[Any]]]:
+    """ Yields (chunk, results) in input order, with at most max_pending chunks sent out at once. """
+    pending: deque[tuple[list[str], Future]] = deque()
+    for chunk in _chunks(texts, chunksize):
+        pending.append((chunk, executor.submit(_parse_chunk, chunk)))
+        if len(pending) >= max_pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+
+    while pending:
+        chunk, future = pending.popleft()
+        yield chunk, future.result()
+
+
+def _process_executor(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """ Process pool whose workers use the current `config` parsing settings and are warmed up. """
+    settings = {name: getattr(config, name) for name in _settings}
+    if config.persistent_cache is not None:
+        config.persistent_cache.flush()  # (uncommitted writes would keep the workers from writing to the file)
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(settings,))
+
+
+def _init_worker(settings: dict[str, Any]):
+    """ Runs once in each worker process. """
+    for name, value in settings.items():
+        setattr(config, name, value)
+    warmup()
+
+
+def _parse_chunk(chunk: list[str]) -> list[Any]:
+    """ Runs in a worker process. """
+    out = []
+    for result in parser_batch(chunk, errors="return"):
+        if isinstance(result, Exception):
+            out.append(_picklable_error(result))
+        else:
+            out.append(dump(result))
+
+    _flush_persistent_cache()
+    return out
+
+
+def _flush_persistent_cache():
+    """ Commit the results a chunk added to the persistent cache (workers are stopped without being told). """
+    if config.persistent_cache is not None:
+        config.persistent_cache.flush()
+
+
+def _picklable_error(error: Exception) -> Exception:
+    try:
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
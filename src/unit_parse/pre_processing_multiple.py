@@ -1,24 +1,29 @@
-from typing import List
+from typing import List, Optional
 import re
 
-from unit_parse.config import config
+from unit_parse.config import ConfigSnapshot, config
 from unit_parse.logger import log_debug, log_info
 from unit_parse.utils import contains_number, remove_empty_str
 
 
 @log_info
-def multiple_quantities_main(text_in: str) -> list[list[str]]:
+def multiple_quantities_main(text_in: str, settings: Optional[ConfigSnapshot] = None) -> list[list[str]]:
     """
 
     Parameters
     ----------
     text_in
+    settings: ConfigSnapshot
+        Settings to use. Default is `config.snapshot()`.
 
     Returns
     -------
 
     """
-    text_list = multiple_quantities(text_in, sep=config.pre_proc_split)
+    if settings is None:
+        settings = config.snapshot()
+
+    text_list = multiple_quantities(text_in, sep=settings.pre_proc_split)
     out = []
     for text in text_list:
         out.append(condition_finder(text))
@@ -1,8 +1,157 @@
-from typing import List, Optional
+from typing import List, Optional, Callable, Container, Sequence
+from string import ascii_letters
 import re
+import threading
 
-from unit_parse.config import config
+from unit_parse.config import ConfigSnapshot, config
 from unit_parse.logger import log_debug, log_info
+from unit_parse.tokenizer import NUMBER, OPERATOR, POWER, SPACE, WORD, Token, tokenize, untokenize
+from unit_parse.trace import get_trace
+
+
+_regex_special_characters = set(".^$*+?{}[]\\|()")
+
+
+class SubstitutionPipeline:
+    """ Substitution Pipeline
+
+    Compiled form of a list of [pattern, substitution value] rules (see `Config.pre_proc_sub`).
+
+    * Regex patterns are compiled once.
+    * Runs of consecutive literal rules (e.g. ["KG", "kg"], ["cu ft", "ft**3"]) are fused into a single-pass
+      multi-literal replacer, as long as doing so gives the same result as applying the rules one after another.
+    * The pipeline keeps a reference to the rule list and recompiles itself if the list is changed. Tuples of
+      tuples (like `ConfigSnapshot.pre_proc_sub`) can't change, so they are not checked.
+    * Compiled steps are swapped in as one object, so a pipeline can be called from many threads at once.
+
+    Parameters
+    ----------
+    patterns: list[list[str]], tuple[tuple[str, str]]
+        Pattern and replacement values
+
+    """
+
+    def __init__(self, patterns: Sequence[Sequence[str]]):
+        self.patterns = patterns
+        self._frozen = isinstance(patterns, tuple) and all(isinstance(pattern, tuple) for pattern in patterns)
+        self._compiled: tuple[list[list[str]], list[Callable[[str], str]]] = self.compile()
+
+    def __repr__(self):
+        return f"SubstitutionPipeline({len(self.patterns)} rules, {self.number_of_steps} steps)"
+
+    def __call__(self, text_in: str) -> str:
+        source, steps = self._compiled
+        if not self._frozen and self.patterns != source:
+            source, steps = self.compile()
+
+        for step in steps:
+            text_in = step(text_in)
+
+        return text_in.strip()
+
+    @property
+    def number_of_steps(self) -> int:
+        return len(self._compiled[1])
+
+    def compile(self) -> tuple[list[list[str]], list[Callable[[str], str]]]:
+        """ (Re)build the substitution steps from the rule list. """
+        source = [list(pattern) for pattern in self.patterns]
+
+        steps = []
+        group = []
+        for pattern, sub in source:
+            if _is_literal(pattern, sub) and all(_can_fuse(rule, [pattern, sub]) for rule in group):
+                group.append([pattern, sub])
+                continue
+
+            if group:
+                steps.append(_literal_step(group))
+                group = []
+            if _is_literal(pattern, sub):
+                group.append([pattern, sub])
+            else:
+                steps.append(_regex_step(pattern, sub))
+
+        if group:
+            steps.append(_literal_step(group))
+
+        self._compiled = (source, steps)
+        return self._compiled
+
+
+def _is_literal(pattern: str, sub: str) -> bool:
+    """ True if the rule can be done with plain text replacement. """
+    return pattern != "" and "\\" not in sub and not any(char in _regex_special_characters for char in pattern)
+
+
+def _overlap(text1: str, text2: str) -> bool:
+    """ True if text2 can be placed over text1, sharing at least one character, with the shared characters equal. """
+    for offset in range(-len(text2) + 1, len(text1)):
+        start = max(offset, 0)
+        end = min(offset + len(text2), len(text1))
+        if text1[start:end] == text2[start - offset:end - offset]:
+            return True
+    return False
+
+
+def _can_fuse(earlier: List[str], later: List[str]) -> bool:
+    """
+    Two literal rules can be done in a single pass if their patterns can't compete for the same text, and the
+    earlier rule's replacement can't create a new match for the later rule.
+    """
+    if earlier[1] == "":  # deleting text can join its neighbours into a new match
+        return False
+    return not _overlap(earlier[0], later[0]) and not _overlap(earlier[1], later[0])
+
+
+def _regex_step(pattern: str, sub: str) -> Callable[[str], str]:
+    compiled = re.compile(pattern)
+
+    def _step(text_in: str) -> str:
+        return compiled.sub(sub, text_in)
+
+    return _step
+
+
+def _literal_step(group: List[List[str]]) -> Callable[[str], str]:
+    if len(group) == 1:
+        pattern, sub = group[0]
+
+        def _step(text_in: str) -> str:
+            return text_in.replace(pattern, sub)
+
+        return _step
+
+    table = dict(group)
+    compiled = re.compile("|".join(re.escape(pattern) for pattern in sorted(table, key=len, reverse=True)))
+
+    def _replace(match: re.Match) -> str:
+        return table[match.group(0)]
+
+    def _step(text_in: str) -> str:
+        return compiled.sub(_replace, text_in)
+
+    return _step
+
+
+_pipelines: dict[int, SubstitutionPipeline] = {}
+_max_pipelines = 64
+_pipelines_lock = threading.Lock()
+
+
+def get_pipeline(patterns: Sequence[Sequence[str]]) -> SubstitutionPipeline:
+    """ Get the compiled pipeline for a rule list (compiled on first use, then reused). """
+    pipeline = _pipelines.get(id(patterns))
+    if pipeline is None or pipeline.patterns is not patterns:
+        with _pipelines_lock:
+            pipeline = _pipelines.get(id(patterns))
+            if pipeline is None or pipeline.patterns is not patterns:
+                if len(_pipelines) >= _max_pipelines:
+                    _pipelines.pop(next(iter(_pipelines)))
+                pipeline = SubstitutionPipeline(patterns)
+                _pipelines[id(patterns)] = pipeline
+
+    return pipeline
 
 
 @log_info
@@ -24,7 +173,7 @@ def remove_strings(text_in: str, remove_string: List[str]) -> str:
 
     """
     # guard statement
-    if remove_string is None or remove_string == []:
+    if not remove_string:
         return text_in
 
     for text in remove_string:
@@ -34,7 +183,7 @@ def remove_strings(text_in: str, remove_string: List[str]) -> str:
 
 
 @log_info
-def substitution(text_in: str) -> str:
+def substitution(text_in: str, settings: Optional[ConfigSnapshot] = None) -> str:
     """ substitution
 
     Preforms the standard series of substitutions.
@@ -47,27 +196,42 @@ def substitution(text_in: str) -> str:
     Parameters
     ----------
     text_in: str
+    settings: ConfigSnapshot
+        Settings to use. Default is `config.snapshot()`.
 
     Returns
     -------
     test: str
 
     """
-    text_in = sub_general(text_in, patterns=config.pre_proc_sub)
+    if settings is None:
+        settings = config.snapshot()
+
+    trace = get_trace()
+    if trace is not None:
+        text_in = trace.run("substitution.sub_general", sub_general, text_in, patterns=settings.pre_proc_sub)
+        text_in = trace.run("substitution.capitalization_check", capitalization_check, text_in)
+        text_in = trace.run("substitution.remove_words", remove_words, text_in, words=settings.english_dict)
+        text_in = trace.run("substitution.sub_power", sub_power, text_in)
+        text_in = trace.run("substitution.sub_sci_notation", sub_sci_notation, text_in)
+        text_in = trace.run("substitution.reduce_ranges", reduce_ranges, text_in)
+        return text_in.strip().strip(".")
+
+    text_in = sub_general(text_in, patterns=settings.pre_proc_sub)
     text_in = capitalization_check(text_in)
-    text_in = remove_words(text_in, words=config.english_dict)
-    text_in = sub_power(text_in)
-    text_in = sub_sci_notation(text_in)
+    text_in = remove_words(text_in, words=settings.english_dict)
+    text_in = sub_power_sci_notation(text_in)
     text_in = reduce_ranges(text_in)
 
     return text_in.strip().strip(".")
 
 
 @log_debug
-def sub_general(text_in: str, patterns: Optional[List[List[str]]]) -> str:
+def sub_general(text_in: str, patterns: Optional[Sequence[Sequence[str]]]) -> str:
     """ substitutions general
 
     Performs general substitutions from regex expression.
+    The patterns are compiled once into a `SubstitutionPipeline` and reused on later calls.
 
     Parameters
     ----------
@@ -88,15 +252,12 @@ def sub_general(text_in: str, patterns: Optional[List[List[str]]]) -> str:
 
     """
     # guard statement
-    if patterns is None or patterns == []:
+    if not patterns:
         return text_in
 
-    if isinstance(patterns, list):
-        if isinstance(patterns[0], list):
-            for pattern in patterns:
-                text_in = re.sub(pattern[0], pattern[1], text_in)
-
-            return text_in.strip()
+    if isinstance(patterns, (list, tuple)):
+        if isinstance(patterns[0], (list, tuple)):
+            return get_pipeline(patterns)(text_in)
 
     raise TypeError("Patterns must be a List[List[pattern, substitution]].")
 
@@ -117,17 +278,46 @@ def sub_power(text_in: str) -> str:
     text: str
 
     """
-    found_unit_power = re.findall("[a-zA-Z]{1,10}[-+]?[0-4]", text_in)
-    for exp in found_unit_power:
-        if "-" in exp:
-            exp_new = exp.replace("-", "**-", 1)
-        elif "+" in exp:
-            exp_new = exp.replace("+", "**", 1)
-        else:
-            exp_new = exp[:-1] + "**" + exp[-1]
-        text_in = text_in.replace(exp, exp_new)
+    if not _power_candidate.search(text_in):
+        return text_in.strip()
 
-    return text_in.strip()
+    return untokenize(_sub_power_tokens(tokenize(text_in))).strip()
+
+
+@log_debug
+def sub_power_sci_notation(text_in: str) -> str:
+    """ `sub_power` then `sub_sci_notation`, with the text tokenized once. """
+    power = _power_candidate.search(text_in) is not None
+    if not power and not _sci_notation_candidate.search(text_in):
+        return text_in.strip()
+
+    tokens = tokenize(text_in)
+    if power:
+        tokens = _strip(_sub_power_tokens(tokens))
+    return untokenize(_sub_sci_notation_tokens(tokens)).strip()  # (no change if it isn't a candidate)
+
+
+def _sub_power_tokens(tokens: list[Token]) -> list[Token]:
+    """ A word followed by a number starting with 0-4 (optionally signed) gets '**' between them. """
+    out = []
+    i = 0
+    n = len(tokens)
+    while i < n:
+        token = tokens[i]
+        out.append(token)
+        i += 1
+        if token.kind != WORD or token.text[-1] not in ascii_letters or i == n:
+            continue
+
+        sign = tokens[i] if tokens[i] in (_plus, _minus) else None
+        number = i + 1 if sign is not None else i
+        if number < n and tokens[number].kind == NUMBER and tokens[number].text[0] in "01234":
+            out.append(_power)
+            if sign == _minus:
+                out.append(_minus)
+            i = number
+
+    return out
 
 
 @log_debug
@@ -148,54 +338,123 @@ def sub_sci_notation(text_in: str) -> str:
     text: str
 
     """
-    found_sci_notation = re.findall("10[-+][0-9]{1,5}", text_in)  # '10-5' -> '10**-5'
-    for exp in found_sci_notation:
-        if "-" in exp:
-            exp_new = exp.replace("-", "**-", 1)
-        else:
-            exp_new = exp.replace("+", "**", 1)
-        text_in = text_in.replace(exp, exp_new)
-
-    found_sci_notation = re.findall("[0-9]e[-+]?[0-9]{1,5}", text_in)
-    for exp in found_sci_notation:
-        exp_new = exp.replace("e+", "*10**", 1).replace("e", "*10**", 1)
-        text_in = text_in.replace(exp, exp_new)
-
-    found_sci_notation = re.findall("[0-9]E[-+]?[0-9]{1,5}", text_in)
-    for exp in found_sci_notation:
-        exp_new = exp.replace("E+", "*10**", 1).replace("E", "*10**", 1)
-        text_in = text_in.replace(exp, exp_new)
-
-    found_sci_notation = re.findall("[0-9][*]10[0-9]{1,5}", text_in)
-    for exp in found_sci_notation:
-        exp_new = exp.replace("10", "10**", 1)
-        text_in = text_in.replace(exp, exp_new)
-
-    found_sci_notation = re.findall("[0-9][ ]10[0-9]{1,5}", text_in)
-    for exp in found_sci_notation:
-        exp_new = exp.replace(" 10", "*10**", 1)
-        text_in = text_in.replace(exp, exp_new)
-
-    found_sci_notation = re.findall("[0-9][ ]{1,2}10[*]{2}[-+]?[0-9]{1,5}", text_in)
-    for exp in found_sci_notation:
-        exp_new = exp.replace(" 10**", "*10**", 1)
-        text_in = text_in.replace(exp, exp_new)
-
-    found_sci_notation = re.findall("[0-9][ ]{0,2}[e][*]{2}[-+]?[0-9]{1,5}", text_in)
-    for exp in found_sci_notation:
-        exp_new = exp.replace("e**", "*10**", 1)
-        text_in = text_in.replace(exp, exp_new)
-
-    found_sci_notation = re.findall("[0-9][ ]{0,2}[E][*]{2}[-+]?[0-9]{1,5}", text_in)
-    for exp in found_sci_notation:
-        exp_new = exp.replace("E**", "*10**", 1)
-        text_in = text_in.replace(exp, exp_new)
-
-    # remove leading zero in powers ( 5*10**-05 --> 5*10**-5)
-    text_in = re.sub('(?<=[*]{2}[-])0+(?=[0-9])', "", text_in)  # neg. power
-    text_in = re.sub('(?<=[*]{2})0+(?=[0-9])', "", text_in)  # pos. power
+    if not _sci_notation_candidate.search(text_in):
+        return text_in.strip()
 
-    return text_in.strip()
+    return untokenize(_sub_sci_notation_tokens(tokenize(text_in))).strip()
+
+
+def _sub_sci_notation_tokens(tokens: list[Token]) -> list[Token]:
+    """
+    * '10-5', '10+5' --> '10**-5', '10**5'
+    * '5e-5', '5E5', '5e**5' --> '5*10**-5', '5*10**5', '5*10**5'
+    * '5*105', '5 105' --> '5*10**5'
+    * '5 10**5' --> '5*10**5'
+    * leading zeros of powers are removed ('10**-05' --> '10**-5')
+
+    Each rule only writes the text in front of a power; the power's number then goes through the rules itself.
+    """
+    tokens = list(tokens)
+    out: list[Token] = []
+    i = 0
+    n = len(tokens)
+    while i < n:
+        token = tokens[i]
+        next_ = tokens[i + 1] if i + 1 < n else None
+
+        if token.kind == NUMBER:
+            if out and (out[-1] == _power or (out[-1] == _minus and len(out) >= 2 and out[-2] == _power)):
+                token = _strip_zeros(token)  # remove leading zeros of powers (10**-05 --> 10**-5)
+
+            # 10-5 --> 10**-5
+            if token.text == "10" and next_ in (_plus, _minus) and i + 2 < n and tokens[i + 2].kind == NUMBER:
+                _space_to_times(out)
+                out += [token, _power] + ([_minus] if next_ == _minus else [])
+                i += 2
+                continue
+
+            # 5*105, 5 105 --> 5*10**5
+            if token.text[:2] == "10" and token.text[2:3].isdigit() and len(out) >= 2 and out[-2].kind == NUMBER \
+                    and out[-1] in (_times, _one_space):
+                out[-1] = _times
+                out += [_ten, _power]
+                tokens[i] = Token(NUMBER, token.text[2:])
+                continue
+
+            # 5 10**5 --> 5*10**5
+            if token.text == "10" and next_ == _power and _is_power_number(tokens, i + 2):
+                _space_to_times(out)
+
+            # 5e-5, 5 e**5 --> 5*10**-5, 5 *10**5
+            e = i + 1
+            if e < n and tokens[e].kind == SPACE and tokens[e].text in (" ", "  "):
+                e += 1
+            if e < n and tokens[e].text in ("e", "E"):
+                if e + 1 < n and tokens[e + 1] == _power and _is_power_number(tokens, e + 2):  # 5 e**5
+                    out += [token] + tokens[i + 1:e] + [_times, _ten]
+                    i = e + 1
+                    continue
+                if e == i + 1 and _is_power_number(tokens, e + 1):  # 5e5
+                    out += [token, _times, _ten, _power]
+                    i = e + 1
+                    if tokens[i] == _plus:
+                        i += 1
+                    elif tokens[i] == _minus:
+                        out.append(_minus)
+                        i += 1
+                    continue
+
+        out.append(token)
+        i += 1
+
+    return out
+
+
+# only text that matches these is tokenized (most text has nothing to change)
+_power_candidate = re.compile("[a-zA-Z][-+]?[0-4]")
+_sci_notation_candidate = re.compile(r"10|[0-9] {0,2}[eE]|\*\*-?0")
+
+_power = Token(POWER, "**")
+_times = Token(OPERATOR, "*")
+_plus = Token(OPERATOR, "+")
+_minus = Token(OPERATOR, "-")
+_ten = Token(NUMBER, "10")
+_one_space = Token(SPACE, " ")
+
+
+def _is_power_number(tokens: list[Token], i: int) -> bool:
+    """ tokens[i:] starts with a number, or with '-' or '+' and a number. """
+    if i < len(tokens) and (tokens[i] == _minus or tokens[i] == _plus):
+        i += 1
+    return i < len(tokens) and tokens[i].kind == NUMBER
+
+
+def _strip(tokens: list[Token]) -> list[Token]:
+    """ Tokens without spaces at the start and end (like `str.strip`). """
+    start, end = 0, len(tokens)
+    while start < end and tokens[start].kind == SPACE:
+        start += 1
+    while end > start and tokens[end - 1].kind == SPACE:
+        end -= 1
+    return tokens[start:end]
+
+
+def _space_to_times(out: list[Token]):
+    """ '5 ' --> '5*' (one space is replaced) at the end of out. """
+    if len(out) >= 2 and out[-2].kind == NUMBER and out[-1].kind == SPACE and out[-1].text in (" ", "  "):
+        spaces = out.pop().text[1:]
+        if spaces:
+            out.append(Token(SPACE, spaces))
+        out.append(_times)
+
+
+def _strip_zeros(token: Token) -> Token:
+    """ '005' --> '5', '0' --> '0' """
+    text = token.text
+    i = 0
+    while i < len(text) - 1 and text[i] == "0" and text[i + 1].isdigit():
+        i += 1
+    return Token(token.kind, text[i:]) if i else token
 
 
 @log_debug
@@ -219,16 +478,19 @@ def reduce_ranges(text_in: str) -> str:
     * Apply sub_sci_notation() first.
 
     """
-    if bool(data_found := re.findall("[-.0-9]{1,6}[- ]{1,3}[-.0-9]{1,6}", text_in)):  # match ### - ### or ###-###
-        reduced_range = re.findall("[-]?[.0-9]{1,6}[^0-9-,/; ]{0,8}", data_found[0])[0]
-        return text_in.replace(data_found[0], reduced_range)
+    if (found := _range.search(text_in)) and (reduced_range := _range_first_number.search(found.group())):
+        return text_in[:found.start()] + reduced_range.group() + text_in[found.end():]  # (only the range found)
     else:
         return text_in.strip()
 
 
+_range = re.compile("[-.0-9]{1,6}[- ]{1,3}[-.0-9]{1,6}")  # match ### - ### or ###-###
+_range_first_number = re.compile("[-]?[.0-9]{1,6}[^0-9-,/; ]{0,8}")
+
+
 @log_debug
-def remove_words(text_in: str, words: set[str]) -> str:
-    """ Removes words found in the english dictionary."""
+def remove_words(text_in: str, words: Container[str]) -> str:
+    """ Removes words found in the english dictionary (any container of lower case words, see `config.english_dict`)."""
     split_text = text_in.split()
 
     result = []
@@ -4,6 +4,7 @@ from unit_parse.config import Quantity, Unit
 from unit_parse.utils import quantity_difference
 from unit_parse.logger import log_debug, log_info
 from unit_parse.classification import QuantClass, quantity_classifier, ClassificationObj
+from unit_parse.unit_table import DIMENSIONLESS, get_unit_table
 
 
 @log_info
@@ -129,7 +130,7 @@ def _get_best_number(class_data: list[ClassificationObj]):
 @log_debug
 def get_middle_quantity(data_in: list[Quantity]) -> Quantity:
     """ Remove data furthest from average till 1 point left."""
-    data_in.sort()
+    data_in = sorted(data_in)
     if len(data_in) % 2 == 0:
         index = int(len(data_in) / 2)
     else:
@@ -192,27 +193,27 @@ def remove_bad_dim(data_class: list[ClassificationObj], prefer_unit: Unit = None
     # remove Nones
     data_class = [data for data in data_class if data.unit is not None]
 
+    # count by dimensionality (dimension ids from the unit table)
+    table = get_unit_table()
+    dim_ids = [table.dimension_id(data.unit) for data in data_class]
     dims = {}
-    for data in data_class:
-        dim = data.unit.dimensionality
-        if dim in dims:  # if in dict, increase count
-            dims[dim] += data.count
-        else:
-            dims[dim] = data.count
+    for dim, data in zip(dim_ids, data_class):
+        dims[dim] = dims.get(dim, 0) + data.count
 
     most_common_dim = max(dims, key=dims.get)
 
     # prefer unit
     skip_flag = True
     if prefer_unit is not None:
-        if most_common_dim != prefer_unit.dimensionality:
-            most_common_dim = prefer_unit.dimensionality
+        prefer_dim = table.dimension_id(prefer_unit)
+        if most_common_dim != prefer_dim:
+            most_common_dim = prefer_dim
             skip_flag = False
 
     # prefer non-dimensionless values first
-    if skip_flag and most_common_dim == Unit("") and len(dims) > 1:
+    if skip_flag and most_common_dim == DIMENSIONLESS and len(dims) > 1:
         dims.pop(most_common_dim)
         most_common_dim = max(dims, key=dims.get)
 
     # remove data that doesn't match most common dim
-    return [data for data in data_class if data.unit.dimensionality == most_common_dim]
+    return [data for dim, data in zip(dim_ids, data_class) if dim == most_common_dim]
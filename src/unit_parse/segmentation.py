@@ -0,0 +1,144 @@
+"""
+Segmentation
+
+Splits text where units have been written together with no separators between them ("mlgcm" --> "ml", "g", "cm").
+
+A prefix trie of all unit names, symbols and aliases (and one of all unit prefixes) is built once from the unit
+registry. Walking the tries from each position of the text gives every unit that starts there, and dynamic
+programming picks the cover of the whole text with the fewest units. The work is linear in the length of the text.
+
+"""
+from typing import Any, Callable, Iterable, Optional
+import re
+
+from unit_parse.cache import per_registry
+
+
+_END = None  # trie key marking the end of a word
+_power_pattern = re.compile(r"[ ]?(?:[*]{2}|\^)[ ]?[-+]?[0-9]+")
+
+
+class Trie:
+    """ Prefix tree of words. """
+
+    def __init__(self, words: Iterable[str] = ()):
+        self.root: dict = {}
+        for word in words:
+            self.add(word)
+
+    def add(self, word: str):
+        node = self.root
+        for char in word:
+            node = node.setdefault(char, {})
+        node[_END] = True
+
+    def match_ends(self, text: str, start: int = 0) -> list[int]:
+        """ Returns the end index of every word in the trie that text[start:] starts with. """
+        ends = []
+        node = self.root
+        if _END in node:
+            ends.append(start)
+
+        for i in range(start, len(text)):
+            node = node.get(text[i])
+            if node is None:
+                break
+            if _END in node:
+                ends.append(i + 1)
+
+        return ends
+
+
+class UnitSegmenter:
+    """ Unit Segmenter
+
+    Parameters
+    ----------
+    registry: UnitRegistry
+        Pint unit registry the unit names, prefixes and suffixes (plurals) are taken from.
+
+    """
+
+    def __init__(self, registry: Any):
+        self.registry = registry
+        self.prefixes = Trie(registry._prefixes)
+        self.units = Trie(unit for unit in registry._units if unit)
+        self.suffixes = [suffix for suffix in registry._suffixes if suffix]
+
+    def candidates(self, text: str, start: int) -> dict[int, int]:
+        """
+        All 'prefix + unit + suffix (+ power)' that text[start:] starts with.
+        Returns {end index: end index of the unit name (without power)}
+        """
+        ends = {}
+        for prefix_end in self.prefixes.match_ends(text, start):
+            for unit_end in self.units.match_ends(text, prefix_end):
+                ends[unit_end] = unit_end
+                for suffix in self.suffixes:
+                    if text.startswith(suffix, unit_end):
+                        ends[unit_end + len(suffix)] = unit_end + len(suffix)
+
+        for end in list(ends):
+            match = _power_pattern.match(text, end)
+            if match:
+                ends[match.end()] = end
+
+        return ends
+
+    def segment(self, text: str, is_unit: Callable[[str], bool]) -> Optional[list[str]]:
+        """ segment
+
+        Splits text into unit chunks. Whitespace, and '*' between units, are allowed between chunks; all other text
+        must be part of a unit.
+
+        Parameters
+        ----------
+        text: str
+        is_unit: Callable[[str], bool]
+            Final say on if a chunk is a unit (the tries only propose chunks).
+
+        Returns
+        -------
+        chunks: list[str], None
+            None if the text can't be fully covered by units.
+
+        """
+        n = len(text)
+        # scores[i]: best cover of text[i:] as (number of units, -sum(len(unit name)**2)); fewest units first, then
+        # favor long units ("hkPa" --> "h", "kPa" rather than "hk", "Pa"). next_[i]: where the chunk starting at i ends
+        scores: list[Optional[tuple[int, int]]] = [None] * (n + 1)
+        next_: list[int] = [0] * (n + 1)
+        is_chunk = [False] * (n + 1)
+        scores[n] = (0, 0)
+
+        for i in range(n - 1, -1, -1):
+            char = text[i]
+            if (char.isspace() or (char == "*" and 0 < i < n - 1)) and scores[i + 1] is not None:
+                scores[i] = scores[i + 1]
+                next_[i] = i + 1
+
+            for end, name_end in self.candidates(text, i).items():
+                if scores[end] is None:
+                    continue
+                score = (scores[end][0] + 1, scores[end][1] - (name_end - i) ** 2)
+                if (scores[i] is None or score < scores[i]) and is_unit(text[i:end]):
+                    scores[i] = score
+                    next_[i] = end
+                    is_chunk[i] = True
+
+        if scores[0] is None or scores[0][0] == 0:
+            return None
+
+        chunks = []
+        i = 0
+        while i < n:
+            if is_chunk[i]:
+                chunks.append(text[i:next_[i]])
+            i = next_[i]
+
+        return chunks
+
+
+def get_segmenter(registry: Any) -> UnitSegmenter:
+    """ Get the segmenter for a registry (built on first use). """
+    return per_registry(registry, UnitSegmenter)
@@ -0,0 +1,151 @@
+"""
+Serialize
+
+Converts parser results to (and back from) plain, picklable python objects.
+
+Pint quantities belong to the unit registry that made them and can't be sent to another process. Here a quantity
+becomes its magnitude and a tuple of (unit name, exponent) pairs, which can be rebuilt in any registry that defines
+the same units.
+
+```python
+from unit_parse import parser
+from unit_parse.serialize import dump, load
+
+data = dump(parser("1.23 g/cm3 (at 25 °C)"))
+print(data)  # [[SerializedQuantity(magnitude=1.23, units=(('gram', 1), ('centimeter', -3))), ...]]
+result = load(data)
+```
+
+`dumps` and `loads` do the same with a JSON string (e.g. for storing results on disk).
+
+"""
+from typing import Any, NamedTuple
+import json
+
+from pint.util import UnitsContainer
+
+from unit_parse.config import Quantity, Unit, get_registry
+
+
+class SerializedQuantity(NamedTuple):
+    magnitude: Any
+    units: tuple[tuple[str, float], ...]
+
+
+class SerializedUnit(NamedTuple):
+    units: tuple[tuple[str, float], ...]
+
+
+def dump(obj: Any) -> Any:
+    """ dump
+
+    Parameters
+    ----------
+    obj: Any
+        Parser result (Quantity, Unit, nested lists of them, None, ...)
+
+    Returns
+    -------
+    data: Any
+        Same structure, with quantities and units replaced by `SerializedQuantity` and `SerializedUnit`.
+
+    """
+    if isinstance(obj, list):
+        return [dump(item) for item in obj]
+    if isinstance(obj, Quantity):
+        return SerializedQuantity(obj.magnitude, tuple(obj._units.items()))
+    if isinstance(obj, Unit):
+        return SerializedUnit(tuple(obj._units.items()))
+
+    return obj
+
+
+def load(data: Any, registry=None) -> Any:
+    """ load
+
+    Parameters
+    ----------
+    data: Any
+        Output of `dump`
+    registry: UnitRegistry
+        Pint unit registry to create the quantities with. Default is the registry unit_parse is bound to.
+
+    Returns
+    -------
+    obj: Any
+        Same structure, with quantities and units rebuilt in the registry.
+
+    """
+    if registry is None:
+        registry = get_registry()
+
+    return _load(data, registry)
+
+
+def _load(data: Any, registry) -> Any:
+    if isinstance(data, list):
+        return [_load(item, registry) for item in data]
+    if isinstance(data, SerializedQuantity):
+        return registry.Quantity(data.magnitude, UnitsContainer(dict(data.units)))
+    if isinstance(data, SerializedUnit):
+        return registry.Unit(UnitsContainer(dict(data.units)))
+
+    return data
+
+
+def dumps(obj: Any) -> str:
+    """ dumps
+
+    Parameters
+    ----------
+    obj: Any
+        Parser result (Quantity, Unit, nested lists of them, None, ...)
+
+    Returns
+    -------
+    text: str
+        JSON. Quantities are {"magnitude": ..., "units": [[name, exponent], ...]} and units {"units": [...]}.
+
+    """
+    return json.dumps(_to_json(dump(obj)), separators=(",", ":"))
+
+
+def loads(text: str, registry=None) -> Any:
+    """ loads
+
+    Parameters
+    ----------
+    text: str
+        Output of `dumps`
+    registry: UnitRegistry
+        Pint unit registry to create the quantities with. Default is the registry unit_parse is bound to.
+
+    Returns
+    -------
+    obj: Any
+
+    """
+    return load(_from_json(json.loads(text)), registry)
+
+
+def _to_json(data: Any) -> Any:
+    if isinstance(data, list):
+        return [_to_json(item) for item in data]
+    if isinstance(data, SerializedQuantity):
+        return {"magnitude": data.magnitude, "units": data.units}
+    if isinstance(data, SerializedUnit):
+        return {"units": data.units}
+
+    return data
+
+
+def _from_json(data: Any) -> Any:
+    if isinstance(data, list):
+        return [_from_json(item) for item in data]
+    if isinstance(data, dict):
+        units = tuple((name, exponent) for name, exponent in data["units"])
+        if "magnitude" in data:
+            return SerializedQuantity(data["magnitude"], units)
+        return SerializedUnit(units)
+
+    return data
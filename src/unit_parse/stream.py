@@ -0,0 +1,400 @@
+"""
+Stream
+
+Parse one column (or JSON field) of a CSV, TSV or JSONL file, a chunk of rows at a time, and write each row back out
+with three extra columns:
+
+* magnitude: magnitude of the (first) quantity
+* unit: its unit, e.g. "g/cm**3"
+* quantity: magnitude and unit, e.g. "1.23 g/cm**3" (can be parsed by Pint or unit_parse)
+
+```python
+from unit_parse.stream import parse_file
+
+parse_file("data.csv", "data_parsed.csv", column="density", workers=4)
+```
+
+Only a few chunks of rows are held in memory at once, so files of any size can be streamed (also from stdin to stdout
+with "-"). After each chunk is written, the read and write positions (byte offsets) are saved to a checkpoint file
+next to the output; `resume=True` carries on from there after an interruption.
+
+Also available from the command line: `python -m unit_parse data.csv --column density -o data_parsed.csv`
+
+"""
+from typing import Any, BinaryIO, Iterator, NamedTuple, Optional, Union
+from collections import deque
+from concurrent.futures import Future
+import csv
+import io
+import json
+import os
+import sys
+
+from unit_parse.logger import logger
+from unit_parse.main import parser_batch
+from unit_parse.parallel import _chunks, _flush_persistent_cache, _picklable_error, _process_executor
+from unit_parse.utils import first_quantity
+
+
+FORMATS = ("csv", "tsv", "jsonl")
+COLUMNS = ("magnitude", "unit", "quantity")
+
+_suffixes = {".csv": "csv", ".tsv": "tsv", ".tab": "tsv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+_delimiters = {"csv": ",", "tsv": "\t"}
+
+
+class Record(NamedTuple):
+    row: Any  # list[str] (csv, tsv) or dict (jsonl)
+    text: Any  # value of the parsed column (None if the row doesn't have it)
+    end: int  # byte offset just after the record; reading again from here continues with the next record
+
+
+class ColumnError(ValueError):
+    """ The column to parse is not in the file. """
+
+
+class StreamResult(NamedTuple):
+    rows: int  # rows written (in total, when resumed)
+    failed: int  # rows where no quantity was found
+    offset: int  # byte offset in the input where reading stopped
+
+
+def parse_file(input_: str, output: str = "-", column: Union[str, int, None] = None, format_: Optional[str] = None,
+               header: bool = True, workers: int = 1, chunksize: int = 1000, resume: bool = False,
+               errors: str = "warn", encoding: str = "utf-8", checkpoint: Optional[str] = None) -> StreamResult:
+    """ parse file
+
+    Parameters
+    ----------
+    input_: str
+        Path of the input file ("-" for stdin).
+    output: str
+        Path of the output file ("-" for stdout). Same format as the input.
+    column: str, int
+        Column to parse: its name (from the header) or index (default: the first column). For JSONL, the field name
+        (needed).
+    format_: str
+        "csv", "tsv" or "jsonl". Default is from the input file extension.
+    header: bool
+        The first row of a CSV/TSV file is a header (the output gets one too, with the extra columns).
+    workers: int
+        Number of worker processes (see `parallel`). 1 parses in this process.
+    chunksize: int
+        Number of rows parsed (and written) at a time.
+    resume: bool
+        Carry on from the checkpoint file (if there is one); otherwise the output is overwritten.
+    errors: str
+        What to do when a text fails to parse:
+        * "warn": log a warning and leave the extra columns empty (default)
+        * "raise": raise the error. Rows before the chunk it is in are written and checkpointed.
+    encoding: str
+        Encoding of the input and output.
+    checkpoint: str
+        Path of the checkpoint file. Default is the output path + ".offset" (no checkpoint when writing to stdout).
+
+    Returns
+    -------
+    result: StreamResult
+        * rows: rows written
+        * failed: rows where no quantity was found
+        * offset: byte offset in the input where reading stopped
+
+    Raises
+    ------
+    ColumnError
+        The column is not in the header (or, without a header, the first row).
+
+    """
+    format_ = _get_format(input_, format_)
+    if format_ == "jsonl" and not isinstance(column, str):
+        raise ColumnError(f"'column' must be a field name for JSONL. Given: {column}")
+    if column is None:
+        column = 0
+    if errors not in ("warn", "raise"):
+        raise ValueError(f"'errors' must be 'warn' or 'raise'. Given: {errors}")
+    if chunksize < 1:
+        raise ValueError(f"'chunksize' must be 1 or more. Given: {chunksize}")
+    if checkpoint is None and output != "-":
+        checkpoint = output + ".offset"
+    if resume and (input_ == "-" or checkpoint is None):
+        raise ValueError("'resume' needs an input and output file (not stdin/stdout).")
+
+    state = _read_checkpoint(checkpoint) if resume else None
+
+    in_file = sys.stdin.buffer if input_ == "-" else open(input_, "rb")
+    try:
+        out_file = _open_output(output, state)
+        try:
+            return _parse_stream(in_file, out_file, column, format_, header, workers, chunksize, errors, encoding,
+                                 checkpoint, state)
+        finally:
+            if out_file is not sys.stdout.buffer:
+                out_file.close()
+    finally:
+        if in_file is not sys.stdin.buffer:
+            in_file.close()
+
+
+def read_header(file: BinaryIO, format_: str, encoding: str = "utf-8") -> tuple[list[str], int]:
+    """ read header
+
+    Parameters
+    ----------
+    file: BinaryIO
+        Input file (binary mode), at the start.
+    format_: str
+        "csv" or "tsv"
+    encoding: str
+
+    Returns
+    -------
+    header: list[str]
+        Column names
+    end: int
+        Byte offset just after the header
+
+    """
+    source = _LineSource(file, encoding, 0)
+    row = next(csv.reader(source, delimiter=_delimiters[format_]), [])
+    if row:
+        row[0] = row[0].lstrip("\ufeff")  # byte order mark
+    return row, source.position
+
+
+def read_records(file: BinaryIO, format_: str, column: Union[str, int], start: int = 0, encoding: str = "utf-8") \
+        -> Iterator[Record]:
+    """ read records
+
+    Reads records one at a time from the file's current position.
+
+    Parameters
+    ----------
+    file: BinaryIO
+        Input file (binary mode)
+    format_: str
+        "csv", "tsv" or "jsonl"
+    column: str, int
+        Index of the column (csv, tsv) or name of the field (jsonl) to get the text from.
+    start: int
+        Byte offset of the file's current position (offsets in the records count from it).
+    encoding: str
+
+    Yields
+    ------
+    record: Record
+        Blank lines are skipped.
+
+    """
+    source = _LineSource(file, encoding, start)
+    if format_ == "jsonl":
+        for line in source:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"Invalid JSON line ending at byte {source.position}: {e}") from e
+            if not isinstance(row, dict):
+                raise ValueError(f"JSON line ending at byte {source.position} is not an object.")
+            text = row.get(column)
+            yield Record(row, text, source.position)
+        return
+
+    for row in csv.reader(source, delimiter=_delimiters[format_]):
+        if not row:
+            continue
+        text = row[column] if column < len(row) else None
+        yield Record(row, text, source.position)
+
+
+class _LineSource:
+    """ Lines of a binary file, decoded, counting the bytes read. """
+
+    def __init__(self, file: BinaryIO, encoding: str, position: int):
+        self.file = file
+        self.encoding = encoding
+        self.position = position
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        line = self.file.readline()
+        if not line:
+            raise StopIteration
+        self.position += len(line)
+        return line.decode(self.encoding)
+
+
+def _get_format(input_: str, format_: Optional[str]) -> str:
+    if format_ is None:
+        format_ = _suffixes.get(os.path.splitext(input_)[1].lower())
+        if format_ is None:
+            raise ValueError(f"Format of '{input_}' is unknown; set 'format_' to one of {FORMATS}.")
+    if format_ not in FORMATS:
+        raise ValueError(f"'format_' must be one of {FORMATS}. Given: {format_}")
+    return format_
+
+
+def _read_checkpoint(checkpoint: str) -> Optional[dict[str, int]]:
+    if not os.path.exists(checkpoint):
+        logger.info(f"No checkpoint at '{checkpoint}'; starting from the beginning.")
+        return None
+    with open(checkpoint, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _write_checkpoint(checkpoint: str, state: dict[str, int]):
+    temp = checkpoint + ".tmp"
+    with open(temp, "w", encoding="utf-8") as file:
+        json.dump(state, file)
+    os.replace(temp, checkpoint)  # (atomic, so an interruption leaves the old or the new checkpoint)
+
+
+def _open_output(output: str, state: Optional[dict[str, int]]) -> BinaryIO:
+    if output == "-":
+        return sys.stdout.buffer
+    if state is None:
+        return open(output, "wb")
+
+    # drop anything written after the checkpoint
+    file = open(output, "r+b")
+    file.truncate(state["output"])
+    file.seek(state["output"])
+    return file
+
+
+def _parse_stream(in_file: BinaryIO, out_file: BinaryIO, column: Union[str, int], format_: str, header: bool,
+                  workers: int, chunksize: int, errors: str, encoding: str, checkpoint: Optional[str],
+                  state: Optional[dict[str, int]]) -> StreamResult:
+    position = 0
+    if format_ != "jsonl":
+        if header:
+            names, position = read_header(in_file, format_, encoding)
+            column = _column_index(names, column)
+            if state is None:
+                _write_rows(out_file, format_, encoding, [names + list(COLUMNS)])
+        elif not isinstance(column, int):
+            raise ColumnError(f"'column' must be an index when the file has no header. Given: {column}")
+
+    if state is None:
+        state = {"input": position, "output": out_file.tell() if checkpoint else 0, "rows": 0, "failed": 0}
+    elif state["input"] != position:
+        in_file.seek(state["input"])
+    if checkpoint:
+        _write_checkpoint(checkpoint, state)
+
+    records = read_records(in_file, format_, column, state["input"], encoding)
+    if format_ != "jsonl" and not header:
+        records = _check_first_row(records, column)
+    for chunk, results in _run_chunks(records, chunksize, workers):
+        rows = []
+        for record, result in zip(chunk, results):
+            if isinstance(result, Exception):
+                if errors == "raise":
+                    raise result
+                logger.warning(f"Parsing failed for row {state['rows']}: '{record.text}' ({type(result).__name__}: "
+                               f"{result})")
+                result = None
+            if result is None:
+                result = (None, None, None)
+                state["failed"] += 1
+            rows.append(_output_row(format_, record.row, result))
+            state["rows"] += 1
+
+        _write_rows(out_file, format_, encoding, rows)
+        out_file.flush()
+        state["input"] = chunk[-1].end
+        if checkpoint:
+            state["output"] = out_file.tell()
+            _write_checkpoint(checkpoint, state)
+
+    return StreamResult(state["rows"], state["failed"], state["input"])
+
+
+def _column_index(names: list[str], column: Union[str, int]) -> int:
+    if isinstance(column, str) and column in names:
+        return names.index(column)
+    if isinstance(column, str) and not column.isdigit():
+        raise ColumnError(f"Column '{column}' is not in the header: {names}")
+
+    index = int(column)
+    if not 0 <= index < len(names):
+        raise ColumnError(f"Column {index} is out of range; the header has {len(names)} columns: {names}")
+    return index
+
+
+def _check_first_row(records: Iterator[Record], column: int) -> Iterator[Record]:
+    """ Records, after checking the column is in the first row (for files without a header). """
+    for record in records:
+        if not 0 <= column < len(record.row):
+            raise ColumnError(f"Column {column} is out of range; the first row has {len(record.row)} columns.")
+        yield record
+        break
+    yield from records
+
+
+def _run_chunks(records: Iterator[Record], chunksize: int, workers: int) \
+        -> Iterator[tuple[list[Record], list[Any]]]:
+    """ Yields (chunk, results) in input order, with at most 2 * workers chunks sent out at once. """
+    if workers <= 1:
+        for chunk in _chunks(records, chunksize):
+            yield chunk, _format_chunk([record.text for record in chunk])
+        return
+
+    pending: deque[tuple[list[Record], Future]] = deque()
+    with _process_executor(workers) as executor:
+        for chunk in _chunks(records, chunksize):
+            pending.append((chunk, executor.submit(_format_chunk, [record.text for record in chunk])))
+            if len(pending) >= 2 * workers:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+
+
+def _format_chunk(texts: list[Any]) -> list[Any]:
+    """ (magnitude, unit, quantity) for each text; None if no quantity was found. (Can run in a worker process.) """
+    strings = [text for text in texts if isinstance(text, str)]
+    results = iter(parser_batch(strings, errors="return"))
+
+    out = []
+    for text in texts:
+        if not isinstance(text, str):
+            out.append(None)
+            continue
+
+        result = next(results)
+        if isinstance(result, Exception):
+            out.append(_picklable_error(result))
+            continue
+
+        quantity = first_quantity(result)
+        if quantity is None:
+            out.append(None)
+        else:
+            out.append((quantity.magnitude, f"{quantity.units:~C}", f"{quantity:~C}"))
+
+    _flush_persistent_cache()
+    return out
+
+
+def _output_row(format_: str, row: Any, result: tuple[Any, Any, Any]) -> Any:
+    if format_ == "jsonl":
+        row = dict(row)
+        row.update(zip(COLUMNS, result))
+        return row
+
+    return row + ["" if value is None else str(value) for value in result]
+
+
+def _write_rows(out_file: BinaryIO, format_: str, encoding: str, rows: list[Any]):
+    if format_ == "jsonl":
+        text = "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+    else:
+        buffer = io.StringIO()
+        csv.writer(buffer, delimiter=_delimiters[format_], lineterminator="\n").writerows(rows)
+        text = buffer.getvalue()
+    out_file.write(text.encode(encoding))
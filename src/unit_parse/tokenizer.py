@@ -0,0 +1,70 @@
+"""
+Tokenizer
+
+Splits text into tokens in a single pass, so substitution steps can work on whole numbers and words instead of
+searching (and replacing) fragments of the text.
+
+```python
+from unit_parse.tokenizer import tokenize
+
+tokenize("5.3e1 g/cm3")
+# [Token(kind='NUMBER', text='5.3'), Token(kind='WORD', text='e'), Token(kind='NUMBER', text='1'),
+#  Token(kind='SPACE', text=' '), Token(kind='WORD', text='g'), Token(kind='OPERATOR', text='/'),
+#  Token(kind='WORD', text='cm'), Token(kind='NUMBER', text='3')]
+```
+
+"""
+from typing import Iterable, NamedTuple
+import re
+
+
+NUMBER = "NUMBER"  # 5, 5.3
+WORD = "WORD"  # letters (any language)
+SPACE = "SPACE"
+POWER = "POWER"  # ** ^
+OPERATOR = "OPERATOR"  # * / + -
+OPEN = "OPEN"  # ( [ {
+CLOSE = "CLOSE"  # ) ] }
+AT = "AT"  # @
+SEPARATOR = "SEPARATOR"  # ; ,
+OTHER = "OTHER"  # anything else (°, %, ., ...), one character at a time
+
+_token_pattern = re.compile(
+    r"(?P<NUMBER>[0-9]+(?:\.[0-9]+)?)"
+    r"|(?P<WORD>[^\W\d_]+)"
+    r"|(?P<SPACE>\s+)"
+    r"|(?P<POWER>\*\*|\^)"
+    r"|(?P<OPERATOR>[*/+\-])"
+    r"|(?P<OPEN>[(\[{])"
+    r"|(?P<CLOSE>[)\]}])"
+    r"|(?P<AT>@)"
+    r"|(?P<SEPARATOR>[;,])"
+    r"|(?P<OTHER>.)",
+    re.DOTALL
+)
+
+
+class Token(NamedTuple):
+    kind: str
+    text: str
+
+
+def tokenize(text_in: str) -> list[Token]:
+    """ tokenize
+
+    Parameters
+    ----------
+    text_in: str
+
+    Returns
+    -------
+    tokens: list[Token]
+        Joining the token text gives back text_in.
+
+    """
+    return [Token(match.lastgroup, match.group()) for match in _token_pattern.finditer(text_in)]
+
+
+def untokenize(tokens: Iterable[Token]) -> str:
+    """ Join tokens back into text. """
+    return "".join(token.text for token in tokens)
@@ -0,0 +1,107 @@
+"""
+Trace
+
+Records how `parser` transforms a string, stage by stage, with the time each stage took.
+
+```python
+from unit_parse import parser
+from unit_parse.trace import parse_trace
+
+with parse_trace() as trace:
+    parser("37.34 kJ/mole (at 25 °C)")
+
+for record in trace.records:
+    print(record.stage, record.elapsed_ns, record.output)
+```
+
+Tracing is off unless inside `parse_trace()`; then the only cost is one context variable look-up per stage group.
+
+"""
+from typing import Any, Callable, Iterator, NamedTuple, Optional
+from contextlib import contextmanager
+import contextvars
+import time
+
+
+class StageRecord(NamedTuple):
+    stage: str
+    input: Any
+    output: Any
+    elapsed_ns: int
+
+
+class StageSummary(NamedTuple):
+    count: int
+    total_ns: int
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count if self.count else 0.0
+
+
+class ParseTrace:
+    """ Parse Trace
+
+    Records of each pipeline stage, in the order they finished. Sub-steps are named '<stage>.<step>'
+    (e.g. 'substitution.sub_power') and finish before their stage; each parse ends with a 'parser' record.
+
+    """
+
+    def __init__(self):
+        self.records: list[StageRecord] = []
+
+    def __repr__(self):
+        return f"ParseTrace({len(self.records)} records)"
+
+    def run(self, stage: str, func: Callable, *args, **kwargs) -> Any:
+        """ Call func(*args, **kwargs) and record it as a stage. (input is the first argument) """
+        start = time.perf_counter_ns()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter_ns() - start
+        self.records.append(StageRecord(stage, args[0] if args else None, result, elapsed))
+        return result
+
+    def summary(self) -> dict[str, StageSummary]:
+        """ Number of calls and total time for each stage. """
+        out: dict[str, StageSummary] = {}
+        for record in self.records:
+            count, total = out.get(record.stage, (0, 0))
+            out[record.stage] = StageSummary(count + 1, total + record.elapsed_ns)
+        return out
+
+    def clear(self):
+        self.records.clear()
+
+
+_active_trace: contextvars.ContextVar = contextvars.ContextVar("unit_parse_trace", default=None)
+
+
+def get_trace() -> Optional[ParseTrace]:
+    """ Returns the active trace, or None if tracing is off. """
+    return _active_trace.get()
+
+
+@contextmanager
+def parse_trace(trace: Optional[ParseTrace] = None) -> Iterator[ParseTrace]:
+    """ parse trace
+
+    Context manager that turns tracing on for `parser` calls made inside it (in this thread/task).
+
+    Parameters
+    ----------
+    trace: ParseTrace
+        Trace to add records to (to collect over several blocks). A new one is made if not given.
+
+    Returns
+    -------
+    trace: ParseTrace
+
+    """
+    if trace is None:
+        trace = ParseTrace()
+
+    token = _active_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _active_trace.reset(token)
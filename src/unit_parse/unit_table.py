@@ -0,0 +1,165 @@
+"""
+Unit table
+
+Gives each distinct unit a small integer id, and keeps one shared `Unit` per id, so results can refer to their unit by
+id instead of carrying their own pint objects (see `compact`).
+
+```python
+from unit_parse.unit_table import get_unit_table
+
+table = get_unit_table()
+unit_id = table.intern(Unit("g/mol"))  # same id every time for the same unit
+table.unit(unit_id)  # <Unit('gram / mole')>
+table.info(unit_id)  # UnitInfo(unit=<Unit('gram / mole')>, dimension_id=1, factor=1, offset=0)
+```
+
+Each unit's dimensionality (as an id, so units can be compared and grouped by dimension with integers) and its
+conversion to root units (`value * factor + offset`) are worked out once, when the unit is first interned.
+
+Ids are never reused, so the table only grows; it holds up to `maxsize` units. Once it is full, `intern` raises an
+OverflowError for new units, and `lookup` (and `shared`, `dimension_id`) work out new units each time instead of
+keeping them.
+
+"""
+from typing import Any, Hashable, NamedTuple, Optional
+import threading
+
+from unit_parse.cache import per_registry
+from unit_parse.config import Unit, get_registry
+
+
+DIMENSIONLESS = 0  # unit id and dimension id of dimensionless
+
+
+class UnitInfo(NamedTuple):
+    unit: Unit  # shared Unit
+    dimension_id: Hashable  # equal for units of the same dimensionality (int; see `UnitTable.lookup` for others)
+    factor: Optional[float]  # value in root units = value * factor + offset (None: can't be converted)
+    offset: float
+
+
+class UnitTable:
+    """ Unit Table
+
+    Parameters
+    ----------
+    registry: UnitRegistry
+        Pint unit registry the units are made in.
+    maxsize: int
+        Largest number of units kept.
+
+    """
+
+    def __init__(self, registry: Any, maxsize: int = 65_536):
+        self.registry = registry
+        self.maxsize = maxsize
+        self._ids: dict[Any, int] = {}  # pint UnitsContainer -> id
+        self._info: list[UnitInfo] = []
+        self._dimension_ids: dict[Any, int] = {}  # pint UnitsContainer of dimensions -> id
+        self._lock = threading.Lock()
+        self.intern(registry.Unit(""))  # (DIMENSIONLESS)
+
+    def __len__(self):
+        return len(self._info)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({len(self)} units)"
+
+    def intern(self, units: Any) -> int:
+        """ intern
+
+        Parameters
+        ----------
+        units: Unit, Quantity, UnitsContainer
+            Unit (or the unit of a quantity); may be from another registry.
+
+        Returns
+        -------
+        unit_id: int
+            Id of the unit; the same for equal units.
+
+        Raises
+        ------
+        OverflowError
+            The unit is new and the table is full.
+
+        """
+        container = getattr(units, "_units", units)
+        unit_id = self._ids.get(container)
+        if unit_id is None:
+            with self._lock:
+                unit_id = self._ids.get(container)
+                if unit_id is None:
+                    if len(self._info) >= self.maxsize:
+                        raise OverflowError(f"Unit table is full ({self.maxsize} units); can't add: {container}")
+                    unit_id = len(self._info)
+                    self._info.append(self._make_info(self.registry.Unit(container)))
+                    self._ids[container] = unit_id
+
+        return unit_id
+
+    def unit(self, unit_id: int) -> Unit:
+        """ Shared `Unit` of an id. """
+        return self._info[unit_id].unit
+
+    def info(self, unit_id: int) -> UnitInfo:
+        """ Shared `Unit`, dimension id and root unit conversion of an id. """
+        return self._info[unit_id]
+
+    def lookup(self, units: Any) -> UnitInfo:
+        """ lookup
+
+        Like `info(intern(units))`, but doesn't fail when the table is full: the info of a new unit is then worked out
+        and not kept. Its unit is not shared, and a dimensionality without an id gets the pint UnitsContainer of the
+        dimensions as its dimension id (equal for equal dimensionalities, and never equal to an id).
+
+        Parameters
+        ----------
+        units: Unit, Quantity, UnitsContainer
+
+        Returns
+        -------
+        info: UnitInfo
+
+        """
+        container = getattr(units, "_units", units)
+        unit_id = self._ids.get(container)
+        if unit_id is None and len(self._info) < self.maxsize:
+            try:
+                unit_id = self.intern(container)
+            except OverflowError:  # (filled up by another thread)
+                pass
+
+        if unit_id is None:
+            return self._make_info(self.registry.Unit(container), keep=False)
+        return self._info[unit_id]
+
+    def shared(self, units: Any) -> Unit:
+        """ Shared `Unit` equal to units. """
+        return self.lookup(units).unit
+
+    def dimension_id(self, units: Any) -> Hashable:
+        """ Dimension id of units (Unit, Quantity or UnitsContainer). """
+        return self.lookup(units).dimension_id
+
+    def _make_info(self, unit: Unit, keep: bool = True) -> UnitInfo:
+        dimensionality = unit.dimensionality
+        if keep:
+            dimension_id = self._dimension_ids.setdefault(dimensionality, len(self._dimension_ids))
+        else:
+            dimension_id = self._dimension_ids.get(dimensionality, dimensionality)
+
+        try:
+            factor = self.registry.get_root_units(unit)[0]
+            offset = self.registry.Quantity(0, unit).to_root_units().magnitude  # (not 0 for degC, degF)
+        except Exception:
+            factor, offset = None, 0
+
+        return UnitInfo(unit, dimension_id, factor, offset)
+
+
+def get_unit_table(registry: Optional[Any] = None) -> UnitTable:
+    """ Get the unit table for a registry (default: the registry in use). """
+    if registry is None:
+        registry = get_registry()
+    return per_registry(registry, UnitTable)
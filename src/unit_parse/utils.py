@@ -1,7 +1,10 @@
-from typing import List, Any, Optional, Union
+from typing import List, Any, Hashable, Optional, Union
+from decimal import Context, Decimal, DivisionByZero, InvalidOperation, Overflow, ROUND_HALF_EVEN
+import math
 import re
 
 from unit_parse.config import Quantity
+from unit_parse.unit_table import DIMENSIONLESS, UnitTable, get_unit_table
 
 
 def quantity_approx_equal(quantity1: Quantity, quantity2: Quantity, cutoff: Optional[float] = 0.02) -> bool:
@@ -9,13 +12,16 @@ def quantity_approx_equal(quantity1: Quantity, quantity2: Quantity, cutoff: Opti
     if not isinstance(quantity1, Quantity) or not isinstance(quantity2, Quantity):
         return False
 
-    if quantity1.dimensionality == quantity2.dimensionality:
-        if quantity2.to_base_units().m == 0:  # avoid divide by zero error
-            if quantity1.to_base_units().m == 0:
+    table = get_unit_table()
+    dim1, value1 = _root_value(quantity1, table)
+    dim2, value2 = _root_value(quantity2, table)
+    if dim1 == dim2:
+        if value2 == 0:  # avoid divide by zero error
+            if value1 == 0:
                 return True
             return False
 
-        if abs((quantity1 - quantity2) / quantity2) <= cutoff:
+        if abs((value1 - value2) / value2) <= cutoff:
             return True
 
     return False
@@ -23,21 +29,47 @@ def quantity_approx_equal(quantity1: Quantity, quantity2: Quantity, cutoff: Opti
 
 def quantity_difference(quantity1: Quantity, quantity2: Quantity) -> Union[int, float]:
     """ Returns absolute difference between quantities. """
-    if isinstance(quantity1, (int, float)):
-        quantity1 = Quantity(quantity1)
-    if isinstance(quantity2, (int, float)):
-        quantity2 = Quantity(quantity2)
+    if not isinstance(quantity1, (int, float, Quantity)) or not isinstance(quantity2, (int, float, Quantity)):
+        return 1
 
-    if not isinstance(quantity1, Quantity) or not isinstance(quantity2, Quantity) or \
-            quantity1.dimensionality != quantity2.dimensionality:
+    table = get_unit_table()
+    dim1, value1 = _root_value(quantity1, table)
+    dim2, value2 = _root_value(quantity2, table)
+    if dim1 != dim2:
         return 1
 
-    if quantity2.to_base_units().m == 0:  # avoid divide by zero error
-        if quantity1.to_base_units().m == 0:
+    if value2 == 0:  # avoid divide by zero error
+        if value1 == 0:
             return True
         return False
 
-    return abs((quantity1 - quantity2) / quantity2)
+    return abs((value1 - value2) / value2)
+
+
+def _root_value(quantity: Union[int, float, Quantity], table: UnitTable) -> tuple[Hashable, Union[int, float]]:
+    """ (dimension id, magnitude in root units), from the unit table's cached conversion factors. """
+    if isinstance(quantity, (int, float)):
+        return DIMENSIONLESS, quantity
+
+    info = table.lookup(quantity._units)
+    magnitude = quantity.magnitude
+    if info.factor is None or not isinstance(magnitude, (int, float)):
+        return info.dimension_id, quantity.to_root_units().magnitude
+    return info.dimension_id, magnitude * info.factor + info.offset
+
+
+def first_quantity(result: Any) -> Optional[Quantity]:
+    """ First quantity (or number) in a parser result. """
+    while isinstance(result, list):
+        if not result:
+            return None
+        result = result[0]
+
+    if isinstance(result, Quantity):
+        return result
+    if isinstance(result, (int, float)):
+        return Quantity(result)
+    return None
 
 
 def flatten_list(list_in: List[Any]) -> List[Any]:
@@ -105,15 +137,115 @@ def sig_figs(number: Union[float, int], sig_digit: int = 3) -> Union[int, float]
         raise TypeError(f"'sig_figs' only accepts int or float. Given: {number} (type: {type(number)}")
 
 
+def evaluate_number(text: str, as_decimal: bool = False, sig_digit: Optional[int] = 15) \
+        -> Union[float, Decimal, None]:
+    """ evaluate number
+
+    Works out the value of a number written with '*', '**' and '-' ("66.11*10**-62", "-5.3", "4*10**3").
+    Arithmetic is done exactly with decimals (python's precedence rules), and no code is run, so text like
+    '10**10**10' can't hang the parser.
+
+    Parameters
+    ----------
+    text: str
+        number text
+    as_decimal: bool
+        Return a `decimal.Decimal` instead of a float.
+    sig_digit: int, None
+        Significant digits the value is rounded to. None keeps the significant digits of the first number in the text
+        ("1.20*10**3" --> Decimal('1.20E+3')).
+
+    Returns
+    -------
+    value: float, Decimal, None
+        None if the text is not a number, or its value is too large for a float.
+
+    """
+    tokens = _number_token.findall(text)
+    if not tokens or sum(len(token) for token in tokens) != len(text):
+        return None
+
+    if (len(tokens) == 1 or (len(tokens) == 2 and tokens[0] == "-")) and not as_decimal and sig_digit is not None \
+            and _count_sig_digits(tokens[-1]) <= sig_digit:
+        try:  # fast path: plain number that needs no rounding
+            return float(text)
+        except ValueError:
+            return None
+
+    try:
+        reader = _NumberReader(tokens)
+        value = reader.expression()
+        if reader.i != len(tokens) or not value.is_finite():
+            return None
+        if sig_digit is None:
+            sig_digit = max(_count_sig_digits(tokens[0] if tokens[0] != "-" else tokens[1]), 1)
+        value = Context(prec=sig_digit, rounding=ROUND_HALF_EVEN).plus(value)
+    except (ArithmeticError, IndexError):  # invalid numbers ('1.2.'), overflow, 0**-1, ...
+        return None
+
+    if as_decimal:
+        return value
+
+    value = float(value)
+    return None if math.isinf(value) else value
+
+
+_number_token = re.compile(r"[0-9.]+|[*]{2}|[*-]")
+_number_context = Context(prec=60, Emax=999_999, Emin=-999_999, traps=[Overflow, InvalidOperation, DivisionByZero])
+
+
+def _count_sig_digits(number: str) -> int:
+    """ '0.0500' --> 3 """
+    return len(number.replace(".", "").lstrip("0"))
+
+
+class _NumberReader:
+    """ Recursive descent over number tokens; same precedence as python ('**' before unary '-' before '*' before
+    '-'). """
+
+    def __init__(self, tokens: list[str]):
+        self.tokens = tokens
+        self.i = 0
+
+    def expression(self) -> Decimal:
+        value = self.product()
+        while self.i < len(self.tokens) and self.tokens[self.i] == "-":
+            self.i += 1
+            value = _number_context.subtract(value, self.product())
+        return value
+
+    def product(self) -> Decimal:
+        value = self.unary()
+        while self.i < len(self.tokens) and self.tokens[self.i] == "*":
+            self.i += 1
+            value = _number_context.multiply(value, self.unary())
+        return value
+
+    def unary(self) -> Decimal:
+        if self.tokens[self.i] == "-":
+            self.i += 1
+            return _number_context.minus(self.unary())
+        return self.power()
+
+    def power(self) -> Decimal:
+        value = _number_context.create_decimal(self.tokens[self.i])
+        self.i += 1
+        if self.i < len(self.tokens) and self.tokens[self.i] == "**":
+            self.i += 1
+            value = _number_context.power(value, self.unary()).normalize(_number_context)  # 10**3 --> 1E+3
+        return value
+
+
 def split_list(text_split: List[Union[str, Any]], chunks: Union[str, List[str]], maxsplit: int = 1) \
         -> List[Union[str, Any]]:
-    """Splits text up into a list of strings based on chunks."""
+    """Splits text up into a list of strings based on chunks. Returns a new list."""
     if isinstance(chunks, str):
         chunks = [chunks]
     if isinstance(text_split, str):
         text_split = [text_split]
     if not isinstance(text_split, list):
         return text_split
+    text_split = list(text_split)  # don't change the caller's list
 
     for chunk in chunks:
         for i, text in enumerate(text_split):
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from unit_parse import Quantity, parser
+from unit_parse import aio
+from unit_parse.aio import AsyncParser, async_parser, async_parser_batch
+
+texts = [
+    "5 g",
+    "40 °F",
+    "2.3 gcm",
+    "37.34 kJ/mole (at 25 °C)",
+    "Pass me a 300 ml beer.",
+    "1.10*10**-05 atm-m**3/mole at 25 °C",
+]
+
+
+async def _collect(async_iterator):
+    return [result async for result in async_iterator]
+
+
+async def _async_texts():
+    for text in texts:
+        await asyncio.sleep(0)
+        yield text
+
+
+def test_async_parser():
+    assert asyncio.run(async_parser("5 g")) == Quantity("5 g")
+
+
+def test_async_parser_batch():
+    expected = [parser(text) for text in texts]
+    assert asyncio.run(_collect(async_parser_batch(texts))) == expected
+    assert asyncio.run(_collect(async_parser_batch(_async_texts()))) == expected
+
+
+def test_async_parser_batch_errors():
+    assert asyncio.run(_collect(async_parser_batch(["5 g", 1, "1 K"]))) == [Quantity("5 g"), None, Quantity("1 K")]
+
+    result = asyncio.run(_collect(async_parser_batch(["5 g", 1], errors="return")))
+    assert isinstance(result[1], TypeError)
+
+    with pytest.raises(TypeError):
+        asyncio.run(_collect(async_parser_batch(["5 g", 1], errors="raise")))
+
+    with pytest.raises(ValueError):
+        asyncio.run(_collect(async_parser_batch(["5 g"], errors="skip")))
+
+
+def test_coalesce(monkeypatch):
+    calls = []
+
+    def counting_parser(text_in):
+        calls.append(text_in)
+        return parser(text_in)
+
+    monkeypatch.setattr(aio, "parser", counting_parser)
+
+    async def main():
+        async with AsyncParser(executor="thread", max_concurrency=2) as async_parser_:
+            return await asyncio.gather(*(async_parser_.parse("5 g") for _ in range(10)))
+
+    assert asyncio.run(main()) == [Quantity("5 g")] * 10
+    assert calls == ["5 g"]
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_executor(executor):
+    async def main():
+        async with AsyncParser(executor=executor, workers=2) as async_parser_:
+            return await _collect(async_parser_.parse_stream(texts))
+
+    assert asyncio.run(main()) == [parser(text) for text in texts]
+
+
+@pytest.mark.parametrize("executor", [None, "thread"])
+def test_context(executor):
+    import pint
+    from unit_parse import use_registry
+    from unit_parse.trace import parse_trace
+    registry = pint.UnitRegistry()
+
+    async def main():
+        async with AsyncParser(executor=executor) as async_parser_:
+            with use_registry(registry):
+                in_registry = await async_parser_.parse("5 g")
+            with parse_trace() as trace:
+                await async_parser_.parse("6 g")
+            return in_registry, trace
+
+    in_registry, trace = asyncio.run(main())
+    assert isinstance(in_registry, registry.Quantity)
+    assert [record.stage for record in trace.records][-1] == "parser"
+
+
+def test_coalesce_registries():
+    import pint
+    from unit_parse import use_registry
+    registries = [pint.UnitRegistry(), pint.UnitRegistry()]
+
+    async def parse(async_parser_, registry):
+        with use_registry(registry):
+            return await async_parser_.parse("5 g")
+
+    async def main():
+        async with AsyncParser(executor="thread", max_concurrency=2) as async_parser_:
+            return await asyncio.gather(*(parse(async_parser_, registry) for registry in registries * 3))
+
+    results = asyncio.run(main())
+    assert [type(result) for result in results] == [registry.Quantity for registry in registries * 3]
+
+
+def test_executor_error():
+    with pytest.raises(ValueError):
+        AsyncParser(executor="gpu")
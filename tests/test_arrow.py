@@ -0,0 +1,54 @@
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from unit_parse import Quantity, parser  # noqa: E402
+from unit_parse.arrow import SCHEMA, to_record_batch, write_parquet  # noqa: E402
+
+# [input_, output_] output_: (magnitude, unit, series_magnitude, series_unit, condition_magnitude, condition_unit)
+examples = [
+    [None, (None, None, None, None, None, None)],
+    [Quantity("5 g"), (5.0, "g", [5.0], ["g"], [None], [None])],
+    [5, (5.0, "", [5.0], [""], [None], [None])],
+    [parser("20.8 mm Hg @ 25 °C"), (20.8, "mmHg", [20.8], ["mmHg"], [25.0], ["°C"])],
+    [parser("18 mm Hg at 68 °F ; 20 mm Hg at 77° F"),
+     (18.0, "mmHg", [18.0, 20.0], ["mmHg", "mmHg"], [68.0, 77.0], ["°F", "°F"])],
+    [[Quantity("5 g"), Quantity("6 kg")], (5.0, "g", [5.0, 6.0], ["g", "kg"], [None, None], [None, None])],
+    [[[Quantity("5 g")], Quantity("6 g")], (5.0, "g", [5.0, 6.0], ["g", "g"], [None, None], [None, None])],
+    [[], (None, None, None, None, None, None)],
+]
+
+
+@pytest.mark.parametrize("input_, output_", examples)
+def test_to_record_batch(input_, output_):
+    batch = to_record_batch([input_])
+    assert batch.schema == SCHEMA
+    assert tuple(batch.to_pylist()[0].values()) == output_
+
+
+def test_to_record_batch_many():
+    batch = to_record_batch([example[0] for example in examples])
+    assert batch.num_rows == len(examples)
+    assert [tuple(row.values()) for row in batch.to_pylist()] == [example[1] for example in examples]
+
+    # one dictionary of units for the batch
+    assert batch.column("unit").dictionary.to_pylist() == ["g", "", "mmHg", "°C", "°F", "kg"]
+    assert batch.column("series_unit").values.dictionary.equals(batch.column("unit").dictionary)
+
+
+def test_to_record_batch_errors():
+    with pytest.raises(ValueError):
+        to_record_batch([[[[Quantity("5 g")]]]])
+
+
+def test_write_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    results = [example[0] for example in examples] * 3
+    write_parquet(results, str(tmp_path / "out.parquet"), batch_size=5)
+
+    table = pq.read_table(str(tmp_path / "out.parquet"))
+    assert table.num_rows == len(results)
+    assert [tuple(row.values()) for row in table.to_pylist()] == [example[1] for example in examples] * 3
+
+    write_parquet([], str(tmp_path / "empty.parquet"))
+    assert pq.read_table(str(tmp_path / "empty.parquet")).num_rows == 0
@@ -0,0 +1,194 @@
+import multiprocessing
+import os
+import threading
+
+import pytest
+
+from unit_parse import Quantity, Unit, config, parser
+from unit_parse.cache import LRUCache, PersistentCache, ResultCache, UnitCache
+
+
+def test_lru_cache():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)  # "b" is the least recently used
+
+    assert "b" not in cache
+    assert cache.get("b") is None
+    assert cache.info() == (1, 1, 2, 2, 1)
+    assert cache.hit_rate == 0.5
+
+    cache.maxsize = 1
+    assert len(cache) == 1
+    assert "c" in cache
+
+    cache.clear()
+    assert cache.info() == (0, 0, 1, 0, 0)
+
+    with pytest.raises(ValueError):
+        cache.maxsize = -1
+
+
+def test_unit_cache():
+    calls = []
+
+    def factory(text):
+        calls.append(text)
+        return Unit(text)
+
+    cache = UnitCache(factory, maxsize=10)
+    assert cache.lookup("g") == Unit("g")
+    assert cache.lookup("g") == Unit("g")
+    assert cache.lookup("gx") is None
+    assert cache.lookup("gx") is None
+
+    assert calls == ["g", "gx"]  # misses are remembered too
+    assert cache.info().hits == 2
+
+
+def test_unit_cache_threads():
+    cache = UnitCache(Unit, maxsize=8)
+    texts = ["g", "cm", "mol", "mmHg", "s", "ml", "kg", "bad_unit", "K", "degC"] * 20
+
+    def work():
+        for text in texts:
+            cache.lookup(text)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(cache) <= 8
+    assert cache.lookup("cm") == Unit("cm")
+
+
+def test_config_unit_cache():
+    config.unit_cache.clear()
+    parser("2.3 mlgcm")
+    parser("2.3 mlgcm")
+
+    info = config.unit_cache.info()
+    assert info.currsize > 0
+    assert info.hits > 0
+
+
+def test_lru_cache_ttl():
+    cache = LRUCache(maxsize=2, ttl=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    assert cache.info().evictions == 1
+
+
+def test_result_cache():
+    calls = []
+
+    def parse(text):
+        calls.append(text)
+        return parser(text)
+
+    cache = ResultCache(maxsize=10)
+    settings = config.snapshot()
+    result = cache.lookup("5 g (at 25 °C)", settings, parse)
+    result[0][0].ito("kg")  # changing a result must not change the cache
+    assert cache.lookup("5 g (at 25 °C)", settings, parse) == [[Quantity("5 g"), Quantity("25 degC")]]
+    assert calls == ["5 g (at 25 °C)"]
+
+    cache.lookup("5 g (at 25 °C)", settings._replace(remove_text=("g",)), parse)  # new settings empty the cache
+    assert len(calls) == 2
+
+
+def test_result_cache_settings_changed_while_parsing():
+    cache = ResultCache(maxsize=10)
+    settings1 = config.snapshot()
+    settings2 = settings1._replace(remove_text=("g",))
+
+    def parse1(text):
+        cache.lookup("6 g", settings2, lambda text_: "new")  # another thread changes the settings meanwhile
+        return "old"
+
+    assert cache.lookup("x", settings1, parse1) == "old"
+    assert cache.lookup("x", settings2, lambda text: "new") == "new"  # the old result was not kept
+    assert "x" in cache and "6 g" in cache
+
+
+def test_config_result_cache():
+    original = config.remove_text
+    try:
+        config.result_cache.maxsize = 10
+        assert parser("100 grams approx.") == Quantity("100 g")
+        assert parser("100 grams approx.") == Quantity("100 g")
+        assert config.result_cache.info().hits == 1
+
+        config.remove_text = ["grams"]
+        assert parser("100 grams approx.") == Quantity("100")
+    finally:
+        config.remove_text = original
+        config.result_cache.maxsize = 0
+        config.result_cache.clear()
+
+
+def test_persistent_cache(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    calls = []
+
+    def parse(text):
+        calls.append(text)
+        return parser(text)
+
+    settings = config.snapshot()
+    with PersistentCache(path) as cache:
+        assert cache.lookup("5 g (at 25 °C)", settings, parse) == [[Quantity("5 g"), Quantity("25 degC")]]
+        assert cache.lookup("", settings, parse) is None
+
+    with PersistentCache(path) as cache:  # a later run
+        assert cache.lookup("5 g (at 25 °C)", settings, parse) == [[Quantity("5 g"), Quantity("25 degC")]]
+        assert cache.lookup("", settings, parse) is None
+        assert calls == ["5 g (at 25 °C)", ""]
+        assert cache.info()[:2] == (2, 0)
+
+        cache.lookup("5 g", settings._replace(remove_text=("g",)), parse)  # other settings are stored separately
+        assert len(cache) == 3
+        cache.clear(stale_only=True)
+        assert len(cache) == 2
+
+
+def test_config_persistent_cache(tmp_path):
+    try:
+        config.persistent_cache = PersistentCache(str(tmp_path / "cache.sqlite"))
+        assert parser("20.80 mm Hg") == Quantity("20.80 mmHg")
+        assert parser("20.80 mm Hg") == Quantity("20.80 mmHg")
+        assert config.persistent_cache.info().hits == 1
+    finally:
+        config.persistent_cache.close()
+        config.persistent_cache = None
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+def test_persistent_cache_fork(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    settings = config.snapshot()
+    with PersistentCache(path, commit_every=100) as cache:
+        cache.lookup("5 g", settings, parser)
+        cache.flush()
+        connection = cache._connection
+
+        ctx = multiprocessing.get_context("fork")
+        process = ctx.Process(target=_lookup_in_child, args=(cache, settings, connection))
+        process.start()
+        process.join(30)
+        assert process.exitcode == 0
+
+        assert cache._connection is connection
+        assert cache.info()[:2] == (0, 1)
+        assert len(cache) == 2  # (written by the child)
+
+
+def _lookup_in_child(cache, settings, parent_connection):
+    assert cache.lookup("6 g", settings, parser) == Quantity("6 g")
+    assert cache._connection is not parent_connection
+    assert cache.info()[:2] == (0, 1)
+    cache.close()
@@ -0,0 +1,44 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from unit_parse import Quantity, Unit  # noqa: E402
+from unit_parse.column import parse_column  # noqa: E402
+
+
+def test_parse_column():
+    result = parse_column(["1.2 g/mL", "1100 kg/m**3", "fish", None, "1.2 g/mL"])
+    assert result.quantity.units == Unit("g/mL")
+    assert np.allclose(result.quantity.magnitude, [1.2, 1.1, np.nan, np.nan, 1.2], equal_nan=True)
+    assert result.mask.tolist() == [False, False, True, True, False]
+
+
+def test_parse_column_target_unit():
+    result = parse_column(["25 °C", "77 °F", "300 K", "5 g"], target_unit="degC")
+    assert result.quantity.units == Unit("degC")
+    assert np.allclose(result.quantity.magnitude[:3], [25, 25, 26.85])
+    assert result.mask.tolist() == [False, False, False, True]
+
+
+def test_parse_column_unit_choice():
+    # like reduce_quantities: dimensionless values lose to ones with units
+    result = parse_column(["5", "6", "7 g", "8 g", "9 kg"])
+    assert result.quantity.units == Unit("g")
+    assert result.mask.tolist() == [True, True, False, False, False]
+    assert result.quantity[4] == Quantity("9000 g")
+
+
+def test_parse_column_conditions():
+    result = parse_column(["20.8 mm Hg @ 25 °C"])
+    assert result.quantity[0] == Quantity("20.8 mmHg")
+
+
+def test_parse_column_empty():
+    result = parse_column([])
+    assert result.quantity.magnitude.shape == (0,)
+    assert result.quantity.units == Unit("")
+
+
+def test_parse_column_errors():
+    with pytest.raises(ValueError):
+        parse_column(["5 g"], errors="return")
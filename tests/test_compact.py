@@ -0,0 +1,43 @@
+import pytest
+
+from unit_parse import Quantity, Unit, parser
+from unit_parse.compact import CompactQuantity, compact, expand
+from unit_parse.unit_table import get_unit_table
+
+examples = [  # parser results that come back the same from compact --> expand
+    None,
+    Quantity("5 g"),
+    Quantity("-40 degF"),
+    parser("20.8 mm Hg @ 25 °C"),
+    parser("18 mm Hg at 68 °F ; 20 mm Hg at 77° F"),
+    [Quantity("5 g"), Quantity("6 kg")],
+    [[Quantity("5 g"), Quantity("25 degC"), Quantity("1 bar")]],
+]
+
+
+@pytest.mark.parametrize("input_", examples)
+def test_compact_expand(input_):
+    assert expand(compact(input_)) == input_
+
+
+def test_compact():
+    table = get_unit_table()
+    result = compact(parser("20.8 mm Hg @ 25 °C"))
+    assert result == (CompactQuantity(20.8, table.intern(Unit("mmHg")), (CompactQuantity(25.0, table.intern(Unit("degC"))),)),)
+
+    assert compact(5) == CompactQuantity(5.0, table.intern(Unit("")))
+    assert expand(compact(5)) == Quantity(5)
+
+    with pytest.raises(TypeError):
+        compact("5 g")
+    with pytest.raises(ValueError):
+        compact([[[Quantity("5 g")]]])
+
+
+def test_compact_quantity():
+    value = compact(Quantity("1.2 g/mL"))
+    assert value.unit() == Unit("g/mL")
+    assert value.to_pint() == Quantity("1.2 g/mL")
+    assert not hasattr(value, "__dict__")
+    with pytest.raises(AttributeError):
+        value.value = 5.0
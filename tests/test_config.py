@@ -1,6 +1,9 @@
+import subprocess
+import sys
+
 import pytest
 
-from unit_parse import parser, Quantity
+from unit_parse import parser, parser_batch, Quantity, warmup, set_registry, use_registry
 
 
 examples = [
@@ -18,4 +21,120 @@ def test_result_multi(input, output):
         "beer",
         "(NTP, 1992)"
     ]
-    assert output == parser(input)
\ No newline at end of file
+    assert output == parser(input)
+
+
+def test_lazy_import():
+    # importing unit_parse should not load pint, the unit registry or the english dictionary
+    code = "import sys, unit_parse; assert 'pint' not in sys.modules; assert unit_parse.config._english_dict is None"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_pint_default_registry_used_first():
+    # pint's default registry (autoconvert_offset_to_baseunit=False) was used before importing unit_parse: unit_parse
+    # should still make its own registry
+    code = (
+        "import pint; pint.Quantity(1, 'm'); pint.Unit('g')\n"
+        "from unit_parse import parser, Quantity\n"
+        "from unit_parse.config import get_registry\n"
+        "assert get_registry() is not pint._DEFAULT_REGISTRY\n"
+        "assert get_registry().autoconvert_offset_to_baseunit\n"
+        "assert parser('4.2 J/g°C') == Quantity('4.2 J')\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_warmup():
+    warmup()
+    assert parser("5 cm") == Quantity("5 cm")
+
+
+def test_set_registry():
+    import pint
+    from unit_parse.config import get_registry
+    original = get_registry()
+    original_application = pint.get_application_registry().get()
+    try:
+        u = pint.UnitRegistry()
+        set_registry(u)
+        assert Quantity("5 cm") == u.Quantity("5 cm")
+        assert isinstance(parser("5 cm"), u.Quantity)
+
+        u2 = pint.UnitRegistry()
+        assert isinstance(parser("5 cm", registry=u2), u2.Quantity)
+        assert isinstance(parser_batch(["5 cm"], registry=u2)[0], u2.Quantity)
+        assert get_registry() is u  # (registry= is for that call only)
+        assert isinstance(parser("5 cm"), u.Quantity)
+
+        pint.set_application_registry(u)
+        set_registry()
+        assert get_registry() is u
+
+        with pytest.raises(TypeError):
+            set_registry("registry")
+    finally:
+        pint.set_application_registry(original_application)
+        set_registry(original)
+
+
+def test_use_registry_threads():
+    import pint
+    from concurrent.futures import ThreadPoolExecutor
+    from unit_parse.config import get_registry
+    original = get_registry()
+    registries = [pint.UnitRegistry(), pint.UnitRegistry()]
+
+    def parse(i):
+        registry = registries[i % 2]
+        with use_registry(registry):
+            assert get_registry() is registry
+            results = [parser(text) for text in ("5 cm", "10 g/mol", "20.8 mm Hg @ 25 °C")]
+        return all(isinstance(q, registry.Quantity) for q in [results[0], results[1], *results[2][0]])
+
+    with ThreadPoolExecutor(4) as pool:
+        assert all(pool.map(parse, range(40)))
+    assert get_registry() is original
+
+    with pytest.raises(TypeError):
+        with use_registry("registry"):
+            pass
+
+
+def test_snapshot():
+    from unit_parse import config
+    snapshot = config.snapshot()
+    assert snapshot is config.snapshot()
+    assert isinstance(snapshot.pre_proc_sub, tuple) and isinstance(snapshot.pre_proc_sub[0], tuple)
+    with pytest.raises(AttributeError):
+        snapshot.remove_text = ("beer",)
+
+    original = config.remove_text
+    try:
+        config.remove_text = original + ["beer"]
+        new_snapshot = config.snapshot()
+        assert new_snapshot is not snapshot
+        assert new_snapshot.remove_text == tuple(original) + ("beer",)
+        assert snapshot.remove_text == tuple(original)
+    finally:
+        config.remove_text = original
+
+
+def test_fingerprint():
+    from unit_parse import config
+    snapshot = config.snapshot()
+    assert snapshot.fingerprint() == snapshot._replace().fingerprint()
+    assert snapshot.fingerprint() != snapshot._replace(remove_text=("beer",)).fingerprint()
+
+
+def test_use_registry_released():
+    import gc
+    import weakref
+    import pint
+
+    registry = pint.UnitRegistry()
+    assert isinstance(parser("5 g/mL", registry=registry), registry.Quantity)
+    parser("5 gcm**-3", registry=registry)  # (unit cache)
+    ref = weakref.ref(registry)
+    del registry
+    gc.collect()
+    assert ref() is None
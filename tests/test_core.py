@@ -1,10 +1,14 @@
+from decimal import Decimal
+
 import pytest
 
+from unit_parse import parser
 from unit_parse.core import Quantity, Unit
-from unit_parse.core import frame_shift
+from unit_parse.core import frame_shift, try_to_convert
 from unit_parse.core import get_quantity, get_unit, get_value
 from unit_parse.core import last_minute_sub, merge_split_text
 from unit_parse.core import split_on_division_symbol, split_on_multiplication_symbol, split_on_powers
+from unit_parse.grammar import Grammar
 
 test_get_value = [  # [Input, Output]
     # positive control (works)
@@ -22,6 +26,8 @@ test_get_value = [  # [Input, Output]
     ["", (None, "")],
     ["*", (None, "")],
     ["*34gd", (None, "")],
+    ["1.2.3 g", (None, "")],
+    ["9**999999999 g", (None, "")],  # too large (eval would hang)
 ]
 
 
@@ -30,6 +36,10 @@ def test_get_value(input_, output_):
     assert output_ == get_value(input_)
 
 
+def test_get_value_decimal():
+    assert (Decimal("1.20E+3"), "1.20*10**3") == get_value("1.20*10**3 g", as_decimal=True, sig_digit=None)
+
+
 test_units_with_powers = [
     # positive control (changes)
     ["g**2cm**-3", [Unit("g**2"), Unit("cm**-3")]],
@@ -121,6 +131,12 @@ test_frame_shift = [  # [Input, Output]
     ["gcm**3", Unit("g*cm**3")],
     [" g", Unit("g")],
     ["mlgcm", Unit("ml*g*cm")],
+    ["gmol", Unit("g*mol")],
+    ["hkPa", Unit("h*kPa")],
+    ["atmm**3", Unit("atm*m**3")],
+    ["kgm**-3", Unit("kg*m**-3")],
+    ["g*cm", Unit("g*cm")],
+    ["kilograms", Unit("kg")],
 
     # negative control (fails)
     ["- closed cup", None],
@@ -128,6 +144,11 @@ test_frame_shift = [  # [Input, Output]
     ["", None],
     ["*", None],
     ["*34gd", None],
+    ["g*", None],
+    ["  ", None],
+    ["gdegC", None],  # offset units can't be multiplied with other units
+    ["Jg°C", None],
+    ["in°C", None],
 ]
 
 
@@ -136,6 +157,20 @@ def test_frame_shift(input_, output_):
     assert output_ == frame_shift(input_)
 
 
+test_parser_offset_units = [  # [Input, Output]
+    ["4.2 J/g°C", Quantity("4.2 J")],
+    ["0.5 cal/g°C", Quantity("0.5 cal")],
+    ["12 Jg°C", None],
+    ["5 gdegC", None],
+    ["10in°C", None],
+]
+
+
+@pytest.mark.parametrize("input_, output_", test_parser_offset_units)
+def test_parser_offset_units(input_, output_):
+    assert output_ == parser(input_)
+
+
 test_get_unit = [  # [Input, Output]
     # positive control (works)
     # ['°C - closed', Unit("degC")],
@@ -201,3 +236,23 @@ example_last_minute_sub = [
 @pytest.mark.parametrize("input_, output_", example_last_minute_sub)
 def test_last_minute_sub(input_, output_):
     assert output_ == last_minute_sub(input_)
+
+
+def test_inputs_not_changed():
+    text_list = [["5 degF-", "25 degC"], "10 g/mol 1999"]
+    assert last_minute_sub(text_list) == [["5 degF", "25 degC"], "10 g/mol"]
+    assert text_list == [["5 degF-", "25 degC"], "10 g/mol 1999"]
+
+    for func, input_ in [(split_on_powers, ["g**2cm**-3"]), (split_on_multiplication_symbol, ["g*cm"]),
+                         (split_on_division_symbol, ["g/cm"])]:
+        text_list = list(input_)
+        func(text_list)
+        assert text_list == input_
+
+
+def test_try_to_convert_reads_once(monkeypatch):
+    texts = []
+    read = Grammar.read
+    monkeypatch.setattr(Grammar, "read", lambda self, text: texts.append(text) or read(self, text))
+    assert try_to_convert("5 g)") is None  # outside the grammar, and Pint can't do it
+    assert texts == ["5 g)"]
@@ -0,0 +1,50 @@
+import pytest
+
+from unit_parse import config
+from unit_parse.config import path_to_dict
+from unit_parse.dictionary import CompactDictionary
+
+
+words = ["cup", "closed", "approx", "a", "zwitterionic", "water"]
+
+
+def test_from_words():
+    dictionary = CompactDictionary.from_words(words)
+    assert len(dictionary) == len(words)
+    assert list(dictionary) == sorted(words)
+    assert dictionary.is_sorted()
+
+
+examples_contains = [
+    ["cup", True],
+    ["closed", True],
+    ["a", True],
+    ["zwitterionic", True],
+    ["water", True],
+
+    ["cu", False],
+    ["cups", False],
+    ["", False],
+    ["zzz", False],
+    ["0", False],
+    ["cup\nclosed", False],
+    [None, False],
+]
+
+
+@pytest.mark.parametrize("input_, output_", examples_contains)
+def test_contains(input_, output_):
+    dictionary = CompactDictionary.from_words(words)
+    assert output_ == (input_ in dictionary)
+    assert output_ == (input_ in dictionary)  # second time from memo
+
+
+def test_english_dict():
+    with open(path_to_dict, "r") as file:
+        words_ = set(file.read().split("\n"))
+
+    dictionary = config.english_dict
+    assert dictionary.is_sorted()  # binary search needs dictionary.txt to stay sorted
+    assert len(dictionary) == len(words_)
+    assert all(word in dictionary for word in list(words_)[::97])
+    assert "mmhg" not in dictionary
@@ -0,0 +1,96 @@
+import subprocess
+import sys
+
+import pytest
+
+from unit_parse import Quantity, Unit
+from unit_parse.core import try_to_convert
+from unit_parse.grammar import TOO_LARGE, UNDEFINED, get_grammar, power_too_large
+
+
+examples_read = [  # [input_, output_] output_ is the text Pint would parse to the same quantity
+    ["5", "5"],
+    ["-5.3", "-5.3"],
+    ["5 g", "5 g"],
+    ["5g", "5 g"],
+    ["5.3 g/cm**3", "5.3 g/cm**3"],
+    ["5.3 g/cm^-3", "5.3 g/cm**-3"],
+    ["5.3 g / cm ** 3", "5.3 g/cm**3"],
+    ["5*10**-3 mol/L", "5*10**-3 mol/L"],
+    ["-10**2 g", "-100 g"],
+    ["2 mg/(kg*d)", "2 mg/(kg*d)"],
+    ["25 °C", "25 degC"],
+    ["-40 degF", "-40 degF"],
+    ["g cm", "g*cm"],
+    ["5 eV", "5 eV"],
+    ["5 kilograms", "5 kg"],
+    ["g**0", "1"],
+]
+
+
+@pytest.mark.parametrize("input_, output_", examples_read)
+def test_read(input_, output_):
+    expression = get_grammar(Unit._REGISTRY).read(input_)
+    assert Quantity(expression.magnitude, expression.units) == Quantity(output_)
+
+
+def test_read_number_only():
+    grammar = get_grammar(Unit._REGISTRY)
+    assert grammar.read("-5.3").number_only
+    assert not grammar.read("5*10**3").number_only
+    assert not grammar.read("5 g").number_only
+
+
+@pytest.mark.parametrize("input_", ["5.3 cm3", "5 xyz/g", "xyz"])
+def test_read_undefined(input_):
+    assert get_grammar(Unit._REGISTRY).read(input_) is UNDEFINED
+
+
+# left to Pint
+@pytest.mark.parametrize("input_", ["5e3 g", "5 %", "5 g per cm", "5 cm squared", "5 g, 5", " 5 g", "5\tg", "05 g",
+                                    "25 degC/min", "5 g**0.5", "5/0 g", "(g", "g(cm)", "5 g)", "m²", "", "inf"])
+def test_read_not_read(input_):
+    assert get_grammar(Unit._REGISTRY).read(input_) is None
+
+
+# powers Pint would hang working out
+too_large = ["10**10**10 g", "9**99999999 g", "9^99999999 g", "10 ** 10 ** 10 g", "10**(10**10) g", "g**9**99999999",
+             "((10**100)**100)**100 g", "10**(99*99*99*99*99) g", "10**99999999 per g"]
+
+
+@pytest.mark.parametrize("input_", too_large)
+def test_read_too_large(input_):
+    assert get_grammar(Unit._REGISTRY).read(input_) is TOO_LARGE
+    assert power_too_large(input_)
+
+
+@pytest.mark.parametrize("input_", ["5 g**2 cm**-3", "1.2*10**-3 mol/L", "10**-300 g", "2**1000 g", "cm**(-3)",
+                                    "5 g", "g^2"])
+def test_power_not_too_large(input_):
+    assert not power_too_large(input_)
+
+
+def test_parser_too_large():
+    # each would hang (working out a power with billions of digits) if it got to Pint
+    texts = ["10**10**10 g", "9**99999999 g", "9^99999999 g", "g**9**99999999", "10**99999999 per g"]
+    code = "from unit_parse import parser\n" + "".join(f"assert parser({text!r}) is None\n" for text in texts)
+    subprocess.run([sys.executable, "-c", code], check=True, timeout=60)
+
+
+examples_try_to_convert = [  # [input_, output_]
+    ["5", 5.0],
+    ["g/mol", Unit("g/mol")],
+    ["5.3 g/cm**3", Quantity("5.3 g/cm**3")],
+    ["5e3 g", Quantity("5000 g")],
+    ["42.3 gcm**-3", Quantity("42.3 g/cm**3")],
+    ["xyz", None],
+]
+
+
+@pytest.mark.parametrize("input_, output_", examples_try_to_convert)
+def test_try_to_convert(input_, output_):
+    assert try_to_convert(input_) == output_
+
+
+def test_get_grammar():
+    assert get_grammar(Unit._REGISTRY) is get_grammar(Unit._REGISTRY)
@@ -0,0 +1,54 @@
+import logging
+import sys
+
+from unit_parse import Quantity, parser, logger
+from unit_parse.logger import log_debug, log_info, set_log_decorators
+
+
+class CountRepr:
+    calls = 0
+
+    def __repr__(self):
+        CountRepr.calls += 1
+        return "CountRepr"
+
+
+@log_debug
+def func_debug(obj):
+    return obj
+
+
+@log_info
+def func_info(obj):
+    return obj
+
+
+def test_no_formatting_above_level():
+    logger.setLevel(logging.WARNING)
+    CountRepr.calls = 0
+    func_debug(CountRepr())
+    func_info(CountRepr())
+    assert CountRepr.calls == 0
+
+    logger.setLevel(logging.DEBUG)
+    try:
+        func_debug(CountRepr())
+        func_info(CountRepr())
+    finally:
+        logger.setLevel(logging.WARNING)
+    assert CountRepr.calls > 0
+
+
+def test_set_log_decorators():
+    core = sys.modules["unit_parse.core"]
+    assert hasattr(core.get_quantity, "__wrapped__")
+
+    set_log_decorators(False)
+    try:
+        assert not hasattr(core.get_quantity, "__wrapped__")
+        assert parser("2.3 mlgcm") == Quantity("2.3 ml*g*cm")
+    finally:
+        set_log_decorators(True)
+
+    assert hasattr(core.get_quantity, "__wrapped__")
+    assert parser("2.3 mlgcm") == Quantity("2.3 ml*g*cm")
@@ -1,6 +1,6 @@
 import pytest
 
-from unit_parse import Quantity, parser
+from unit_parse import Quantity, parser, parser_batch
 
 examples = [
     # standard examples
@@ -130,3 +130,30 @@ def test_result_multi(input_, output_):
 def test_main_error():
     with pytest.raises(TypeError):
         parser(1)
+
+
+def test_parser_batch():
+    texts = [example[0] for example in examples]
+    assert [example[1] for example in examples] == parser_batch(iter(texts))
+
+
+def test_parser_batch_errors():
+    assert [Quantity("5 g"), None, Quantity("1 K")] == parser_batch(["5 g", 1, "1 K"])
+
+    result = parser_batch(["5 g", 1], errors="return")
+    assert result[0] == Quantity("5 g")
+    assert isinstance(result[1], TypeError)
+
+    with pytest.raises(TypeError):
+        parser_batch(["5 g", 1], errors="raise")
+
+    with pytest.raises(ValueError):
+        parser_batch(["5 g"], errors="skip")
+
+
+def test_parser_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    texts = [example[0] for example in examples] * 4
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        result = list(executor.map(parser, texts))
+    assert [example[1] for example in examples] * 4 == result
@@ -0,0 +1,48 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+import unit_parse.pandas  # noqa: E402, F401  (registers the accessor)
+from unit_parse import Quantity, Unit, parser  # noqa: E402
+
+texts = ["5 g", "40 °F", "5 g", None, float("nan"), "fish", "20.8 mm Hg @ 25 °C", "0.005 kg"]
+
+
+def test_parse():
+    series = pd.Series(texts, index=list("abcdefgh"), name="x")
+    result = series.unit_parse.parse()
+    assert result.index.equals(series.index)
+    assert result.name == "x"
+    assert result.tolist() == [parser(text) if isinstance(text, str) else None for text in texts]
+
+
+def test_parse_only_unique(monkeypatch):
+    calls = []
+    original = unit_parse.pandas.parser_batch
+    monkeypatch.setattr(unit_parse.pandas, "parser_batch", lambda values, **kwargs: calls.append(values) or
+                        original(values, **kwargs))
+    pd.Series(["5 g"] * 100 + ["6 g"] * 100).unit_parse.parse()
+    assert calls == [["5 g", "6 g"]]
+
+
+def test_parse_errors():
+    result = pd.Series(["5 g"]).unit_parse.parse(errors="return")
+    assert result[0] == Quantity("5 g")
+
+
+def test_to_frame():
+    frame = pd.Series(texts).unit_parse.to_frame(prefer_unit="kg")
+    assert frame["magnitude"].tolist()[:3] == [0.005, 40, 0.005]
+    assert frame["magnitude"].isna().tolist() == [False, False, False, True, True, True, False, False]
+    assert frame["unit"].dtype == "category"
+    assert frame["unit"].isna().tolist() == frame["magnitude"].isna().tolist()
+    assert frame["unit"].dropna().tolist() == [str(Unit("kg")), str(Unit("degF")), str(Unit("kg")), str(Unit("mmHg")),
+                                               str(Unit("kg"))]
+
+
+def test_to_pint():
+    pytest.importorskip("pint_pandas")
+    result = pd.Series(["5 g", "0.006 kg", "fish"], name="x").unit_parse.to_pint()
+    assert str(result.dtype) == f"pint[{Unit('g'):~}]"
+    assert result.name == "x"
+    assert result.pint.magnitude.tolist()[:2] == [5, 6]
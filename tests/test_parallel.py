@@ -0,0 +1,46 @@
+import pytest
+
+from unit_parse import Quantity, parser
+from unit_parse.parallel import parse_many
+
+texts = [
+    "5 g",
+    "40 °F",
+    "2.3 gcm",
+    "37.34 kJ/mole (at 25 °C)",
+    "Pass me a 300 ml beer.",
+    "",
+    "1.10*10**-05 atm-m**3/mole at 25 °C",
+]
+
+
+def test_parse_many():
+    assert parse_many(texts * 3, workers=2, chunksize=2) == [parser(text) for text in texts * 3]
+
+
+def test_parse_many_errors():
+    assert parse_many(["5 g", 1, "1 K"], workers=1) == [Quantity("5 g"), None, Quantity("1 K")]
+
+    result = parse_many(["5 g", 1], workers=1, errors="return")
+    assert result[0] == Quantity("5 g")
+    assert isinstance(result[1], TypeError)
+
+    with pytest.raises(TypeError):
+        parse_many(["5 g", 1], workers=1, errors="raise")
+
+    with pytest.raises(ValueError):
+        parse_many(["5 g"], errors="skip")
+
+
+def test_parse_many_persistent_cache(tmp_path):
+    from unit_parse import config
+    from unit_parse.cache import PersistentCache
+
+    new_texts = [f"{i} g/mL" for i in range(300)]
+    try:
+        config.persistent_cache = PersistentCache(str(tmp_path / "cache.sqlite"))
+        assert parse_many(new_texts, workers=2, chunksize=50) == [Quantity(f"{i} g/mL") for i in range(300)]
+        assert len(config.persistent_cache) == 300  # (committed by the workers)
+    finally:
+        config.persistent_cache.close()
+        config.persistent_cache = None
@@ -1,8 +1,11 @@
+import re
+
 import pytest
 
 from unit_parse import config
 from unit_parse.pre_processing_substitution import reduce_ranges, remove_strings, remove_words
-from unit_parse.pre_processing_substitution import sub_general, sub_power, sub_sci_notation
+from unit_parse.pre_processing_substitution import sub_general, sub_power, sub_power_sci_notation, sub_sci_notation
+from unit_parse.pre_processing_substitution import SubstitutionPipeline, get_pipeline
 
 
 remove_strings_examples = [
@@ -28,6 +31,7 @@ test_reduce_ranges = [  # [input_, output_]
     ['115.2-115.3 °C', '115.2 °C'],
     ['115.2 - 115.3 °C', '115.2 °C'],
     ["	0.909 g/cm3", "0.909 g/cm3"],
+    ["5-6 g; 5-6 mL", "5 g; 5-6 mL"],  # only the first range
 
     # negative control (no changes made)
     ["66.11·10**-62 cm-3/mol", "66.11·10**-62 cm-3/mol"],
@@ -36,6 +40,7 @@ test_reduce_ranges = [  # [input_, output_]
     ["0.909 g/cm3", "0.909 g/cm3"],
     ["40 °F", "40 °F"],
     ["39.2 g/[mol * s]]", "39.2 g/[mol * s]]"],
+    ["mg - - L", "mg - - L"],  # no number in the range
 ]
 
 
@@ -84,6 +89,8 @@ test_sci_notation = [  # [input_, output_]
     ["0.909 g/cm3", "0.909 g/cm3"],
     ["40 °F", "40 °F"],
     ["39.2 g/[mol * s]]", "39.2 g/[mol * s]]"],
+    ["110-115 °C", "110-115 °C"],  # '10' inside a larger number
+    ["5 e-5 g", "5 e-5 g"],
 ]
 
 
@@ -98,6 +105,7 @@ test_power = [  # [input_, output_]
     ["66.11·10-62 cm3/mol", "66.11·10-62 cm**3/mol"],
     ["66.11·10-62 cm-3/mol", "66.11·10-62 cm**-3/mol"],
     ["	0.909 g/cm3", "0.909 g/cm**3"],
+    ["5 m2 and 5 m2s", "5 m**2 and 5 m**2s"],
 
     # negative control (no changes made)
     ["40 °F", "40 °F"],
@@ -111,6 +119,12 @@ def test_sub_power(input_, output_):
     assert output_ == sub_power(input_)
 
 
+@pytest.mark.parametrize("input_", [example[0] for example in test_power + test_sci_notation] +
+                         ["66.11·10-62 cm-03/mol", " 5 e-5 gcm-3 ", "5 10**5 m2"])
+def test_sub_power_sci_notation(input_):
+    assert sub_power_sci_notation(input_) == sub_sci_notation(sub_power(input_))
+
+
 test_sub_pattern1 = [
     # positive control (makes changes)
     ['Pass me a 300 ml beer.', '300 ml beer.'],
@@ -208,3 +222,47 @@ def test_sub_pattern_none():
 def test_sub_pattern_error():
     with pytest.raises(TypeError):
         sub_general("fish", patterns=1)
+
+
+examples_pipeline = [
+    '18 mm Hg at 68 °F ; 20 mm Hg at 77° F (NTP, 1992)',
+    "Low threshold= 13.1150 mg/cu m; High threshold= 26840 mg/cu m; Irritating concn= 22875 mg/cu m.",
+    '−66.11·10-62 cm3/mol',
+    "15 ± 5 ºC",
+    "345.234 KCAL/MOLE",
+    "cu mm Hg",  # literal rules that can't be fused
+    "5 LB/cu in; 3 KGkpa",
+]
+
+
+@pytest.mark.parametrize("input_", examples_pipeline)
+def test_pipeline_matches_sequential(input_):
+    expected = input_
+    for pattern in config.pre_proc_sub:
+        expected = re.sub(pattern[0], pattern[1], expected)
+
+    assert expected.strip() == get_pipeline(config.pre_proc_sub)(input_)
+
+
+def test_pipeline_fuses_literals():
+    pipeline = SubstitutionPipeline([["KG", "kg"], ["LB", "lb"], ["kpa", "kPa"]])
+    assert pipeline.number_of_steps == 1
+    assert "5 kg 3 lb kPa" == pipeline("5 KG 3 LB kpa")
+
+    # overlapping patterns must be done in order
+    pipeline = SubstitutionPipeline([["cu m", "m**3"], ["cu mm", "mm**3"]])
+    assert pipeline.number_of_steps == 2
+    assert "m**3m" == pipeline("cu mm")
+
+
+def test_pipeline_recompile():
+    patterns = [["MOL", "mol"]]
+    pipeline = get_pipeline(patterns)
+    assert "5 mol" == pipeline("5 MOL")
+
+    patterns.append(["mol", "mole"])
+    assert pipeline is get_pipeline(patterns)
+    assert "5 mole" == pipeline("5 MOL")
+
+    patterns[0][1] = "MOLE"
+    assert "5 MOLE" == pipeline("5 MOL")
@@ -0,0 +1,39 @@
+import pytest
+
+from unit_parse import Unit
+from unit_parse.segmentation import Trie, get_segmenter
+
+
+def test_trie():
+    trie = Trie(["m", "mm", "mmHg", "mol"])
+    assert trie.match_ends("mmHg", 0) == [1, 2, 4]
+    assert trie.match_ends("xmol", 1) == [2, 4]
+    assert trie.match_ends("x", 0) == []
+
+
+examples_segment = [
+    ["mlgcm", ["ml", "g", "cm"]],
+    ["gcm**-3", ["g", "cm**-3"]],
+    [" g", ["g"]],
+    ["g * cm", ["g", "cm"]],
+    ["mmHgmin", ["mmHg", "min"]],
+
+    ["- closed cup", None],
+    ["*g", None],
+    ["", None],
+]
+
+
+@pytest.mark.parametrize("input_, output_", examples_segment)
+def test_segment(input_, output_):
+    segmenter = get_segmenter(Unit._REGISTRY)
+    assert output_ == segmenter.segment(input_, is_unit=lambda text: True)
+
+
+def test_segment_is_unit():
+    segmenter = get_segmenter(Unit._REGISTRY)
+    assert ["m", "l", "g"] == segmenter.segment("mlg", is_unit=lambda text: text != "ml")
+
+
+def test_get_segmenter():
+    assert get_segmenter(Unit._REGISTRY) is get_segmenter(Unit._REGISTRY)
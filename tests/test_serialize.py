@@ -0,0 +1,33 @@
+import pickle
+
+import pytest
+
+from unit_parse import Quantity, Unit, parser
+from unit_parse.serialize import SerializedQuantity, SerializedUnit, dump, dumps, load, loads
+
+examples = [
+    None,
+    Quantity("5 g"),
+    Quantity("40 degF"),
+    Quantity("-66.11*10**-62 ml/mol"),
+    Unit("g/cm**3"),
+    [Quantity("5 g"), Quantity("1 K")],
+    [[Quantity("1.23 g/cm**3"), Quantity("25 degC")], [Quantity("1.5 g/cm**3"), None]],
+]
+
+
+@pytest.mark.parametrize("obj", examples)
+def test_round_trip(obj):
+    data = pickle.loads(pickle.dumps(dump(obj)))
+    assert load(data) == obj
+
+
+def test_dump():
+    assert dump(Quantity("5 g/ml")) == SerializedQuantity(5, (("gram", 1), ("milliliter", -1)))
+    assert dump(Unit("K")) == SerializedUnit((("kelvin", 1),))
+    assert dump(parser("5 g")) == SerializedQuantity(5, (("gram", 1),))
+
+
+@pytest.mark.parametrize("obj", examples)
+def test_json_round_trip(obj):
+    assert loads(dumps(obj)) == obj
@@ -0,0 +1,151 @@
+import json
+
+import pytest
+
+from unit_parse import stream
+from unit_parse.__main__ import main
+from unit_parse.stream import ColumnError, parse_file, read_header, read_records
+
+csv_text = (
+    'name,value\n'
+    'water,1.00 g/mL\n'
+    '"salt, table","2.16 g/cm**3 (at 25 °C)"\n'
+    'x,fish\n'
+    '\n'
+    '"two\nlines",-40 °F\n'
+)
+
+csv_output = (
+    'name,value,magnitude,unit,quantity\n'
+    'water,1.00 g/mL,1.0,g/ml,1.0 g/ml\n'
+    '"salt, table",2.16 g/cm**3 (at 25 °C),2.16,g/cm**3,2.16 g/cm**3\n'
+    'x,fish,,,\n'
+    '"two\nlines",-40 °F,-40,°F,-40 °F\n'
+)
+
+
+def write(path, text):
+    path.write_bytes(text.encode("utf-8"))
+    return str(path)
+
+
+def read(path):
+    return path.read_bytes().decode("utf-8")
+
+
+def test_parse_file_csv(tmp_path):
+    input_ = write(tmp_path / "data.csv", csv_text)
+    result = parse_file(input_, str(tmp_path / "out.csv"), column="value")
+
+    assert read(tmp_path / "out.csv") == csv_output
+    assert result == (4, 1, len(csv_text.encode("utf-8")))
+    assert json.loads(read(tmp_path / "out.csv.offset"))["rows"] == 4
+
+
+def test_parse_file_tsv(tmp_path):
+    input_ = write(tmp_path / "data.tsv", "5 g\tA\n40 °F\tB\n")
+    parse_file(input_, str(tmp_path / "out.tsv"), column=0, header=False)
+    assert read(tmp_path / "out.tsv") == "5 g\tA\t5\tg\t5 g\n40 °F\tB\t40\t°F\t40 °F\n"
+
+
+def test_parse_file_jsonl(tmp_path):
+    input_ = write(tmp_path / "data.jsonl", '{"id": 1, "value": "5 g"}\n\n{"id": 2}\n{"id": 3, "value": "1 K"}\n')
+    result = parse_file(input_, str(tmp_path / "out.jsonl"), column="value")
+
+    rows = [json.loads(line) for line in read(tmp_path / "out.jsonl").splitlines()]
+    assert rows == [
+        {"id": 1, "value": "5 g", "magnitude": 5, "unit": "g", "quantity": "5 g"},
+        {"id": 2, "magnitude": None, "unit": None, "quantity": None},
+        {"id": 3, "value": "1 K", "magnitude": 1, "unit": "K", "quantity": "1 K"},
+    ]
+    assert result.rows == 3
+
+
+def test_parse_file_workers(tmp_path):
+    input_ = write(tmp_path / "data.csv", csv_text)
+    parse_file(input_, str(tmp_path / "out.csv"), column="value", workers=2, chunksize=1)
+    assert read(tmp_path / "out.csv") == csv_output
+
+
+def test_parse_file_resume(tmp_path, monkeypatch):
+    input_ = write(tmp_path / "data.csv", csv_text)
+    output = str(tmp_path / "out.csv")
+
+    format_chunk = stream._format_chunk
+    calls = []
+
+    def interrupted(texts):
+        calls.append(texts)
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        return format_chunk(texts)
+
+    monkeypatch.setattr(stream, "_format_chunk", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        parse_file(input_, output, column="value", chunksize=1)
+    assert json.loads(read(tmp_path / "out.csv.offset"))["rows"] == 2
+
+    with open(output, "ab") as file:
+        file.write(b"half a row")  # written after the checkpoint; dropped on resume
+
+    monkeypatch.setattr(stream, "_format_chunk", format_chunk)
+    result = parse_file(input_, output, column="value", chunksize=1, resume=True)
+    assert read(tmp_path / "out.csv") == csv_output
+    assert result.rows == 4
+
+
+def test_read_records(tmp_path):
+    input_ = write(tmp_path / "data.csv", csv_text)
+    with open(input_, "rb") as file:
+        header, end = read_header(file, "csv")
+        records = list(read_records(file, "csv", 1, start=end))
+
+    assert header == ["name", "value"]
+    assert [record.text for record in records] == ["1.00 g/mL", "2.16 g/cm**3 (at 25 °C)", "fish", "-40 °F"]
+
+    # start reading again from a record's end
+    with open(input_, "rb") as file:
+        file.seek(records[1].end)
+        assert [record.text for record in read_records(file, "csv", 1, start=records[1].end)] == ["fish", "-40 °F"]
+
+
+def test_parse_file_errors(tmp_path):
+    input_ = write(tmp_path / "data.csv", csv_text)
+    with pytest.raises(ValueError):
+        parse_file(input_, column="density")
+    with pytest.raises(ValueError):
+        parse_file(input_, errors="return")
+    with pytest.raises(ValueError):
+        parse_file(str(tmp_path / "data.txt"))
+    with pytest.raises(ValueError):
+        parse_file(input_, resume=True)  # to stdout
+
+    for column in (2, "5"):  # past the header
+        with pytest.raises(ColumnError):
+            parse_file(input_, str(tmp_path / "out.csv"), column=column)
+    with pytest.raises(ColumnError):  # past the first row
+        parse_file(input_, str(tmp_path / "out.csv"), column=2, header=False)
+
+    input_ = write(tmp_path / "data.jsonl", '{"value": "5 g"}\n')
+    for column in (None, 0):
+        with pytest.raises(ColumnError):
+            parse_file(input_, column=column)  # JSONL needs a field name
+
+
+def test_main(tmp_path, capsys):
+    input_ = write(tmp_path / "data.csv", csv_text)
+    assert main([input_, "--column", "value", "-o", str(tmp_path / "out.csv")]) == 0
+    assert read(tmp_path / "out.csv") == csv_output
+    assert "4 rows" in capsys.readouterr().err
+
+
+def test_main_usage_errors(tmp_path, capsys):
+    input_ = write(tmp_path / "data.jsonl", '{"value": "5 g"}\n')
+    csv_input = write(tmp_path / "data.csv", csv_text)
+    for argv in ([input_], [str(tmp_path / "data.txt"), "--column", "value"], [csv_input, "-c", "5"],
+                 [csv_input, "-c", "5", "--no-header"]):
+        with pytest.raises(SystemExit) as e:
+            main(argv)
+        assert e.value.code == 2
+    err = capsys.readouterr().err
+    assert "--column is needed for JSONL" in err and "Column 5 is out of range" in err
@@ -0,0 +1,32 @@
+import pytest
+
+from unit_parse.tokenizer import Token, tokenize, untokenize
+
+
+examples = [  # [input_, output_]
+    ["5.3e1 g/cm3", [
+        Token("NUMBER", "5.3"), Token("WORD", "e"), Token("NUMBER", "1"), Token("SPACE", " "), Token("WORD", "g"),
+        Token("OPERATOR", "/"), Token("WORD", "cm"), Token("NUMBER", "3")]],
+    ["10**-5 (@ 25 °C);", [
+        Token("NUMBER", "10"), Token("POWER", "**"), Token("OPERATOR", "-"), Token("NUMBER", "5"),
+        Token("SPACE", " "), Token("OPEN", "("), Token("AT", "@"), Token("SPACE", " "), Token("NUMBER", "25"),
+        Token("SPACE", " "), Token("OTHER", "°"), Token("WORD", "C"), Token("CLOSE", ")"),
+        Token("SEPARATOR", ";")]],
+    ["1.", [Token("NUMBER", "1"), Token("OTHER", ".")]],
+    ["", []],
+]
+
+
+@pytest.mark.parametrize("input_, output_", examples)
+def test_tokenize(input_, output_):
+    assert tokenize(input_) == output_
+
+
+@pytest.mark.parametrize("input_", [
+    "18 mm Hg at 68 °F ; 20 mm Hg at 77° F (NTP, 1992)",
+    "66.11·10-62 cm3/mol",
+    "\t0.909 g/cm3\n",
+    "Ökonomie 5 μm^2 [x]{y}",
+])
+def test_round_trip(input_):
+    assert untokenize(tokenize(input_)) == input_
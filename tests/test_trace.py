@@ -0,0 +1,50 @@
+from unit_parse import Quantity, parser
+from unit_parse.trace import ParseTrace, get_trace, parse_trace
+
+
+def test_parse_trace():
+    assert get_trace() is None
+
+    with parse_trace() as trace:
+        assert get_trace() is trace
+        result = parser("37.34 kJ/mole (at 25 °C)")
+
+    assert get_trace() is None
+    assert result == [[Quantity("37.34 kJ/mole"), Quantity("25 degC")]]
+
+    stages = [record.stage for record in trace.records]
+    assert stages == [
+        "remove_strings",
+        "substitution.sub_general",
+        "substitution.capitalization_check",
+        "substitution.remove_words",
+        "substitution.sub_power",
+        "substitution.sub_sci_notation",
+        "substitution.reduce_ranges",
+        "substitution",
+        "multiple_quantities_main",
+        "text_list_to_quantity",
+        "remove_empty_cells",
+        "reduce_quantities",
+        "parser",
+    ]
+    assert trace.records[0].input == "37.34 kJ/mole (at 25 °C)"
+    assert trace.records[7].output == "37.34 kJ/mole ( @ 25 degC)"
+    assert trace.records[-1].output == result
+    assert all(record.elapsed_ns >= 0 for record in trace.records)
+
+
+def test_trace_summary():
+    trace = ParseTrace()
+    with parse_trace(trace):
+        parser("5 g")
+    with parse_trace(trace):
+        parser("40 °F")
+
+    summary = trace.summary()
+    assert summary["parser"].count == 2
+    assert summary["parser"].total_ns >= summary["substitution"].total_ns
+    assert summary["parser"].mean_ns > 0
+
+    trace.clear()
+    assert trace.records == []
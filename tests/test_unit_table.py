@@ -0,0 +1,78 @@
+import pytest
+
+from unit_parse import Quantity, Unit
+from unit_parse.unit_table import DIMENSIONLESS, UnitTable, get_unit_table
+
+
+def test_intern():
+    table = UnitTable(Unit._REGISTRY)
+    unit_id = table.intern(Unit("g/mol"))
+    assert table.intern(Unit("gram/mole")) == unit_id
+    assert table.intern(Quantity("5 g/mol")) == unit_id
+    assert table.intern(Unit("g/mol")._units) == unit_id
+    assert table.intern(Unit("kg/mol")) != unit_id
+    assert len(table) == 3  # (and dimensionless)
+    assert table.intern(Unit("")) == DIMENSIONLESS
+
+    assert table.unit(unit_id) == Unit("g/mol")
+    assert table.unit(unit_id) is table.unit(table.intern(Unit("g/mol")))
+
+
+@pytest.mark.parametrize("unit", ["g/mol", "mmHg", "degC", "degF", "kelvin*atm", ""])
+def test_info(unit):
+    table = UnitTable(Unit._REGISTRY)
+    info = table.info(table.intern(Unit(unit)))
+    assert info.unit == Unit(unit)
+    assert info.dimension_id == table.dimension_id(Quantity(5, unit).to_root_units())
+
+    # value in root units = value * factor + offset
+    for value in (0, 2.5):
+        assert info.factor * value + info.offset == pytest.approx(Quantity(value, unit).to_root_units().m)
+
+
+def test_dimension_id():
+    table = UnitTable(Unit._REGISTRY)
+    assert table.dimension_id(Unit("g/mol")) == table.dimension_id(Unit("kg/kmol"))
+    assert table.dimension_id(Unit("degC")) == table.dimension_id(Unit("K"))
+    assert table.dimension_id(Unit("g")) != table.dimension_id(Unit("m"))
+    assert table.dimension_id(Unit("")) == DIMENSIONLESS
+    assert table.shared(Unit("g/mol")) is table.shared(Quantity(1, "gram/mole"))
+
+
+def test_get_unit_table():
+    assert get_unit_table() is get_unit_table(Unit._REGISTRY)
+
+
+def test_maxsize():
+    table = UnitTable(Unit._REGISTRY, maxsize=3)
+    g, m = table.intern(Unit("g")), table.intern(Unit("m"))
+    assert len(table) == 3
+    with pytest.raises(OverflowError):
+        table.intern(Unit("kg"))
+
+    # full: worked out, not kept
+    assert table.shared(Unit("kg")) == Unit("kg")
+    assert table.dimension_id(Unit("kg")) == table.info(g).dimension_id
+    assert table.dimension_id(Unit("s")) == table.dimension_id(Unit("ms"))
+    assert table.dimension_id(Unit("s")) not in (table.info(g).dimension_id, table.info(m).dimension_id, DIMENSIONLESS)
+    assert table.lookup(Unit("degC")).offset == pytest.approx(273.15)
+    assert table.lookup(Unit("m")) is table.info(m)
+    assert len(table) == 3
+
+
+def test_registry_released():
+    import gc
+    import weakref
+    import pint
+    from unit_parse.grammar import get_grammar
+    from unit_parse.segmentation import get_segmenter
+
+    registry = pint.UnitRegistry()
+    assert get_unit_table(registry) is get_unit_table(registry)
+    get_grammar(registry)
+    get_segmenter(registry)
+
+    ref = weakref.ref(registry)
+    del registry
+    gc.collect()
+    assert ref() is None
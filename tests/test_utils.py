@@ -1,9 +1,11 @@
+from decimal import Decimal
+
 import pytest
 
 from unit_parse import Unit, Q
 from unit_parse.utils import contains_number, flatten_list, get_list_depth
 from unit_parse.utils import quantity_approx_equal, quantity_difference, remove_empty_cells
-from unit_parse.utils import sig_figs, split_list
+from unit_parse.utils import evaluate_number, sig_figs, split_list
 
 example_split_list = [
     # positive control (changes)
@@ -26,6 +28,12 @@ def test_split_list(input_, output_, chunk):
     assert output_ == split_list(input_, **chunk)
 
 
+def test_split_list_input_not_changed():
+    text_split = ["5 g cm"]
+    assert split_list(text_split, " ") == ["5", " ", "g cm"]
+    assert text_split == ["5 g cm"]
+
+
 test_round_off = [  # [Input, Output]
     # positive control (works)
     [234.2342300000001, 234.23423, {"sig_digit": 15}],
@@ -49,6 +57,41 @@ def test_sig_figs_error():
         sig_figs("fish")
 
 
+test_evaluate_number = [  # [input_, output_, extra]
+    # positive control (works)
+    ["42.3", 42.3, {}],
+    ["-0.909", -0.909, {}],
+    ["66.11*10**-62", 6.611e-61, {}],
+    ["66.11*10**62", 6.611e+63, {}],
+    ["5-3", 2.0, {}],
+    ["-10**2", -100.0, {}],
+    ["3.14159265358979323", 3.14159265358979, {}],
+    ["3.14159265358979323", 3.1416, {"sig_digit": 5}],
+    ["66.11*10**-62", Decimal("6.611E-61"), {"as_decimal": True}],
+    ["1.20*10**3", Decimal("1.20E+3"), {"as_decimal": True, "sig_digit": None}],
+    ["0.0500", Decimal("0.0500"), {"as_decimal": True, "sig_digit": None}],
+
+    # negative control (fails)
+    ["", None, {}],
+    ["1.2.3", None, {}],
+    ["5*3*", None, {}],
+    ["0**-1", None, {}],
+    ["1.0*10**400", None, {}],
+    ["10**10**10", None, {}],
+    ["10**999999999999", None, {}],
+    ["5 g", None, {}],
+]
+
+
+@pytest.mark.parametrize("input_, output_, extra", test_evaluate_number)
+def test_evaluate_number(input_, output_, extra):
+    value = evaluate_number(input_, **extra)
+    assert output_ == value
+    assert type(output_) is type(value)
+    if isinstance(output_, Decimal):
+        assert str(output_) == str(value)
+
+
 test_list_depth = [  # [Input, Output]
     # positive control (works)
     ["", 0],
@@ -98,6 +141,14 @@ examples_quantity_approx_equal = [
     [[Q("10 g"), 5], False],
     [[5, Q("5 kg")], False],
     [[Q("0.1 psi"), Q("0 psi")], False],
+    [[Q("5 g"), Q("5.05 g")], True],
+    [[Q("5000 g"), Q("5 kg")], True],
+    [[Q("5 g"), Q("5 kg")], False],
+    [[Q("0 g"), Q("0 kg")], True],
+    [[Q("25 degC"), Q("298.15 K")], True],
+    [[Q("77 degF"), Q("25 degC")], True],
+    [[Q("0 K"), Q("0 degC")], False],
+    [[Q("5 mmHg"), Q("5 g")], False],
 ]
 
 
@@ -110,6 +161,11 @@ examples_quantity_difference = [
     [[Q("5 g"), Q("10 g")], Q("0.5")],
     [[5, 5], 0],
     [[5, Q("5 kg")], 1],
+    [[Q("5 g"), Q("5 kg")], 0.999],
+    [[Q("5000 g"), Q("5 kg")], 0],
+    [[Q("25 degC"), Q("25.2 degC")], pytest.approx(0.2 / 298.35)],
+    [[Q("0 K"), Q("0 degC")], 1],
+    [[Q("5 g"), "5 g"], 1],
 ]
 
 